@@ -0,0 +1,274 @@
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024 Red Hat, Project Atmosphere
+#
+# Copyright 2024 Red Hat, Project Atmosphere
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import queue
+import threading
+import time
+
+from ansible.errors import AnsibleActionFail
+from ansible.module_utils.basic import missing_required_lib
+from ansible.plugins.action import ActionBase
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    ABAP_RFC_CONFIG,
+    ABAP_RFC_MUTUALLY_EXCLUSIVE,
+    ABAP_RFC_PARAMS,
+    ABAP_RFC_REQUIRED_TOGETHER,
+    HAS_PYRFC_LIBRARY,
+    PYRFC_LIBRARY_IMPORT_ERROR,
+    SAPRFCClient,
+    convert2ansible,
+)
+from ansible_collections.sap.sap_operations.plugins.module_utils.compat import (
+    dict_union,
+)
+
+
+def target_name(rfc_connection):
+    """Return default name of target, SID or application server, and client."""
+    if rfc_connection.get("sysid"):
+        system = rfc_connection["sysid"]
+    else:
+        system = "{0}/{1}".format(rfc_connection.get("ashost"), rfc_connection.get("sysnr"))
+    return "{0}/{1}".format(system, rfc_connection.get("client"))
+
+
+def call_target(target, function, parameters, state):
+    """Logon to target, call function and logoff, client is kept in state to cancel call on timeout."""
+    client = SAPRFCClient(**target["rfc_connection"])
+    state["client"] = client
+    try:
+        result = client(function, **parameters)
+        return convert2ansible(result, client.result_types(function))
+    finally:
+        client.close()
+
+
+def cancel(client):
+    """Cancel running call of timed out target."""
+    try:
+        if client is not None:
+            client.cancel()
+    except Exception:
+        # Target is reported as timed out anyway, thread ends when call returns
+        pass
+
+
+def fan_out(targets, function, parameters, parallel_targets=8, timeout=60):
+    """Call function in every target over up to parallel_targets threads, return results in order of targets.
+
+    Every target has its own deadline of `timeout` seconds for logon and call, measured from start
+    of its processing. Timed out target is reported immediately, its worker thread is left to finish
+    (daemon thread, the call is cancelled if possible) and replaced by new worker.
+    At most parallel_targets workers of timed out targets are replaced at the same time, further
+    timed out workers are replaced when some timed out worker finishes its call. If all workers are
+    blocked by timed out targets for `timeout` seconds, targets not started yet are reported as timed out.
+    """
+    parallel_targets = max(parallel_targets, 1)
+    results = [None] * len(targets)
+    states = [dict(start=None, client=None) for _target in targets]
+    pending = queue.Queue()
+    for index, target in enumerate(targets):
+        pending.put(index)
+    finished = threading.Condition()
+    # workers - workers processing targets, abandoned - workers left running on timed out targets,
+    # owed - replacements not started because parallel_targets workers were abandoned already
+    pool = dict(workers=0, abandoned=0, owed=0, blocked=None)
+
+    def run():
+        while True:
+            try:
+                index = pending.get_nowait()
+            except queue.Empty:
+                with finished:
+                    pool["workers"] -= 1
+                    finished.notify()
+                return
+            target = targets[index]
+            with finished:
+                states[index]["start"] = time.monotonic()
+            try:
+                result = call_target(
+                    target,
+                    function,
+                    dict(parameters, **(target.get("parameters") or {})),
+                    states[index],
+                )
+            except Exception as e:
+                target_result = dict(failed=True, timed_out=False, msg=str(e))
+            else:
+                target_result = dict(failed=False, timed_out=False, result=result)
+            with finished:
+                if results[index] is not None:
+                    # Target timed out, worker continues only as replacement that was not started
+                    pool["abandoned"] -= 1
+                    if not pool["owed"]:
+                        return
+                    pool["owed"] -= 1
+                    pool["workers"] += 1
+                    continue
+                target_result["elapsed"] = round(time.monotonic() - states[index]["start"], 6)
+                results[index] = target_result
+                finished.notify()
+
+    def start_worker():
+        pool["workers"] += 1
+        thread = threading.Thread(target=run)
+        thread.daemon = True
+        thread.start()
+
+    with finished:
+        for _i in range(min(parallel_targets, len(targets))):
+            start_worker()
+
+        while any(result is None for result in results):
+            now = time.monotonic()
+            wait = None
+            for index, state in enumerate(states):
+                if results[index] is not None or state["start"] is None or not timeout:
+                    continue
+                remaining = state["start"] + timeout - now
+                if remaining > 0:
+                    wait = remaining if wait is None else min(wait, remaining)
+                    continue
+                results[index] = dict(
+                    failed=True,
+                    timed_out=True,
+                    msg="Target did not respond in {0} seconds".format(timeout),
+                    elapsed=round(now - state["start"], 6),
+                )
+                cancel(state["client"])
+                pool["workers"] -= 1
+                pool["abandoned"] += 1
+                if pool["abandoned"] <= parallel_targets:
+                    start_worker()
+                else:
+                    pool["owed"] += 1
+            if pool["workers"] or pending.empty():
+                pool["blocked"] = None
+            elif pool["blocked"] is None:
+                pool["blocked"] = now
+            elif now - pool["blocked"] >= timeout:
+                while True:
+                    try:
+                        index = pending.get_nowait()
+                    except queue.Empty:
+                        break
+                    results[index] = dict(
+                        failed=True,
+                        timed_out=True,
+                        msg="Target was not started in {0} seconds, all workers are blocked by timed out targets".format(
+                            timeout
+                        ),
+                        elapsed=0,
+                    )
+            if any(result is None for result in results):
+                # Targets started by workers have no deadline yet, check again shortly
+                finished.wait(timeout=min(wait, 0.1) if wait is not None else 0.1)
+
+    return [
+        dict(name=target.get("name") or target_name(target["rfc_connection"]), **result)
+        for target, result in zip(targets, results)
+    ]
+
+
+class ABAPRFCFanout(ActionBase):
+    argument_spec = dict(
+        function=dict(type="str", required=True),
+        parameters=dict(type="dict", required=False, default={}),
+        targets=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=dict(
+                name=dict(type="str", required=False),
+                rfc_connection=dict(
+                    type="dict",
+                    required=True,
+                    options=dict_union(ABAP_RFC_CONFIG, ABAP_RFC_PARAMS),
+                    mutually_exclusive=ABAP_RFC_MUTUALLY_EXCLUSIVE,
+                    required_together=ABAP_RFC_REQUIRED_TOGETHER,
+                ),
+                parameters=dict(type="dict", required=False, default={}),
+            ),
+        ),
+        parallel_targets=dict(type="int", required=False, default=8),
+        timeout=dict(type="int", required=False, default=60),
+        fail_on_error=dict(type="bool", required=False, default=False),
+    )
+
+    def run(self, tmp=None, task_vars=None):
+        result = super(ABAPRFCFanout, self).run(tmp, task_vars)
+        validation_results, args = self.validate_argument_spec(
+            argument_spec=self.argument_spec,
+        )
+
+        if validation_results.error_messages:
+            raise AnsibleActionFail(
+                message="Validation failed: {0}".format(
+                    ", ".join(validation_results.error_messages)
+                ),
+            )
+        if not HAS_PYRFC_LIBRARY:
+            result.update(
+                failed=True,
+                msg=missing_required_lib("pyrfc"),
+                exception=PYRFC_LIBRARY_IMPORT_ERROR,
+            )
+            return result
+
+        start = time.monotonic()
+        results = fan_out(
+            args["targets"],
+            args["function"],
+            args["parameters"],
+            parallel_targets=args["parallel_targets"],
+            timeout=args["timeout"],
+        )
+        failed = [target["name"] for target in results if target["failed"]]
+
+        result.update(
+            changed=False,
+            failed=bool(failed) and args["fail_on_error"],
+            abap_rfc_fanout=results,
+            abap_rfc_fanout_summary=dict(
+                targets=len(results),
+                succeeded=len(results) - len(failed),
+                failed=len(failed),
+                timed_out=len([target for target in results if target["timed_out"]]),
+                elapsed=round(time.monotonic() - start, 6),
+            ),
+        )
+        if result["failed"]:
+            result["msg"] = "Function {0} failed in targets: {1}".format(
+                args["function"], ", ".join(failed)
+            )
+        return result
+
+
+class ActionModule(ABAPRFCFanout):
+    pass
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+#
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024 Red Hat, Project Atmosphere
+#
+# Copyright 2024 Red Hat, Project Atmosphere
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+
+CACHE_ARGS = ("cache", "cache_dir", "cache_max_age", "cache_probe")
+DEFAULT_CACHE_DIR = "~/.ansible/cache/sap_operations/abap_system_info"
+DEFAULT_CACHE_PROBE = ["installed_components"]
+# Fields of RFC_SYSTEM_INFO that are the same on every application server of the system
+FINGERPRINT_SYSTEM_INFO = ("RFCSYSID", "RFCDBSYS", "RFCDATABS", "RFCKERNRL", "RFCSAPRL")
+# Fields of installed components, component descriptions depend on logon language
+FINGERPRINT_COMPONENT = ("COMPONENT", "RELEASE", "EXTRELEASE")
+
+
+def connection_target(args):
+    """Return client and connection target (application server, message server or HTTP endpoint)."""
+    rfc_connection = args.get("rfc_connection") or {}
+    http_connection = args.get("http_connection") or {}
+    if rfc_connection:
+        client = rfc_connection.get("client")
+        if rfc_connection.get("ashost"):
+            target = "{0}/{1}".format(
+                rfc_connection.get("ashost"), rfc_connection.get("sysnr")
+            )
+        else:
+            target = "{0}/{1}/{2}/{3}".format(
+                rfc_connection.get("mshost"),
+                rfc_connection.get("msserv"),
+                rfc_connection.get("sysid"),
+                rfc_connection.get("group"),
+            )
+    else:
+        client = http_connection.get("client")
+        target = "{0}:{1}".format(
+            http_connection.get("hostname"), http_connection.get("port")
+        )
+    return str(client), target
+
+
+def cache_key(sid, args):
+    """Return key of cache entry for SID, client, connection target and result format.
+
+    Sections are cached as returned by module, dict and columnar results are kept apart.
+    """
+    client, target = connection_target(args)
+    result_format = args.get("result_format") or "dict"
+    return hashlib.sha256(
+        "|".join([str(sid), client, target, result_format]).encode("utf-8")
+    ).hexdigest()
+
+
+def fingerprint(probe):
+    """Hash system level fields of probe result.
+
+    Probe is answered by any application server, fields of the server (host name, IP address,
+    RFC destination) would change fingerprint without change of the system.
+    """
+    system_info = probe.get("system_info") or {}
+    sections = dict(probe.get("sections") or {})
+    components = sections.pop("installed_components", None)
+    if components is not None:
+        sections["installed_components"] = sorted(
+            [component.get(field) for field in FINGERPRINT_COMPONENT]
+            for component in components.get("TT_COMPTAB") or []
+        )
+    system = dict(
+        system_info=dict(
+            (field, system_info.get(field)) for field in FINGERPRINT_SYSTEM_INFO
+        ),
+        sections=sections,
+    )
+    return hashlib.sha256(
+        json.dumps(system, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def covers(entry, gather_subset):
+    """Check if cached entry contains all sections selected by gather_subset."""
+    if "all" in entry["gather_subset"]:
+        return True
+    if "all" in gather_subset:
+        return False
+    return all(section in entry["result"] for section in gather_subset)
+
+
+def select(result, gather_subset):
+    if "all" in gather_subset:
+        return result
+    return dict(
+        (section, value) for section, value in result.items() if section in gather_subset
+    )
+
+
+class ABAPSystemInfoCache(object):
+    """Cache of abap_system_info results on Ansible controller, one JSON file per key, see cache_key."""
+
+    def __init__(self, cache_dir):  # noqa: D107
+        self.cache_dir = os.path.expanduser(cache_dir)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, "{0}.json".format(key))
+
+    def get(self, key):
+        try:
+            with open(self.path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, key, entry):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.path(key))
+        except OSError:
+            # Cache is optimization only, failure to write it is not an error
+            pass
+
+
+class ActionModule(ActionBase):
+    def run(self, tmp=None, task_vars=None):
+        result = super(ActionModule, self).run(tmp, task_vars)
+        module_args = self._task.args.copy()
+
+        if not boolean(module_args.get("cache", False), strict=False):
+            result.update(
+                self._execute_module(
+                    module_name="sap.sap_operations.abap_system_info",
+                    module_args=module_args,
+                    task_vars=task_vars,
+                    tmp=tmp,
+                )
+            )
+            return result
+
+        cache = ABAPSystemInfoCache(module_args.get("cache_dir") or DEFAULT_CACHE_DIR)
+        max_age = int(module_args.get("cache_max_age") or 0)
+        gather_subset = module_args.get("gather_subset") or ["all"]
+        cache_probe = module_args.get("cache_probe") or DEFAULT_CACHE_PROBE
+        for arg in CACHE_ARGS:
+            module_args.pop(arg, None)
+
+        probe = self._execute_module(
+            module_name="sap.sap_operations.abap_system_info",
+            module_args=dict(module_args, probe=True, cache_probe=cache_probe),
+            task_vars=task_vars,
+            tmp=tmp,
+        )
+        if probe.get("failed"):
+            result.update(probe)
+            return result
+
+        probe = probe["abap_system_info_probe"]
+        client, target = connection_target(module_args)
+        key = cache_key(probe["sid"], module_args)
+        current = fingerprint(probe)
+        now = time.time()
+
+        entry = cache.get(key)
+        if (
+            entry
+            and entry.get("fingerprint") == current
+            and (max_age <= 0 or now - entry["timestamp"] <= max_age)
+            and covers(entry, gather_subset)
+        ):
+            result.update(
+                changed=False,
+                failed=False,
+                abap_system_info=select(entry["result"], gather_subset),
+                abap_system_info_cache=dict(
+                    hit=True,
+                    sid=probe["sid"],
+                    client=client,
+                    target=target,
+                    age=int(now - entry["timestamp"]),
+                ),
+            )
+            return result
+
+        module_result = self._execute_module(
+            module_name="sap.sap_operations.abap_system_info",
+            module_args=module_args,
+            task_vars=task_vars,
+            tmp=tmp,
+        )
+        result.update(module_result)
+        if module_result.get("failed"):
+            return result
+
+        cache.set(
+            key,
+            dict(
+                fingerprint=current,
+                timestamp=now,
+                gather_subset=gather_subset,
+                result=module_result["abap_system_info"],
+            ),
+        )
+        result["abap_system_info_cache"] = dict(
+            hit=False, sid=probe["sid"], client=client, target=target, age=0
+        )
+        return result
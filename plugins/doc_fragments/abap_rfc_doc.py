@@ -170,6 +170,34 @@ options:
           - There is no equivalent parameter when connecting via HTTP(s), see I(http_connection).
         type: bool
         default: False
+      metadata_cache_dir:
+        description:
+          - Directory on managed host to cache function module descriptions (interfaces)
+          - Descriptions are cached per system, client and function module
+          - System is identified by I(sysid), or by I(ashost) and I(sysnr)
+          - With cached descriptions, parameters are validated before logon to SAP ABAP system
+          - If not set, descriptions are kept in memory for one module run only
+        type: path
+        required: false
+        version_added: 2.13.0
+      metadata_cache_days:
+        description: Number of days cached function module descriptions are valid
+        type: int
+        required: false
+        default: 1
+        version_added: 2.13.0
+      validate_parameters:
+        description:
+          - Validate function call parameters against function module description before call
+          - Unknown parameters, exporting parameters and missing mandatory importing parameters are reported
+          - Function module description is also used to return raw ABAP types (RAW, XSTRING) as hex strings
+            and to add ABAP types of columns to tables in C(columnar) I(result_format) of modules with this option
+          - Reading function module description is an additional call for every function module,
+            unless description is cached in I(metadata_cache_dir)
+        type: bool
+        required: false
+        default: false
+        version_added: 2.13.0
 
   http_connection:
     description:
@@ -262,5 +290,36 @@ options:
           - HI
           - KK
           - VI
+      wsdl_cache_dir:
+        description:
+          - Directory on managed host to cache downloaded WSDL documents.
+          - Cache is kept per hostname, port and client, one WSDL document per function.
+          - If not set, WSDL is downloaded once per function during module run and is not written to disk.
+        required: false
+        type: path
+        version_added: 2.13.0
+      wsdl_cache_days:
+        description: Number of days WSDL documents are kept in I(wsdl_cache_dir)
+        required: false
+        type: int
+        default: 1
+        version_added: 2.13.0
+
+  """
 
+    RESULT_FORMAT = r"""
+options:
+  result_format:
+    description:
+      - Format of function module results returned by module
+      - C(dict) - table parameters are returned as lists of dictionaries
+      - C(columnar) - table parameters are returned as dictionaries with I(columns) (list of field names)
+        and I(rows) (list of lists of values), which is much smaller for big tables
+      - With I(rfc_connection.validate_parameters), columnar tables also contain I(types) (list of ABAP types of columns)
+      - Use filter P(sap.sap_operations.abap_columnar_expand#filter) to convert columnar tables back to lists of dictionaries
+    type: str
+    required: false
+    default: dict
+    choices: [dict, columnar]
+    version_added: 2.13.0
   """
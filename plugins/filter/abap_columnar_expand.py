@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    columnar2table,
+    is_columnar,
+)
+
+
+DOCUMENTATION = """
+name: abap_columnar_expand
+author: Kirill Satarin (@kksat)
+version_added: 2.13.0
+short_description: Expand ABAP tables returned in columnar format to lists of dictionaries
+description:
+    - ABAP modules return table parameters as {columns, rows} when I(result_format=columnar) is used
+    - This filter converts such tables back to lists of dictionaries
+    - If value is a dictionary or list, all columnar tables found in it are expanded
+    - All other values are returned unchanged
+options:
+    value:
+        description: Columnar table, or result of ABAP module that contains columnar tables
+        type: raw
+        required: True
+"""
+
+EXAMPLES = r"""
+- name: Fetch installed components in columnar format
+  sap.sap_operations.abap_system_info:
+    gather_subset: [installed_components]
+    result_format: columnar
+    rfc_connection: "{{ rfc_connection }}"
+  register: system_info
+
+- name: Print installed components as list of dictionaries
+  ansible.builtin.debug:
+    msg: "{{ system_info.abap_system_info.installed_components.TT_COMPTAB | sap.sap_operations.abap_columnar_expand }}"
+"""
+
+RETURN = """
+  data:
+    type: raw
+    description:
+      - List of dictionaries if columnar table was provided
+      - Value with all columnar tables expanded otherwise
+"""
+
+
+def abap_columnar_expand(value):
+    if is_columnar(value):
+        return columnar2table(value)
+    if isinstance(value, dict):
+        return {k: abap_columnar_expand(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [abap_columnar_expand(v) for v in value]
+    return value
+
+
+# ---- Ansible filters ----
+class FilterModule(object):
+    def filters(self):
+        return {"abap_columnar_expand": abap_columnar_expand}
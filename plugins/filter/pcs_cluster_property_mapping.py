@@ -25,9 +25,10 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-import xml.etree.ElementTree as ET  # nosec B405
-
 try:
+    from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import (
+        pcs_fromstring,
+    )
     from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import (
         pcs_cluster_property_set_from_cib,
     )
@@ -143,7 +144,7 @@ def pcs_cluster_property_mapping(  # noqa: C901
     if data.get("pacemaker_cib_xml") is None:
         return dict()
     try:
-        pcs_config_tree = ET.fromstring(data.get("pacemaker_cib_xml"))  # nosec B314
+        pcs_config_tree = pcs_fromstring(data.get("pacemaker_cib_xml"))
         if not pcs_config_tree:
             return dict()
 
@@ -27,9 +27,10 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-import xml.etree.ElementTree as ET  # nosec B405
-
 try:
+    from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import (
+        pcs_fromstring,
+    )
     from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import (
         pcs_resources_by_id_from_cib,
     )
@@ -239,22 +240,16 @@ def pcs_resources_from_cib(  # noqa: C901
         return []
     if data.get("pacemaker_cib_xml"):
         try:
-            pcs_config_tree = ET.fromstring(data.get("pacemaker_cib_xml"))  # nosec B314
+            pcs_config_tree = pcs_fromstring(data.get("pacemaker_cib_xml"))
             if not pcs_config_tree:
                 return []
         except Exception:
             return []
-        filtered_resources = pcs_resources_by_id_from_cib(pcs_config_tree)
+        # Lookup by ID uses index of the tree, other filters are applied to its result
+        filtered_resources = pcs_resources_by_id_from_cib(pcs_config_tree, id or None)
     else:
         return []
 
-    if id:
-        filtered_resources = [
-            pcs_resource
-            for pcs_resource in filtered_resources
-            if id == pcs_resource.get("id")
-        ]
-
     if id_contains:
         filtered_resources = [
             pcs_resource
@@ -24,7 +24,22 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import base64
+import os
+import queue
+import ssl
+import threading
+import time
 import traceback
+from io import BytesIO
+
+try:
+    from http.client import HTTPConnection, HTTPSConnection, RemoteDisconnected
+    from urllib.parse import urlsplit
+except ImportError:
+    from httplib import HTTPConnection, HTTPSConnection
+    from httplib import BadStatusLine as RemoteDisconnected
+    from urlparse import urlsplit
 
 from ansible.module_utils.basic import missing_required_lib
 from ansible.module_utils.basic import AnsibleModule
@@ -38,6 +53,18 @@ from ansible_collections.sap.sap_operations.plugins.module_utils.compat import (
     dict_union,
 )
 
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_metadata import (
+    ABAP_RAW_TYPES,
+    ABAPFunctionMetadataCache,
+    function_description2dict,
+    result_types,
+    validate_parameters,
+)
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    is_table,
+    table2columnar,
+)
+
 try:
     from pyrfc import (
         Connection,
@@ -61,13 +88,22 @@ else:
 
 try:
     from suds.client import Client
+    from suds.cache import NoCache, ObjectCache
+    from suds.transport import Transport, Reply, TransportError
 except ImportError:
     try:
         from virtwho.virt.esx.suds.client import Client
+        from virtwho.virt.esx.suds.cache import NoCache, ObjectCache
+        from virtwho.virt.esx.suds.transport import Transport, Reply, TransportError
     except ImportError:
         HAS_SUDS_LIBRARY = False
         SUDS_LIBRARY_IMPORT_ERROR = traceback.format_exc()
         Client = None
+        NoCache = None
+        ObjectCache = None
+        Transport = object
+        Reply = None
+        TransportError = Exception
         HttpAuthenticated = None
         HttpTransport = None
     else:
@@ -595,6 +631,97 @@ ABAP_COUNTRY_CHOICES = [
     "ZW",
 ]
 
+# Keyword arguments of pyrfc Connection.call, that are not function module parameters
+PYRFC_CALL_OPTIONS = ("options",)
+
+# Options of rfc_connection, shared by modules and action plugins executing RFC on controller
+ABAP_RFC_CONFIG = dict(
+    rstrip=dict(type="bool", default=True),
+    return_import_params=dict(type="bool", default=False),
+    metadata_cache_dir=dict(type="path", required=False),
+    metadata_cache_days=dict(type="int", required=False, default=1),
+    validate_parameters=dict(type="bool", required=False, default=False),
+)
+
+ABAP_RFC_PARAMS = dict(
+    client=dict(type="str", required=False, default="000"),
+    user=dict(type="str", required=False),
+    passwd=dict(type="str", required=False, no_log=True),
+    lang=dict(
+        type="str", required=False, default="EN", choices=ABAP_LANGU_CHOICES
+    ),
+    trace=dict(
+        type="str", required=False, default="0", choices=["0", "1", "2", "3"]
+    ),
+    ashost=dict(type="str", required=False),
+    sysnr=dict(type="str", required=False),
+    mshost=dict(type="str", required=False),
+    msserv=dict(type="str", required=False),
+    sysid=dict(type="str", required=False),
+    group=dict(type="str", required=False),
+    # TODO SNC not supported yet
+    # snc_qop=dict(type='str', required= False, default='3', choices=['1','2','3','8','9']),
+    # snc_myname=dict(type='str', required= False),  #default - user
+    # snc_partnername=dict(type='str', required= False),
+    # snc_lib=dict(type='str', required= False),
+)
+# sapconnection=dict(type='dict', options=dict(config=config, params = params))
+# abap_argument_spec=dict(rfc_connection=dict(type='dict', options=(rfc_config | rfc_params)))
+
+ABAP_RFC_MUTUALLY_EXCLUSIVE = [
+    ("ashost", "mshost"),
+    ("ashost", "msserv"),
+    ("ashost", "sysid"),
+    ("ashost", "group"),
+    ("sysnr", "mshost"),
+    ("sysnr", "msserv"),
+    ("sysnr", "sysid"),
+    ("sysnr", "group"),
+    # TODO SNC not supported yet
+    # ('user','snc_qop'),
+    # ('user','snc_myname'),
+    # ('user','snc_partnername'),
+    # ('user','snc_lib'),
+    # ('passwd','snc_qop'),
+    # ('passwd','snc_myname'),
+    # ('passwd','snc_partnername'),
+    # ('passwd','snc_lib'),
+]
+ABAP_RFC_REQUIRED_TOGETHER = [
+    ("client", "user", "passwd"),
+    ("sysnr", "ashost"),
+    ("mshost", "sysid", "group"),
+    # TODO SNC not supported yet
+    # ('snc_qop','snc_myname','snc_partnername'),
+]
+
+
+def convert2ansible(result, types=None):
+    """Convert function call result to types supported by Ansible.
+
+    `types` are types of result fields from function metadata, see abap_metadata.result_types.
+    With types known, raw ABAP types are returned as hex strings instead of decoded text.
+    """
+    if isinstance(result, dict):
+        for k, v in result.items():
+            field = types.get(k) if types else None
+            if field is not None and isinstance(v, bytes) and field["type"] in ABAP_RAW_TYPES:
+                result[k] = v.hex().upper()
+            else:
+                result[k] = convert2ansible(v, field["fields"] if field else None)
+        return result
+    if isinstance(result, list):
+        return [convert2ansible(v, types) for v in result]
+    if isinstance(result, decimal.Decimal):
+        return str(result)  # Decimal is not supported by Ansible, converted to string
+    if isinstance(result, bytes):
+        # Bytes are decoded to strings, raw data that is not text is returned as hex string
+        try:
+            return result.decode(encoding="utf-8")
+        except UnicodeDecodeError:
+            return result.hex().upper()
+    return result
+
 
 class AnsibleModuleABAPException(Exception):
     pass
@@ -613,16 +740,76 @@ class AnsibleModuleABAPFailException(AnsibleModuleABAPException):
         self.kwargs = kwargs
 
 
+class ABAPFunctionParameterError(AnsibleModuleABAPFailException):
+    def __init__(self, msg, **kwargs):
+        """Function call parameters do not match function module interface."""
+        super(ABAPFunctionParameterError, self).__init__(msg, **kwargs)
+        Exception.__init__(self, msg)
+
+
 class SAPRFCClient(object):
-    def __init__(self, rstrip, return_import_params, **kwargs):
-        """Class handle SAP RFC connection."""
+    def __init__(
+        self,
+        rstrip,
+        return_import_params,
+        metadata_cache_dir=None,
+        metadata_cache_days=1,
+        validate_parameters=False,
+        **kwargs
+    ):
+        """Class handle SAP RFC connection.
+
+        Function descriptions are kept in memory for the client lifetime,
+        and on disk in metadata_cache_dir if set, so parameters can be validated without logon.
+        """
         self.rstrip = rstrip
         self.return_import_params = return_import_params
+        self.validate_parameters = validate_parameters
+        self.metadata_cache = (
+            ABAPFunctionMetadataCache(metadata_cache_dir, days=metadata_cache_days)
+            if metadata_cache_dir
+            else None
+        )
+        self.function_descriptions = {}
         self.params = {
             k: v for k, v in kwargs.items() if v is not None
         }  # Required, because if parameter is not set, Ansible sets it to None
         self.__connection = None
-        # self.unit = None
+        self.__unit = None
+
+    @property
+    def system(self):
+        """System key of metadata cache, SID if known, application server otherwise."""
+        if self.params.get("sysid"):
+            return self.params["sysid"]
+        return "{0}_{1}".format(self.params.get("ashost"), self.params.get("sysnr"))
+
+    def function_description(self, func_name: str) -> dict:
+        """Return function description as dictionary, see abap_metadata.function_description2dict."""
+        description = self.function_descriptions.get(func_name)
+        if description is not None:
+            return description
+        client = self.params.get("client", "000")
+        if self.metadata_cache is not None:
+            description = self.metadata_cache.get(self.system, client, func_name)
+        if description is None:
+            try:
+                description = function_description2dict(
+                    self.connection.get_function_description(func_name)
+                )
+            except Exception as e:
+                raise e
+            if self.metadata_cache is not None:
+                self.metadata_cache.set(self.system, client, func_name, description)
+        self.function_descriptions[func_name] = description
+        return description
+
+    def result_types(self, func_name: str):
+        """Return types of function result parameters, if function description is known."""
+        description = self.function_descriptions.get(func_name)
+        if description is None:
+            return None
+        return result_types(description)
 
     @property
     def connection(self):
@@ -639,6 +826,11 @@ class SAPRFCClient(object):
             raise e
         return self.__connection
 
+    def cancel(self):
+        """Cancel call running in another thread, if connection is open and pyrfc supports it."""
+        if self.__connection is not None and hasattr(self.__connection, "cancel"):
+            self.__connection.cancel()
+
     def close(self):
         # if self.unit is not None:
         #     try:
@@ -646,10 +838,14 @@ class SAPRFCClient(object):
         #     except Exception as e:
         #         raise e
         # if self.connection is not None:
+        if self.__connection is None:
+            return
         try:
-            self.connection.close()
+            self.__connection.close()
         except Exception as e:
             raise e
+        finally:
+            self.__connection = None
 
     # def __del__(self):
     #     if self.connection is not None:
@@ -679,33 +875,63 @@ class SAPRFCClient(object):
     def unit(self):
         if self.__unit is not None:
             return self.__unit
-        self.__unit = self.connection.initialize_unit(background=False)
+        self.__unit = self.initialize_unit()
         return self.__unit
 
-    # def get_unit(self):
-    #     if self.unit is not None:
-    #         return self.unit
-    #     self.unit = self.get_connection().initialize_unit(background=False)
+    def initialize_unit(self, background=True):
+        """Create new unit, background (bgRFC) unit or transactional (tRFC/qRFC) unit.
 
-    def confirm_unit(self):
+        Unit becomes current unit of the client.
+        """
         try:
-            self.connection.confirm_unit(self.unit)
+            self.__unit = self.connection.initialize_unit(background=background)
+        except Exception as e:
+            raise e
+        return self.__unit
+
+    def confirm_unit(self, unit=None):
+        try:
+            self.connection.confirm_unit(unit if unit is not None else self.__unit)
         except Exception as e:
             raise e
         finally:
-            self.__unit = None
+            if unit is None or unit is self.__unit:
+                self.__unit = None
+
+    def get_unit_state(self, unit=None):
+        try:
+            return self.connection.get_unit_state(unit if unit is not None else self.__unit)
+        except Exception as e:
+            raise e
 
-    def fill_and_submit_unit(self, func_name: str, **kwargs):
-        # if self.unit is None:
-        #     self.get_unit()
+    def fill_and_submit_unit(self, calls, queue_names=None, attributes=None):
+        """Queue function calls into current unit and submit it (fire and forget).
+
+        calls - list of (func_name, kwargs), queue_names - qRFC/bgRFC queues, unit is
+        queued if queue names are provided. Returns submitted unit, it can be confirmed later.
+        """
+        unit = self.unit
         try:
             self.connection.fill_and_submit_unit(
-                self.unit, list(func_name, {}), queue_names=None, attributes=None
+                unit,
+                [(func_name, kwargs) for func_name, kwargs in calls],
+                queue_names=queue_names or None,
+                attributes=attributes,
             )
         except Exception as e:
+            self.__unit = None
             raise e
+        self.__unit = None
+        return unit
 
     def __call__(self, func_name: str, **kwargs) -> dict:
+        if self.validate_parameters:
+            errors = validate_parameters(
+                self.function_description(func_name),
+                {k: v for k, v in kwargs.items() if k not in PYRFC_CALL_OPTIONS},
+            )
+            if errors:
+                raise ABAPFunctionParameterError(msg="; ".join(errors), function=func_name)
         try:
             # return self.get_connection().call(func_name=func_name, **kwargs)
             return self.connection.call(func_name=func_name, **kwargs)
@@ -715,9 +941,135 @@ class SAPRFCClient(object):
             raise e
 
 
+class SAPHTTPKeepAliveTransport(Transport):
+    """suds transport, that keeps persistent HTTP(S) connections per host.
+
+    WSDL downloads and SOAP calls of all functions in module run share the same connections.
+    Every request takes an idle connection of the host (or opens a new one) for its own use,
+    so requests of different threads run concurrently on separate connections.
+    Request is repeated once on a new connection only if a reused keep-alive connection
+    turns out to be closed by server before any response, SOAP calls are not idempotent.
+    suds binds transport to one client, use clone() to get transport for another client
+    sharing the same connections.
+    """
+
+    def __init__(self, username, password, timeout=90):  # noqa: D107
+        Transport.__init__(self)
+        self.timeout = timeout
+        self.authorization = None
+        if username is not None and password is not None:
+            self.authorization = "Basic {0}".format(
+                base64.b64encode(
+                    "{0}:{1}".format(username, password).encode("utf-8")
+                ).decode("ascii")
+            )
+        self.connections = {}
+        self.lock = threading.Lock()
+
+    def clone(self):
+        transport = SAPHTTPKeepAliveTransport(None, None, timeout=self.timeout)
+        transport.authorization = self.authorization
+        transport.connections = self.connections
+        transport.lock = self.lock
+        return transport
+
+    def _new_connection(self, scheme, netloc):
+        if scheme == "https":
+            return HTTPSConnection(
+                netloc, timeout=self.timeout, context=ssl.create_default_context()
+            )
+        return HTTPConnection(netloc, timeout=self.timeout)
+
+    def _checkout(self, scheme, netloc):
+        """Return idle connection of the host and True, or new connection and False."""
+        with self.lock:
+            idle = self.connections.get((scheme, netloc))
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(scheme, netloc), False
+
+    def _checkin(self, scheme, netloc, connection):
+        with self.lock:
+            self.connections.setdefault((scheme, netloc), []).append(connection)
+
+    @staticmethod
+    def _stale(error, sent):
+        """Return True if error means keep-alive connection was closed by server before request was processed."""
+        if isinstance(error, RemoteDisconnected):
+            return True
+        return not sent and isinstance(error, (BrokenPipeError, ConnectionResetError))
+
+    def _request(self, method, url, body=None, headers=None):
+        parsed = urlsplit(url)
+        path = parsed.path + ("?" + parsed.query if parsed.query else "")
+        request_headers = dict(headers or {})
+        request_headers["Connection"] = "keep-alive"
+        if self.authorization is not None:
+            request_headers["Authorization"] = self.authorization
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        for attempt in range(2):
+            connection, reused = self._checkout(parsed.scheme, parsed.netloc)
+            sent = False
+            try:
+                connection.request(method, path, body=body, headers=request_headers)
+                sent = True
+                response = connection.getresponse()
+                result = response.status, dict(response.getheaders()), response.read()
+            except Exception as e:
+                connection.close()
+                if attempt == 0 and reused and self._stale(e, sent):
+                    continue
+                raise
+            if response.will_close:
+                connection.close()
+            else:
+                self._checkin(parsed.scheme, parsed.netloc, connection)
+            return result
+
+    def open(self, request):
+        status, _headers, data = self._request("GET", request.url, headers=request.headers)
+        if status >= 300:
+            raise TransportError("HTTP {0} for {1}".format(status, request.url), status, BytesIO(data))
+        return BytesIO(data)
+
+    def send(self, request):
+        status, headers, data = self._request(
+            "POST", request.url, body=request.message, headers=request.headers
+        )
+        if status in (202, 204):
+            return None
+        if status >= 300:
+            raise TransportError("HTTP {0} for {1}".format(status, request.url), status, BytesIO(data))
+        return Reply(status, headers, data)
+
+    def close(self):
+        with self.lock:
+            for connections in self.connections.values():
+                for connection in connections:
+                    connection.close()
+            self.connections.clear()
+
+
 class SAPHTTPSOAPClient(object):
-    def __init__(self, hostname, username, password, language, client, port, security):
-        """Class handle SAP ABAP HTTP(S) SOAP connection."""
+    def __init__(
+        self,
+        hostname,
+        username,
+        password,
+        language,
+        client,
+        port,
+        security,
+        wsdl_cache_dir=None,
+        wsdl_cache_days=1,
+    ):
+        """Class handle SAP ABAP HTTP(S) SOAP connection.
+
+        suds client is created once per function and reused for all calls of this function.
+        If wsdl_cache_dir is set, downloaded WSDLs are cached on disk,
+        in directory per host, port and client, suds cache is keyed by URL (function).
+        """
         # /sap/public/ping
         if hostname is not None:
             self.hostname = hostname
@@ -734,27 +1086,55 @@ class SAPHTTPSOAPClient(object):
         if security is not None:
             self.security = security
         self.protocol = "https://" if security else "http://"
+        self.wsdl_cache_dir = wsdl_cache_dir
+        self.wsdl_cache_days = wsdl_cache_days
+        self.soap_clients = {}
+        self.transport = SAPHTTPKeepAliveTransport(
+            username=getattr(self, "username", None),
+            password=getattr(self, "password", None),
+        )
 
-    def __call__(self, func_name: str, **kwargs) -> dict:
+    def wsdl_cache(self):
+        """Return suds cache, NoCache without wsdl_cache_dir, default suds cache would write to temp directory."""
+        if not self.wsdl_cache_dir:
+            return NoCache()
+        return ObjectCache(
+            location=os.path.join(
+                self.wsdl_cache_dir,
+                "{0}_{1}_{2}".format(self.hostname, self.port, self.client),
+            ),
+            days=self.wsdl_cache_days,
+        )
+
+    def soap_client(self, func_name: str):
         escaped_func_name = func_name.replace("/", "_-")
+        soap_client = self.soap_clients.get(escaped_func_name)
+        if soap_client is not None:
+            return soap_client
+        url = "{0}{1}:{2}/sap/bc/soap/wsdl?sap-client={3}&services={4}".format(
+            self.protocol, self.hostname, self.port, self.client, escaped_func_name
+        )
         try:
-            url = "{0}{1}:{2}/sap/bc/soap/wsdl?sap-client={3}&services={4}".format(
-                self.protocol, self.hostname, self.port, self.client, escaped_func_name
+            soap_client = Client(
+                url, transport=self.transport.clone(), cache=self.wsdl_cache()
             )
-            try:
-                self.soap_client = Client(
-                    url, username=self.username, password=self.password
-                )
-            except Exception as e:
-                raise e
+        except Exception as e:
+            raise e
+        self.soap_clients[escaped_func_name] = soap_client
+        return soap_client
+
+    def __call__(self, func_name: str, **kwargs) -> dict:
+        escaped_func_name = func_name.replace("/", "_-")
+        try:
             return deep_asdict(
-                getattr(self.soap_client.service, escaped_func_name)(**kwargs)
+                getattr(self.soap_client(func_name).service, escaped_func_name)(**kwargs)
             )
         except Exception as e:
             raise e
 
     def close(self):
-        pass
+        self.soap_clients = {}
+        self.transport.close()
 
 
 class AnsibleModuleABAP(AnsibleModule):
@@ -770,69 +1150,17 @@ class AnsibleModuleABAP(AnsibleModule):
         supports_check_mode=False,
         required_if=None,
         required_by=None,
+        result_format=False,
     ):
-        """Class handle AnsibleModule with ABAP connection parameters."""
-        rfc_config = dict(
-            rstrip=dict(type="bool", default=True),
-            return_import_params=dict(type="bool", default=False),
-        )
-
-        rfc_params = dict(
-            client=dict(type="str", required=False, default="000"),
-            user=dict(type="str", required=False),
-            passwd=dict(type="str", required=False, no_log=True),
-            lang=dict(
-                type="str", required=False, default="EN", choices=ABAP_LANGU_CHOICES
-            ),
-            trace=dict(
-                type="str", required=False, default="0", choices=["0", "1", "2", "3"]
-            ),
-            ashost=dict(type="str", required=False),
-            sysnr=dict(type="str", required=False),
-            mshost=dict(type="str", required=False),
-            msserv=dict(type="str", required=False),
-            sysid=dict(type="str", required=False),
-            group=dict(type="str", required=False),
-            # TODO SNC not supported yet
-            # snc_qop=dict(type='str', required= False, default='3', choices=['1','2','3','8','9']),
-            # snc_myname=dict(type='str', required= False),  #default - user
-            # snc_partnername=dict(type='str', required= False),
-            # snc_lib=dict(type='str', required= False),
-        )
-        # sapconnection=dict(type='dict', options=dict(config=config, params = params))
-        # abap_argument_spec=dict(rfc_connection=dict(type='dict', options=(rfc_config | rfc_params)))
+        """Class handle AnsibleModule with ABAP connection parameters.
 
+        With result_format, module accepts option I(result_format) and has to pass its results
+        through format_result (see doc fragment sap.sap_operations.abap_rfc_doc.result_format).
+        """
         # https://docs.ansible.com/ansible/latest/dev_guide/developing_program_flow_modules.html#dependencies-between-module-options
         abap_mutually_exclusive = [
             ("rfc_connection", "http_connection"),
         ]
-        rfc_mutually_exclusive = [
-            ("ashost", "mshost"),
-            ("ashost", "msserv"),
-            ("ashost", "sysid"),
-            ("ashost", "group"),
-            ("sysnr", "mshost"),
-            ("sysnr", "msserv"),
-            ("sysnr", "sysid"),
-            ("sysnr", "group"),
-            # TODO SNC not supported yet
-            # ('user','snc_qop'),
-            # ('user','snc_myname'),
-            # ('user','snc_partnername'),
-            # ('user','snc_lib'),
-            # ('passwd','snc_qop'),
-            # ('passwd','snc_myname'),
-            # ('passwd','snc_partnername'),
-            # ('passwd','snc_lib'),
-        ]
-        rfc_required_together = [
-            ("client", "user", "passwd"),
-            ("sysnr", "ashost"),
-            ("mshost", "sysid", "group"),
-            # TODO SNC not supported yet
-            # ('snc_qop','snc_myname','snc_partnername'),
-        ]
-
         http_parameters = dict(
             hostname=dict(type="str", required=True),
             username=dict(type="str", required=False),
@@ -843,6 +1171,8 @@ class AnsibleModuleABAP(AnsibleModule):
             language=dict(
                 type="str", required=False, default="EN", choices=ABAP_LANGU_CHOICES
             ),
+            wsdl_cache_dir=dict(type="path", required=False),
+            wsdl_cache_days=dict(type="int", required=False, default=1),
         )
         http_required_together = [
             ("hostname", "username", "password"),
@@ -859,9 +1189,9 @@ class AnsibleModuleABAP(AnsibleModule):
             rfc_connection=dict(
                 type="dict",
                 aliases=["abap_system"],
-                options=dict_union(rfc_config, rfc_params),
-                mutually_exclusive=rfc_mutually_exclusive,
-                required_together=rfc_required_together,
+                options=dict_union(ABAP_RFC_CONFIG, ABAP_RFC_PARAMS),
+                mutually_exclusive=ABAP_RFC_MUTUALLY_EXCLUSIVE,
+                required_together=ABAP_RFC_REQUIRED_TOGETHER,
             ),
             http_connection=dict(
                 type="dict",
@@ -893,6 +1223,10 @@ class AnsibleModuleABAP(AnsibleModule):
         required_by = (
             required_by | abap_required_by if required_by else abap_required_by
         )
+        if result_format:
+            abap_argument_spec["result_format"] = dict(
+                type="str", required=False, default="dict", choices=["dict", "columnar"]
+            )
 
         super().__init__(
             argument_spec={**argument_spec, **abap_argument_spec},
@@ -917,19 +1251,41 @@ class AnsibleModuleABAP(AnsibleModule):
                     msg=missing_required_lib("pyrfc"),
                     exception=PYRFC_LIBRARY_IMPORT_ERROR,
                 )
-            self.abap_client = SAPRFCClient(**self.rfc_connection)
         elif self.http_connection:
             if not HAS_SUDS_LIBRARY:
                 self.fail_json(
                     msg=missing_required_lib("suds"),
                     exception=SUDS_LIBRARY_IMPORT_ERROR,
                 )
-            self.abap_client = SAPHTTPSOAPClient(**self.http_connection)
+        self.abap_client = self.create_client()
+        self.client_pool = []
         return self
 
+    def create_client(self, ashost=None, sysnr=None):
+        """Create new ABAP client with connection parameters of the module.
+
+        Connection is opened lazily, on first function call.
+        With ashost and sysnr, RFC client connects directly to this application server,
+        message server logon parameters of the module are ignored.
+        """
+        if self.rfc_connection:
+            if ashost is None:
+                return SAPRFCClient(**self.rfc_connection)
+            params = {
+                k: v
+                for k, v in self.rfc_connection.items()
+                if k not in ("mshost", "msserv", "sysid", "group")
+            }
+            params.update(ashost=ashost, sysnr=sysnr)
+            return SAPRFCClient(**params)
+        if self.http_connection:
+            return SAPHTTPSOAPClient(**self.http_connection)
+        return None
+
     def __exit__(self, exc_type, exc_value, exc_tb):
         """Class handle AnsibleModule with ABAP connection parameters."""
         if exc_type:
+            self.close_clients()
             if isinstance(exc_value, AnsibleModuleABAPException):
                 if isinstance(exc_value, AnsibleModuleABAPFailException):
                     self.fail_json(msg=exc_value.msg, **exc_value.kwargs)
@@ -942,27 +1298,277 @@ class AnsibleModuleABAP(AnsibleModule):
                     exception=str(exc_value),
                     traceback=traceback.format_tb(exc_tb),
                 )
+        self.close_clients()
+
+    def close_clients(self):
+        """Close client of the module and clients of the pool of map_parallel."""
+        for client in self.client_pool:
+            client.close()
+        self.client_pool = []
         if self.abap_client is not None:
             self.abap_client.close()
 
-    def convert2ansible(self, result):
-        if not isinstance(result, dict):
-            if isinstance(result, decimal.Decimal):
-                return str(
-                    result
-                )  # Decimal is not supported by Ansible, converted to string
-            if isinstance(result, bytes):
-                # Bytes are decoded to strings
-                return result.decode(encoding="utf-8")
-        else:
-            for k, v in result.items():
-                result[k] = self.convert2ansible(v)
-        return result
+    def convert2ansible(self, result, types=None):
+        """Convert function call result to types supported by Ansible, see convert2ansible."""
+        return convert2ansible(result, types)
 
-    def __call__(self, func_name: str, **kwargs) -> dict:
+    def format_result(self, result, func_name=None):
+        """Format function call result for module output as requested by I(result_format).
+
+        With C(columnar), table parameters (lists of dictionaries) of the result are converted
+        to {columns: [...], rows: [[...]]}. Result has to be converted with convert2ansible already.
+        If function description of func_name is known, ABAP types of columns are added as types.
+        Descriptions read by clients of map_parallel and map_distributed are known as well.
+        """
+        if self.params.get("result_format") != "columnar" or not isinstance(result, dict):
+            return result
+        types = self.result_types(self.abap_client, func_name) if func_name else None
+        formatted = {}
+        for k, v in result.items():
+            if not is_table(v):
+                formatted[k] = v
+                continue
+            formatted[k] = table2columnar(v)
+            fields = (types.get(k) or {}).get("fields") if types else None
+            if fields:
+                formatted[k]["types"] = [
+                    (fields.get(column) or {}).get("type")
+                    for column in formatted[k]["columns"]
+                ]
+        return formatted
+
+    def result_types(self, client, func_name: str):
+        if isinstance(client, SAPRFCClient):
+            return client.result_types(func_name)
+        return None
+
+    def call_with_client(self, client, func_name: str, **kwargs) -> dict:
         try:
-            result = self.abap_client(func_name, **kwargs)
+            result = client(func_name, **kwargs)
 
-            return self.convert2ansible(result)
+            return self.convert2ansible(result, self.result_types(client, func_name))
         except Exception as e:
             raise e
+
+    def __call__(self, func_name: str, **kwargs) -> dict:
+        return self.call_with_client(self.abap_client, func_name, **kwargs)
+
+    def map_parallel(self, worker, items, connections=1):
+        """Run worker(abap, item) for every item over up to `connections` ABAP clients.
+
+        `abap` passed to worker is a callable with the same signature as the module itself,
+        bound to one client, clients are never shared between threads.
+        First client is the client of the module, additional clients are taken from pool of the module,
+        created when pool is smaller than needed and closed when module exits, so that repeated calls
+        (page by page) do not log on again.
+        Results are returned in order of items, first exception raised by worker is re-raised.
+        """
+        items = list(items)
+        count = min(max(connections, 1), len(items)) - 1
+        while len(self.client_pool) < count:
+            self.client_pool.append(self.create_client())
+        clients = [(self.abap_client, None)] + [
+            (client, None) for client in self.client_pool[:count]
+        ]
+        try:
+            return self._map_clients(worker, items, clients)
+        finally:
+            for client, _server in clients[1:]:
+                self._merge_function_descriptions(client)
+
+    def application_servers(self, group=None):
+        """Return active application servers of the system as list of dictionaries name, host, sysnr.
+
+        Servers are read with TH_SERVER_LIST, with group only servers of
+        logon group (SMLG_GET_SETUP) are returned.
+        """
+        server_list = self("TH_SERVER_LIST").get("LIST", [])
+        servers = []
+        for server in server_list:
+            name = server.get("NAME", "")
+            parts = name.rsplit("_", 2)
+            if len(parts) != 3:
+                continue
+            servers.append(dict(name=name, host=parts[0], sysnr=parts[2]))
+        if group:
+            setup = self("SMLG_GET_SETUP").get("SETUP", [])
+            group_servers = {
+                row.get("APPLSERVER")
+                for row in setup
+                if row.get("CLASSNAME") == group and not row.get("GROUPTYPE")
+            }
+            servers = [server for server in servers if server["name"] in group_servers]
+        return sorted(servers, key=lambda server: server["name"])
+
+    def map_distributed(
+        self, worker, items, group=None, connections_per_server=1, max_servers=0
+    ):
+        """Run worker(abap, item) for every item, spread over application servers of the system.
+
+        Connections are opened directly to every application server (of logon group `group`),
+        at most connections_per_server per server, so work does not saturate one server.
+        `abap.server` is the name of application server worker runs on.
+        Results are returned in order of items, as with map_parallel.
+        """
+        if not isinstance(self.abap_client, SAPRFCClient):
+            raise AnsibleModuleABAPFailException(
+                msg="Distribution over application servers is supported only with rfc_connection"
+            )
+        items = list(items)
+        servers = self.application_servers(group=group)
+        if not servers:
+            raise AnsibleModuleABAPFailException(
+                msg="No application servers found{0}".format(
+                    " in logon group {0}".format(group) if group else ""
+                )
+            )
+        if max_servers and max_servers > 0:
+            servers = servers[:max_servers]
+        clients = []
+        for _i in range(max(connections_per_server, 1)):
+            for server in servers:
+                if len(clients) < len(items):
+                    clients.append(
+                        (
+                            self.create_client(ashost=server["host"], sysnr=server["sysnr"]),
+                            server["name"],
+                        )
+                    )
+        try:
+            return self._map_clients(worker, items, clients)
+        finally:
+            for client, _server in clients:
+                self._merge_function_descriptions(client)
+                client.close()
+
+    def _merge_function_descriptions(self, client):
+        """Keep function descriptions of pool client in module client, for types of format_result."""
+        if isinstance(client, SAPRFCClient) and isinstance(self.abap_client, SAPRFCClient):
+            for func_name, description in client.function_descriptions.items():
+                self.abap_client.function_descriptions.setdefault(func_name, description)
+
+    def _map_clients(self, worker, items, clients):
+        results = [None] * len(items)
+        errors = []
+        pending = queue.Queue()
+        for index, item in enumerate(items):
+            pending.put((index, item))
+
+        def run(client, server):
+            def abap(func_name, **kwargs):
+                return self.call_with_client(client, func_name, **kwargs)
+
+            abap.server = server
+
+            while not errors:
+                try:
+                    index, item = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = worker(abap, item)
+                except Exception as e:
+                    errors.append(e)
+
+        if len(clients) == 1:
+            run(*clients[0])
+        else:
+            threads = [threading.Thread(target=run, args=client) for client in clients]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+        return results
+
+    def call_many(self, calls, connections=1, distribution=None):
+        """Execute list of (func_name, kwargs) calls, return results in order with latency.
+
+        Failure of a single call does not stop the others, it is reported in its result.
+        With distribution (dictionary of map_distributed keyword arguments), calls are spread
+        over application servers and server is returned with every result.
+        """
+
+        def timed_call(abap, call):
+            func_name, kwargs = call
+            start = time.time()
+            try:
+                result = abap(func_name, **kwargs)
+            except Exception as e:
+                call_result = dict(
+                    function=func_name,
+                    failed=True,
+                    msg=str(e),
+                    latency=round(time.time() - start, 6),
+                )
+            else:
+                call_result = dict(
+                    function=func_name,
+                    failed=False,
+                    result=result,
+                    latency=round(time.time() - start, 6),
+                )
+            if abap.server is not None:
+                call_result["server"] = abap.server
+            return call_result
+
+        if distribution is not None:
+            return self.map_distributed(timed_call, calls, **distribution)
+        return self.map_parallel(timed_call, calls, connections=connections)
+
+    def _unit_client(self):
+        if not isinstance(self.abap_client, SAPRFCClient):
+            raise AnsibleModuleABAPFailException(
+                msg="Units (bgRFC/tRFC/qRFC) are supported only with rfc_connection"
+            )
+        return self.abap_client
+
+    def submit_units(self, calls, unit_size=0, background=True, queue_names=None):
+        """Fill list of (func_name, kwargs) calls into units and submit them without waiting.
+
+        With unit_size 0 all calls go into one unit, otherwise into units of unit_size calls.
+        Units are returned as dictionaries with id, background and queued keys,
+        they have to be confirmed with confirm_units.
+        """
+        client = self._unit_client()
+        calls = list(calls)
+        unit_size = unit_size if unit_size and unit_size > 0 else max(len(calls), 1)
+        units = []
+        for start in range(0, len(calls), unit_size):
+            client.initialize_unit(background=background)
+            unit = client.fill_and_submit_unit(
+                calls[start:start + unit_size], queue_names=queue_names
+            )
+            units.append(dict(unit, calls=len(calls[start:start + unit_size])))
+        return units
+
+    def confirm_units(self, units):
+        """Confirm previously submitted units, return list of confirmed unit ids."""
+        client = self._unit_client()
+        confirmed = []
+        for unit in units:
+            client.confirm_unit(
+                dict(
+                    id=unit["id"],
+                    background=unit.get("background", True),
+                    queued=unit.get("queued", False),
+                )
+            )
+            confirmed.append(unit["id"])
+        return confirmed
+
+    def get_units_state(self, units):
+        """Return state of background units, state of tRFC/qRFC units is not available."""
+        client = self._unit_client()
+        states = []
+        for unit in units:
+            unit = dict(
+                id=unit["id"],
+                background=unit.get("background", True),
+                queued=unit.get("queued", False),
+            )
+            state = client.get_unit_state(unit) if unit["background"] else None
+            states.append(dict(unit, state=state))
+        return states
@@ -0,0 +1,210 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+# Parameter directions of pyrfc function description
+RFC_IMPORT = "RFC_IMPORT"
+RFC_EXPORT = "RFC_EXPORT"
+RFC_CHANGING = "RFC_CHANGING"
+RFC_TABLES = "RFC_TABLES"
+
+# Parameters which can be passed to function module by caller
+ABAP_CALLER_DIRECTIONS = (RFC_IMPORT, RFC_CHANGING, RFC_TABLES)
+
+# ABAP types returned by pyrfc as bytes, they are raw data and not UTF-8 text
+ABAP_RAW_TYPES = ("RFCTYPE_BYTE", "RFCTYPE_XSTRING")
+
+# ABAP types returned by pyrfc as decimal.Decimal
+ABAP_DECIMAL_TYPES = ("RFCTYPE_BCD", "RFCTYPE_DECF16", "RFCTYPE_DECF34")
+
+
+def type_description2list(type_description):
+    """Convert pyrfc TypeDescription to list of field dictionaries, nested types included."""
+    if type_description is None:
+        return None
+    fields = []
+    for field in type_description.fields:
+        fields.append(
+            dict(
+                name=field["name"],
+                field_type=field["field_type"],
+                nuc_length=field.get("nuc_length"),
+                uc_length=field.get("uc_length"),
+                decimals=field.get("decimals"),
+                fields=type_description2list(field.get("type_description")),
+            )
+        )
+    return fields
+
+
+def function_description2dict(function_description):
+    """Convert pyrfc FunctionDescription to JSON serializable dictionary."""
+    return dict(
+        name=function_description.name,
+        parameters=[
+            dict(
+                name=parameter["name"],
+                parameter_type=parameter["parameter_type"],
+                direction=parameter["direction"],
+                optional=bool(parameter.get("optional")),
+                nuc_length=parameter.get("nuc_length"),
+                uc_length=parameter.get("uc_length"),
+                decimals=parameter.get("decimals"),
+                default_value=parameter.get("default_value"),
+                parameter_text=parameter.get("parameter_text"),
+                type_name=(
+                    parameter["type_description"].name
+                    if parameter.get("type_description") is not None
+                    else None
+                ),
+                fields=type_description2list(parameter.get("type_description")),
+            )
+            for parameter in function_description.parameters
+        ],
+    )
+
+
+def validate_parameters(description, kwargs):
+    """Validate function call parameters against function description, return list of errors.
+
+    Unknown parameters and missing mandatory importing parameters are reported.
+    """
+    errors = []
+    parameters = {parameter["name"]: parameter for parameter in description["parameters"]}
+    for name in kwargs:
+        parameter = parameters.get(name)
+        if parameter is None:
+            errors.append(
+                "Unknown parameter {0} of function {1}, valid parameters: {2}".format(
+                    name,
+                    description["name"],
+                    ", ".join(
+                        sorted(
+                            p["name"]
+                            for p in parameters.values()
+                            if p["direction"] in ABAP_CALLER_DIRECTIONS
+                        )
+                    ),
+                )
+            )
+        elif parameter["direction"] not in ABAP_CALLER_DIRECTIONS:
+            errors.append(
+                "Parameter {0} of function {1} is exporting parameter and can not be passed".format(
+                    name, description["name"]
+                )
+            )
+    for parameter in parameters.values():
+        if (
+            parameter["direction"] == RFC_IMPORT
+            and not parameter["optional"]
+            and parameter["name"] not in kwargs
+        ):
+            errors.append(
+                "Missing mandatory parameter {0} of function {1}".format(
+                    parameter["name"], description["name"]
+                )
+            )
+    return errors
+
+
+def fields2types(fields):
+    if not fields:
+        return None
+    return {
+        field["name"]: dict(type=field["field_type"], fields=fields2types(field["fields"]))
+        for field in fields
+    }
+
+
+def result_types(description):
+    """Return {parameter: {type, fields}} types of function result, used for conversion.
+
+    Nested structures and table rows have their fields in the same format.
+    """
+    return {
+        parameter["name"]: dict(
+            type=parameter["parameter_type"],
+            fields=fields2types(parameter["fields"]),
+        )
+        for parameter in description["parameters"]
+    }
+
+
+def table_parameters(description):
+    """Return names of table parameters of function module."""
+    return [
+        parameter["name"]
+        for parameter in description["parameters"]
+        if parameter["direction"] == RFC_TABLES
+        or parameter["parameter_type"] == "RFCTYPE_TABLE"
+    ]
+
+
+class ABAPFunctionMetadataCache(object):
+    """Disk cache of function descriptions, one JSON file per system, client and function.
+
+    Entries older than `days` are ignored and fetched again.
+    """
+
+    def __init__(self, cache_dir, days=1):  # noqa: D107
+        self.cache_dir = cache_dir
+        self.days = days
+
+    def path(self, system, client, func_name):
+        key = hashlib.sha256(func_name.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(
+            self.cache_dir,
+            "{0}_{1}".format(system, client),
+            "{0}_{1}.json".format(func_name.replace("/", "_-"), key),
+        )
+
+    def get(self, system, client, func_name):
+        path = self.path(system, client, func_name)
+        try:
+            if time.time() - os.path.getmtime(path) > self.days * 86400:
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, system, client, func_name, description):
+        path = self.path(system, client, func_name)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(description, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            # Cache is optimization only, failure to write it is not an error
+            pass
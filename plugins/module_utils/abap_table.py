@@ -0,0 +1,377 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+
+__metaclass__ = type
+
+import csv
+import json
+import os
+import textwrap
+
+"""
+ABAP_READ_TABLE_FUNCTIONS - remote enabled functions to read ABAP tables with maximum row width in characters.
+RFC_READ_TABLE and BBP_RFC_READ_TABLE return rows in table DATA, /BODS/RFC_READ_TABLE2 returns rows
+in one of TBLOUT* tables, name of this table is returned in OUT_TABLE.
+"""
+ABAP_READ_TABLE_FUNCTIONS = {
+    "RFC_READ_TABLE": 512,
+    "BBP_RFC_READ_TABLE": 512,
+    "/BODS/RFC_READ_TABLE2": 30000,
+}
+
+ABAP_READ_TABLE_OPTION_WIDTH = 72
+
+# Fields of DD03L read to find key fields of a table, known lengths save field metadata call
+DD03L_KEY_FIELDS = [
+    {"FIELDNAME": "FIELDNAME", "LENGTH": "30"},
+    {"FIELDNAME": "POSITION", "LENGTH": "4"},
+]
+
+
+def read_table_where_options(where):
+    """Split WHERE clause to OPTIONS table lines of maximum 72 characters, without breaking words."""
+    if not where:
+        return []
+    if not isinstance(where, str):
+        where = " ".join(where)
+    return [
+        {"TEXT": line}
+        for line in textwrap.wrap(
+            where,
+            ABAP_READ_TABLE_OPTION_WIDTH,
+            break_long_words=False,
+            break_on_hyphens=False,
+        )
+    ]
+
+
+class ABAPTableReadError(Exception):
+    """Table cannot be read consistently with remote enabled read table function."""
+
+
+def function_not_found(error):
+    """Check if error of function call means that function module does not exist in the system."""
+    return getattr(error, "key", None) == "FU_NOT_FOUND" or "FU_NOT_FOUND" in str(error)
+
+
+def read_table_fields(abap, table, fields=None, function="RFC_READ_TABLE"):
+    """Return field descriptions (FIELDNAME, OFFSET, LENGTH, TYPE, FIELDTEXT) without reading data."""
+    result = abap(
+        function,
+        QUERY_TABLE=table,
+        NO_DATA="X",
+        FIELDS=[{"FIELDNAME": field} for field in (fields or [])],
+    )
+    return result.get("FIELDS", [])
+
+
+def read_table_key_fields(abap, table, function="RFC_READ_TABLE"):
+    """Return names of key fields of ABAP table from DD03L, in order of table definition."""
+    rows = read_table(
+        abap,
+        "DD03L",
+        fields=["FIELDNAME", "POSITION"],
+        where=[
+            "TABNAME = '{0}' AND AS4LOCAL = 'A' AND KEYFLAG = 'X'".format(
+                table.upper().replace("'", "''")
+            )
+        ],
+        function=function,
+        table_fields=DD03L_KEY_FIELDS,
+        key_fields=[],
+    )
+    return [
+        row["FIELDNAME"]
+        for row in sorted(rows, key=lambda row: int(row.get("POSITION") or 0))
+        if row["FIELDNAME"] and not row["FIELDNAME"].startswith(".")
+    ]
+
+
+def read_table_field_groups(fields, width, key_fields=None):
+    """Split fields to groups, each group fits into one row of `width` characters.
+
+    Every group starts with `key_fields` (field descriptions), so that rows of groups can be joined on key.
+    """
+    key_fields = key_fields or []
+    key_names = [field["FIELDNAME"] for field in key_fields]
+    key_width = sum(int(field.get("LENGTH") or 0) for field in key_fields)
+    groups = []
+    group = []
+    group_width = key_width
+    for field in fields:
+        if field["FIELDNAME"] in key_names:
+            continue
+        length = int(field.get("LENGTH") or 0)
+        if group and group_width + length > width:
+            groups.append(key_names + group)
+            group = []
+            group_width = key_width
+        group.append(field["FIELDNAME"])
+        group_width += length
+    if group or not groups:
+        groups.append(key_names + group)
+    return groups
+
+
+def read_table_decode(rows, fields):
+    """Decode fixed width rows (WA) to list of dictionaries using offsets from field descriptions."""
+    slices = [
+        (
+            field["FIELDNAME"],
+            int(field.get("OFFSET") or 0),
+            int(field.get("OFFSET") or 0) + int(field.get("LENGTH") or 0),
+        )
+        for field in fields
+    ]
+    return [
+        {name: row.get("WA", "")[start:end].strip() for name, start, end in slices}
+        for row in rows
+    ]
+
+
+def read_table_join(pages, key_fields):
+    """Join rows of field group pages on key fields, rows of the first page define order.
+
+    Raises ABAPTableReadError if groups do not contain the same rows,
+    database returned rows in different order for different groups.
+    """
+    page = pages[0]
+    if len(pages) == 1:
+        return page
+    rows = {}
+    for row in page:
+        rows[tuple(row[key] for key in key_fields)] = row
+    for group_page in pages[1:]:
+        keys = set()
+        for group_row in group_page:
+            key = tuple(group_row[k] for k in key_fields)
+            row = rows.get(key)
+            if row is None:
+                raise ABAPTableReadError(
+                    "Rows of field groups do not match, key {0} is missing in first group".format(
+                        key
+                    )
+                )
+            row.update(group_row)
+            keys.add(key)
+        if len(keys) != len(rows):
+            raise ABAPTableReadError(
+                "Rows of field groups do not match, {0} of {1} rows found".format(
+                    len(keys), len(rows)
+                )
+            )
+    return page
+
+
+def read_table_metadata(
+    abap, table, fields=None, function="RFC_READ_TABLE", table_fields=None
+):
+    """Return (table_fields, key_fields) descriptions needed by read_table.
+
+    Key fields are read from DD03L, descriptions of key fields not in `fields` are read as well.
+    """
+    if table_fields is None:
+        table_fields = read_table_fields(abap, table, fields, function)
+    key_names = read_table_key_fields(abap, table, function)
+    names = [field["FIELDNAME"] for field in table_fields]
+    key_fields = [field for field in table_fields if field["FIELDNAME"] in key_names]
+    missing = [key for key in key_names if key not in names]
+    if missing:
+        key_fields += read_table_fields(abap, table, missing, function)
+    key_fields.sort(key=lambda field: key_names.index(field["FIELDNAME"]))
+    return table_fields, key_fields
+
+
+def read_table(
+    abap,
+    table,
+    fields=None,
+    where=None,
+    page_size=10000,
+    max_rows=0,
+    function="RFC_READ_TABLE",
+    table_fields=None,
+    key_fields=None,
+):
+    """Generator, reads ABAP table page by page and yields rows as dictionaries.
+
+    Pages are read with ROWSKIPS/ROWCOUNT, rows wider than maximum row width of `function`
+    are read in several field groups. Key fields (descriptions, see read_table_metadata, read if None)
+    are read in every group, groups are joined on key.
+
+    Read functions select without ORDER BY, so order of rows may differ between calls.
+    Rows of different pages are checked for duplicate keys, duplicate means that rows were
+    skipped as well, ABAPTableReadError is raised instead of returning incomplete table.
+    Only fields of `table_fields` are returned, in their order.
+    """
+    width = ABAP_READ_TABLE_FUNCTIONS[function]
+    options = read_table_where_options(where)
+    if key_fields is None:
+        table_fields, key_fields = read_table_metadata(
+            abap, table, fields, function, table_fields
+        )
+    elif table_fields is None:
+        table_fields = read_table_fields(abap, table, fields, function)
+    names = [field["FIELDNAME"] for field in table_fields]
+    groups = read_table_field_groups(table_fields, width, key_fields)
+    if len(groups) > 1 and not key_fields:
+        raise ABAPTableReadError(
+            "Rows of table {0} are wider than {1} characters and table has no key fields to join field groups".format(
+                table, width
+            )
+        )
+    if sum(int(field.get("LENGTH") or 0) for field in key_fields) >= width:
+        raise ABAPTableReadError(
+            "Key fields of table {0} do not fit into {1} characters of {2}".format(
+                table, width, function
+            )
+        )
+    key_fields = [field["FIELDNAME"] for field in key_fields]
+
+    seen = set()
+    rows_read = 0
+    while True:
+        rowcount = page_size
+        if max_rows:
+            rowcount = min(page_size, max_rows - rows_read)
+            if rowcount <= 0:
+                return
+        pages = []
+        for group in groups:
+            result = abap(
+                function,
+                QUERY_TABLE=table,
+                DELIMITER="",
+                ROWSKIPS=rows_read,
+                ROWCOUNT=rowcount,
+                OPTIONS=options,
+                FIELDS=[{"FIELDNAME": field} for field in group],
+            )
+            data = result.get(result.get("OUT_TABLE") or "DATA") or []
+            pages.append(read_table_decode(data, result.get("FIELDS", [])))
+        page = read_table_join(pages, key_fields)
+        last_page = len(page) < rowcount
+        if key_fields and (rows_read or not last_page):
+            for row in page:
+                key = tuple(row[k] for k in key_fields)
+                if key in seen:
+                    raise ABAPTableReadError(
+                        "Row with key {0} of table {1} was returned on two pages, order of rows changed "
+                        "between calls and rows were skipped, read with bigger page_size".format(
+                            key, table
+                        )
+                    )
+                seen.add(key)
+        for row in page:
+            yield {name: row.get(name, "") for name in names}
+        rows_read += len(page)
+        if last_page:
+            return
+
+
+def is_columnar(value):
+    """Check if value is table in columnar format - dictionary with 'columns', 'rows' and optional 'types' keys."""
+    return (
+        isinstance(value, dict)
+        and {"columns", "rows"} <= set(value) <= {"columns", "rows", "types"}
+        and isinstance(value["columns"], list)
+        and isinstance(value["rows"], list)
+    )
+
+
+def is_table(value):
+    """Check if value is ABAP table parameter - list of dictionaries."""
+    return bool(value) and isinstance(value, list) and isinstance(value[0], dict)
+
+
+def table2columnar(table, convert=None):
+    """Convert list of dictionaries (ABAP table) to {columns: [...], rows: [[...]]}.
+
+    Columns are taken from the first row, all rows of ABAP table have the same fields.
+    If `convert` is provided, it is applied to every value.
+    """
+    columns = list(table[0]) if table else []
+    if convert is None:
+        rows = [[row.get(column) for column in columns] for row in table]
+    else:
+        rows = [[convert(row.get(column)) for column in columns] for row in table]
+    return dict(columns=columns, rows=rows)
+
+
+def columnar2table(columnar):
+    """Convert {columns: [...], rows: [[...]]} back to list of dictionaries."""
+    columns = columnar["columns"]
+    return [dict(zip(columns, row)) for row in columnar["rows"]]
+
+
+class ABAPResultFileWriter(object):
+    """Write rows (dictionaries) to file on managed host, as JSON lines or CSV.
+
+    For CSV, columns are taken from `columns`, header is written even without rows,
+    or from keys of first row if `columns` are not known.
+    Rows are written to temporary file next to `path`, which replaces `path` only if writing finished
+    without exception.
+    """
+
+    def __init__(self, path, output_format="jsonl", columns=None):  # noqa: D107
+        self.path = path
+        self.output_format = output_format
+        self.columns = columns
+        self.count = 0
+        self.file = None
+        self.csv_writer = None
+
+    def __enter__(self):
+        self.file = open(self.path + ".tmp", "w", newline="", encoding="utf-8")
+        if self.output_format == "csv" and self.columns:
+            # Header is written even if there are no rows
+            self.csv_writer = self.header(self.columns)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self.file.close()
+        if exc_type is None:
+            os.replace(self.path + ".tmp", self.path)
+        else:
+            os.unlink(self.path + ".tmp")
+
+    def header(self, columns):
+        csv_writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction="ignore")
+        csv_writer.writeheader()
+        return csv_writer
+
+    def write(self, row):
+        if self.output_format == "csv":
+            if self.csv_writer is None:
+                self.csv_writer = self.header(list(row))
+            self.csv_writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row, default=str))
+            self.file.write("\n")
+        self.count += 1
+
+    def write_rows(self, rows):
+        for row in rows:
+            self.write(row)
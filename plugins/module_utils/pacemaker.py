@@ -23,9 +23,10 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
+import threading
 import xml.etree.ElementTree as ET  # nosec B405
+from collections import OrderedDict
 
-from ansible_collections.sap.sap_operations.plugins.module_utils.compat import dict_union
 
 """
 PACEMAKER_XML_LIST_ELEMENTS is a list of XML tags for which all the tags below will be considered as elements of the list,
@@ -64,49 +65,222 @@ PACEMAKER_XML_LIST_ELEMENTS = (
     "node",  # TODO handle nodes differently - node names, see pacemaker status xml
     "tags",
     "bans",
+    "diff",  # crm_diff patch, see pcs_cib_info since option
+    "change-list",
 )
 
 
+_PACEMAKER_XML_LIST_ELEMENTS = frozenset(PACEMAKER_XML_LIST_ELEMENTS)
+
+
+def _element2dict(element, children):
+    """Convert element to dictionary, children are already converted dictionaries of its child elements."""
+    attributes = element.attrib
+    if not children:
+        if attributes:
+            return {element.tag: dict(attributes)}
+        return {element.tag: element.text}
+    if element.tag in _PACEMAKER_XML_LIST_ELEMENTS:
+        if attributes:
+            return {"attrib": dict(attributes), element.tag: children}
+        return {element.tag: children}
+    # Children override attributes with the same name, later children override earlier ones
+    merged = dict(attributes)
+    for child in children:
+        merged.update(child)
+    return {element.tag: merged}
+
+
 def Element2Dict(root):
     """Converts an Element object to a dictionary.
 
+    Tree is converted in one pass without recursion, cost is linear in number of elements.
+    Any ElementTree compatible Element is accepted.
+
     Args:
         root (Element): The root element to convert to a dictionary.
 
     Returns:
         dict: The dictionary representation of the Element object.
     """
-    ret = {}
-    children = [Element2Dict(child) for child in root]
-    attributes = root.attrib
-    root_is_list = root.tag in PACEMAKER_XML_LIST_ELEMENTS
-
-    if attributes and children:
-        if not root_is_list:
-            children_dict = {}
-            for child in children:
-                children_dict = dict_union(children_dict, child)
-            ret[root.tag] = dict_union(root.attrib, children_dict)
-        else:
-            ret["attrib"] = root.attrib
-            ret[root.tag] = children
-
-    elif attributes and not children:
-        ret[root.tag] = root.attrib
-
-    elif not attributes and children:
-        if not root_is_list:
-            children_dict = {}
-            for child in children:
-                children_dict = dict_union(children_dict, child)
-            ret[root.tag] = children_dict
-        else:
-            ret[root.tag] = children
-
-    elif not attributes and not children:
-        return {root.tag: root.text}
-
-    return ret
+    # Stack of (element, iterator over its children, converted children)
+    stack = [(root, iter(root), [])]
+    while True:
+        element, children, converted = stack[-1]
+        child = next(children, None)
+        if child is not None:
+            stack.append((child, iter(child), []))
+            continue
+        stack.pop()
+        result = _element2dict(element, converted)
+        if not stack:
+            return result
+        stack[-1][2].append(result)
+
+
+# Resource paths below <resources>, in the order resources were always returned by lookup helpers,
+# {0} is resource element tag, primitive in CIB, resource in status
+PACEMAKER_RESOURCE_PATHS = (
+    ("{0}",),
+    ("clone", "{0}"),
+    ("group", "{0}"),
+    ("clone", "group", "{0}"),
+    ("group",),
+    ("clone", "group"),
+)
+PACEMAKER_RESOURCE_TAGS = ("primitive", "resource")
+
+
+class PacemakerIndex(object):
+    """Index of pacemaker CIB (cibadmin --query) or status (pcs status xml) XML, built in one walk.
+
+    Lookups by resource ID, node name and cluster property set are dictionary lookups
+    instead of XPath scans of the whole tree. Results are in the same order as XPath results used before,
+    resources are ordered by PACEMAKER_RESOURCE_PATHS and by document order within the same path.
+    Index has to be built again if the tree is changed.
+    """
+
+    def __init__(self, root):  # noqa: D107
+        if isinstance(root, ET.ElementTree):
+            root = root.getroot()
+        self.root = root
+        self.paths = {}
+        for tag in PACEMAKER_RESOURCE_TAGS:
+            for i, path in enumerate(PACEMAKER_RESOURCE_PATHS):
+                self.paths.setdefault(tuple(t.format(tag) for t in path), i)
+
+        self.parents = {}
+        # (path, id) -> elements, path is tuple of tags below <resources>
+        self.resources_by_path_and_id = {}
+        self.resources_by_path = {}
+        self.nodes_by_uname = {}
+        self.node_attributes = {}
+        self.nvpairs = []
+        self.nvpairs_by_property_set_id = {}
+
+        # Depth-first walk in document order, stack keeps element and tags of its ancestors below root
+        stack = [(root, ())]
+        while stack:
+            element, ancestors = stack.pop()
+            path = ancestors + (element.tag,) if element is not root else ()
+            for child in reversed(element):
+                self.parents[child] = element
+                stack.append((child, path))
+            if element is not root:
+                self._add(element, ancestors)
+
+    def _add(self, element, ancestors):
+        element_id = element.get("id")
+        tag = element.tag
+        # Resource paths have up to 3 tags below <resources>
+        for length in range(1, 4):
+            if len(ancestors) < length or ancestors[-length] != "resources":
+                continue
+            path = ancestors[len(ancestors) - length + 1:] + (tag,)
+            if path in self.paths:
+                self.resources_by_path.setdefault(path, []).append(element)
+                self.resources_by_path_and_id.setdefault((path, element_id), []).append(element)
+
+        parent_tag = ancestors[-1] if ancestors else None
+        if tag == "node" and parent_tag == "nodes" and element.get("uname") is not None:
+            self.nodes_by_uname.setdefault(element.get("uname"), []).append(element)
+        elif tag == "nvpair" and parent_tag == "cluster_property_set":
+            self.nvpairs.append(element)
+            property_set_id = self.parents[element].get("id")
+            self.nvpairs_by_property_set_id.setdefault(property_set_id, []).append(element)
+        elif tag == "attribute" and ancestors[-2:] == ("node_attributes", "node"):
+            # Status: node_attributes/node[@name]/attribute[@name, @value]
+            node = self.parents[element].get("name")
+            self.node_attributes.setdefault(node, {})[element.get("name")] = element.get("value")
+        elif tag == "nvpair" and ancestors[-3:] == (
+            "node_state",
+            "transient_attributes",
+            "instance_attributes",
+        ):
+            # CIB: status/node_state[@uname]/transient_attributes/instance_attributes/nvpair
+            node = self.parents[self.parents[self.parents[element]]].get("uname")
+            self.node_attributes.setdefault(node, {})[element.get("name")] = element.get("value")
+
+    def parent(self, element):
+        return self.parents.get(element)
+
+    def _resource_paths(self, tag, path_indexes=None):
+        return [
+            tuple(t.format(tag) for t in PACEMAKER_RESOURCE_PATHS[i])
+            for i in (path_indexes or range(len(PACEMAKER_RESOURCE_PATHS)))
+        ]
+
+    def resources(self, tag, resource_id=None, path_indexes=None):
+        """Return resources with element tag and groups, all or with the given ID.
+
+        path_indexes limits result to some of PACEMAKER_RESOURCE_PATHS.
+        """
+        paths = self._resource_paths(tag, path_indexes)
+        if resource_id is None:
+            return [
+                resource for path in paths for resource in self.resources_by_path.get(path, [])
+            ]
+        return [
+            resource
+            for path in paths
+            for resource in self.resources_by_path_and_id.get((path, resource_id), [])
+        ]
+
+    def nodes(self, uname):
+        return self.nodes_by_uname.get(uname, [])
+
+    def cluster_property_set(self, cluster_property_set_id=None):
+        """Return nvpair elements of cluster property set, of all sets if ID is not given."""
+        if cluster_property_set_id is None:
+            return self.nvpairs
+        return self.nvpairs_by_property_set_id.get(cluster_property_set_id, [])
+
+
+# Parsed XML is shared by all callers with the same XML string, see pcs_fromstring
+PACEMAKER_XML_CACHE_SIZE = 16
+_PACEMAKER_XML_CACHE = OrderedDict()
+_PACEMAKER_XML_CACHE_LOCK = threading.Lock()
+
+
+def pcs_index(tree):
+    """Return PacemakerIndex of tree (tree is Element, ElementTree or index).
+
+    Index of tree returned by pcs_fromstring is taken from its cache, index of any other tree
+    is built on every call and is not kept, so trees are released as soon as callers drop them.
+    """
+    if isinstance(tree, PacemakerIndex):
+        return tree
+    if isinstance(tree, ET.ElementTree):
+        tree = tree.getroot()
+    with _PACEMAKER_XML_CACHE_LOCK:
+        for index in _PACEMAKER_XML_CACHE.values():
+            if index.root is tree:
+                return index
+    return PacemakerIndex(tree)
+
+
+def pcs_fromstring(xml_string):
+    """Parse pacemaker CIB or status XML string and index it, return root Element.
+
+    Trees are kept in LRU cache of PACEMAKER_XML_CACHE_SIZE entries keyed by content of the XML string,
+    so filters evaluated many times for the same pacemaker_cib_xml in one process parse and index it once.
+    XML string itself is the key. Python caches hash of a string object, lookup with the same object
+    is cheap, but equal string from another object is hashed and compared character by character,
+    linear in size of CIB, which is still much cheaper than parsing it.
+    Returned tree is shared and must not be modified.
+    """
+    with _PACEMAKER_XML_CACHE_LOCK:
+        index = _PACEMAKER_XML_CACHE.get(xml_string)
+        if index is not None:
+            _PACEMAKER_XML_CACHE.move_to_end(xml_string)
+            return index.root
+
+    index = PacemakerIndex(ET.fromstring(xml_string))  # nosec B314
+    with _PACEMAKER_XML_CACHE_LOCK:
+        _PACEMAKER_XML_CACHE[xml_string] = index
+        while len(_PACEMAKER_XML_CACHE) > PACEMAKER_XML_CACHE_SIZE:
+            _PACEMAKER_XML_CACHE.popitem(last=False)
+    return index.root
 
 
 def get_pacemaker_status_xml(module):
@@ -131,23 +305,67 @@ def get_pacemaker_status_xml(module):
     return stdout
 
 
-def get_pacemaker_cib_query_xml(module):
+def get_pacemaker_crm_mon_xml(module):
+    """This function runs the 'crm_mon --one-shot --inactive --output-as=xml' command and returns the output.
+
+    Output is crm_mon XML output format with root element 'pacemaker-result', not the legacy format
+    (root element 'crm_mon') of 'pcs status xml', so it must not be passed to parsers of pcs status XML.
+    Both formats have nodes, resources, node_attributes and failures below the root element.
+
+    Args:
+        module: The AnsibleModule object.
+
+    Returns:
+        The output of the 'crm_mon' command.
+
+    Raises:
+        AnsibleFailJson: If the command fails to execute or returns an error.
+    """
+    rc, stdout, err = None, None, None
+    try:
+        rc, stdout, err = module.run_command(
+            args=["crm_mon", "--one-shot", "--inactive", "--output-as=xml"]
+        )
+    except Exception as e:
+        module.fail_json(msg="Failed with exception", exception=(str(e)))
+    if rc:
+        module.fail_json(msg="Error occurred during execution", error=err, rc=rc)
+    return stdout
+
+
+# cibadmin exit code if no element matches --xpath (CRM_EX_NOSUCH)
+CIBADMIN_NO_SUCH_OBJECT = 105
+
+
+def get_pacemaker_cib_query_xml(module, scope=None, xpath=None, no_children=False):
     """This function runs the 'cibadmin --query' command and returns the output.
 
     Args:
         module: The AnsibleModule object.
+        scope (str): CIB section to query, passed as --scope.
+        xpath (str): XPath expression of elements to query, passed as --xpath.
+        no_children (bool): Query elements without their children, passed as --no-children.
 
     Returns:
-        The output of the 'cibadmin --query' command.
+        The output of the 'cibadmin --query' command, None if no element matches xpath.
 
     Raises:
         AnsibleFailJson: If the command fails to execute or an error occurs.
     """
+    args = ["cibadmin", "--query"]
+    if scope:
+        args += ["--scope", scope]
+    if xpath:
+        args += ["--xpath", xpath]
+    if no_children:
+        args += ["--no-children"]
     rc, stdout, err = None, None, None
     try:
-        rc, stdout, err = module.run_command(args=["cibadmin", "--query"])
+        rc, stdout, err = module.run_command(args=args)
     except Exception as e:
         module.fail_json(msg="Failed with exception", exception=(str(e)))
+    if xpath and rc == CIBADMIN_NO_SUCH_OBJECT:
+        return None
     if err:
         module.fail_json(msg="Error occurred during execution", error=err)
     if not rc:
@@ -155,6 +373,57 @@ def get_pacemaker_cib_query_xml(module):
     return stdout
 
 
+PACEMAKER_CIB_VERSION_ATTRIBUTES = ("admin_epoch", "epoch", "num_updates")
+
+
+def pcs_cib_version(pcs_cib_root):
+    """Returns CIB version as dictionary of admin_epoch, epoch and num_updates (integers) of cib element."""
+    return dict(
+        (attribute, int(pcs_cib_root.get(attribute, 0)))
+        for attribute in PACEMAKER_CIB_VERSION_ATTRIBUTES
+    )
+
+
+def get_pacemaker_cib_version(module):
+    """Returns CIB version with 'cibadmin --query --xpath /cib --no-children', without querying CIB content.
+
+    Args:
+        module: The AnsibleModule object.
+
+    Returns:
+        dict: admin_epoch, epoch and num_updates, see pcs_cib_version.
+    """
+    pcs_cib_xml_string = get_pacemaker_cib_query_xml(module, xpath="/cib", no_children=True)
+    try:
+        return pcs_cib_version(ET.fromstring(pcs_cib_xml_string))  # nosec B314
+    except Exception as e:
+        module.fail_json(msg="Failed to read CIB version", exception=str(e))
+
+
+def get_pacemaker_cib_diff_xml(module, original_filename, new_filename):
+    """Runs 'crm_diff' for two CIB files and returns patch XML, None if CIBs are the same.
+
+    Args:
+        module: The AnsibleModule object.
+        original_filename (str): File with original CIB.
+        new_filename (str): File with new CIB.
+
+    Returns:
+        str: Patch XML, as printed by crm_diff.
+    """
+    rc, stdout, err = None, None, None
+    try:
+        rc, stdout, err = module.run_command(
+            args=["crm_diff", "--original", original_filename, "--new", new_filename]
+        )
+    except Exception as e:
+        module.fail_json(msg="Failed with exception", exception=(str(e)))
+    # crm_diff exits with 1 if differences were found
+    if rc not in (0, 1):
+        module.fail_json(msg="Error occurred during execution", error=err, rc=rc)
+    return stdout if stdout.strip() else None
+
+
 def run_pcs_command(
     module, args="", check_rc=True, check_stderr=True
 ):
@@ -216,7 +485,7 @@ def pcs_validate_resource(
     :rtype: bool
     """  # noqa: E501
     return bool(
-        pcs_config_tree.findall(".//resources/primitive[@id='{0}']".format(resource_id)) + pcs_config_tree.findall(".//resources/clone/primitive/[@id='{0}']".format(resource_id))  # noqa: E501
+        pcs_index(pcs_config_tree).resources("primitive", resource_id, path_indexes=(0, 1))
     )
 
 
@@ -230,7 +499,7 @@ def pcs_validate_node(pcs_config_tree, node):
     Returns:
         bool: True if the node exists in the pcs_config_tree, False otherwise.
     """
-    return bool(pcs_config_tree.findall(".//nodes/node[@uname='{0}']".format(node)))
+    return bool(pcs_index(pcs_config_tree).nodes(node))
 
 
 def pcs_resource_info(
@@ -247,9 +516,7 @@ def pcs_resources_by_id(
     resource_id="",
 ):
     # TODO: use only pcs_config_tree? - yes, message says, there is no resource in CIB
-    return (
-        pcs_status_tree.findall(".//resources/resource[@id='{}']".format(resource_id)) + pcs_status_tree.findall(".//resources/clone/resource/[@id='{0}']".format(resource_id))  # noqa: E501
-    )
+    return pcs_index(pcs_status_tree).resources("resource", resource_id, path_indexes=(0, 1))
 
 
 def pcs_resources_by_id_from_status(pcs_status_tree, resource_id=None):
@@ -262,24 +529,7 @@ def pcs_resources_by_id_from_status(pcs_status_tree, resource_id=None):
     Returns:
         List[Element]: A list of XML elements representing resources with the given ID.
     """
-    if resource_id is None:
-        return (
-            pcs_status_tree.findall(".//resources/resource") +
-            pcs_status_tree.findall(".//resources/clone/resource") +
-            pcs_status_tree.findall(".//resources/group/resource") +
-            pcs_status_tree.findall(".//resources/clone/group/resource") +
-            pcs_status_tree.findall(".//resources/group") +
-            pcs_status_tree.findall(".//resources/clone/group")
-
-        )
-    return (
-        pcs_status_tree.findall(".//resources/resource[@id='{0}']".format(resource_id)) +
-        pcs_status_tree.findall(".//resources/clone/resource[@id='{0}']".format(resource_id)) +
-        pcs_status_tree.findall(".//resources/group/resource[@id='{0}']".format(resource_id)) +
-        pcs_status_tree.findall(".//resources/clone/group/resource[@id='{0}']".format(resource_id)) +
-        pcs_status_tree.findall(".//resources/group[@id='{0}']".format(resource_id)) +
-        pcs_status_tree.findall(".//resources/clone/group[@id='{0}']".format(resource_id))
-    )
+    return pcs_index(pcs_status_tree).resources("resource", resource_id)
 
 
 def pcs_resources_by_id_from_cib(pcs_cib_tree, resource_id=None):
@@ -292,23 +542,7 @@ def pcs_resources_by_id_from_cib(pcs_cib_tree, resource_id=None):
     Returns:
         List[Element]: A list of Element objects representing the resources with the given ID.
     """
-    if resource_id is None:
-        return (
-            pcs_cib_tree.findall(".//resources/primitive") +
-            pcs_cib_tree.findall(".//resources/clone/primitive") +
-            pcs_cib_tree.findall(".//resources/group/primitive") +
-            pcs_cib_tree.findall(".//resources/clone/group/primitive") +
-            pcs_cib_tree.findall(".//resources/group") +
-            pcs_cib_tree.findall(".//resources/clone/group")
-        )
-    return (
-        pcs_cib_tree.findall(".//resources/primitive[@id='{0}']".format(resource_id)) +
-        pcs_cib_tree.findall(".//resources/clone/primitive[@id='{0}']".format(resource_id)) +
-        pcs_cib_tree.findall(".//resources/group/primitive[@id='{0}']".format(resource_id)) +
-        pcs_cib_tree.findall(".//resources/clone/group/primitive[@id='{0}']".format(resource_id)) +
-        pcs_cib_tree.findall(".//resources/group[@id='{0}']".format(resource_id)) +
-        pcs_cib_tree.findall(".//resources/clone/group[@id='{0}']".format(resource_id))
-    )
+    return pcs_index(pcs_cib_tree).resources("primitive", resource_id)
 
 
 def pcs_resource_attrib(resource, attrib_name):
@@ -335,12 +569,7 @@ def pcs_cluster_property_set_from_cib(pcs_cib_tree, cluster_property_set_id=None
     Returns:
         List[Element]: A list of Element objects representing the cluster property set with the given ID.
     """
-    if cluster_property_set_id is None:
-        return pcs_cib_tree.findall(".//cluster_property_set/nvpair")
-    return pcs_cib_tree.findall(
-        ".//cluster_property_set[@id='{0}']/nvpair".format(
-            cluster_property_set_id
-        ))
+    return pcs_index(pcs_cib_tree).cluster_property_set(cluster_property_set_id)
 
 
 def get_pcs_resource_agent_provider_from_status(pcs_resource):
@@ -46,15 +46,19 @@ from ansible_collections.sap.sap_operations.plugins.module_utils.compat import (
 
 try:
     from http.client import HTTPConnection
+    from urllib.parse import urlsplit, urlunsplit
 except ImportError:
     from httplib import HTTPConnection
+    from urlparse import urlsplit, urlunsplit
 
 try:
-    from suds.client import Client
+    from suds.client import Client, ServiceSelector
+    from suds.options import Options
     from suds.transport.http import HttpAuthenticated, HttpTransport
 except (ImportError, NameError):
     try:
-        from virtwho.virt.esx.suds.client import Client
+        from virtwho.virt.esx.suds.client import Client, ServiceSelector
+        from virtwho.virt.esx.suds.options import Options
         from virtwho.virt.esx.suds.transport.http import (
             HttpAuthenticated,
             HttpTransport,
@@ -109,6 +113,23 @@ def convert2ansible(obj):
     return obj
 
 
+def clone_client(client, **kwargs):
+    """Return new suds client sharing parsed WSDL of client, with own options set from kwargs.
+
+    Same as suds Client.clone(), which fails to deep copy options on recent python versions.
+    """
+    clone = Client.__new__(Client)
+    clone.options = Options()
+    clone.options.transport = HttpAuthenticated()
+    clone.set_options(**kwargs)
+    clone.wsdl = client.wsdl
+    clone.factory = client.factory
+    clone.service = ServiceSelector(clone, client.wsdl.services)
+    clone.sd = client.sd
+    clone.messages = dict(tx=None, rx=None)
+    return clone
+
+
 class LocalSocketHttpConnection(HTTPConnection):
     def __init__(  # noqa: D107
         self,
@@ -159,6 +180,9 @@ class SAPHostSOAPClient(object):
 
     Methods are lookedup via __getattr__(), if method is not found, exception will happen,
     this exception has to be handled by higher class.
+
+    If wsdl_client (suds client of the same binary) is provided, its parsed WSDL is reused
+    and no WSDL is downloaded for this client.
     """
 
     poll_interval = 3
@@ -172,6 +196,7 @@ class SAPHostSOAPClient(object):
         security=None,
         instance=None,
         binary=C.SAPHOSTCTRL,
+        wsdl_client=None,
     ):
         self.hostname = hostname
         self.username = username
@@ -216,6 +241,7 @@ class SAPHostSOAPClient(object):
                 self.url = "{0}://{1}:{2}/sapcontrol?wsdl".format(
                     self.protocol, self.hostname, self.port
                 )
+        self.wsdl_client = wsdl_client
         self.client = None
 
         self.connect()
@@ -226,10 +252,25 @@ class SAPHostSOAPClient(object):
 
         return self._connect_http()
 
+    def _clone_wsdl_client(self, **kwargs):
+        """Clone wsdl_client with service location pointing to this host and port."""
+        location = urlsplit(self.wsdl_client.wsdl.services[0].ports[0].location)
+        url = urlsplit(self.url)
+        return clone_client(
+            self.wsdl_client,
+            location=urlunsplit(
+                (url.scheme, url.netloc, location.path, location.query, "")
+            ),
+            **kwargs
+        )
+
     def _connect_local(self):
         try:
             localsocket = LocalSocketHttpAuthenticated(self.unix_socket)
-            client = Client(self.url, transport=localsocket)
+            if self.wsdl_client is not None:
+                client = self._clone_wsdl_client(transport=localsocket)
+            else:
+                client = Client(self.url, transport=localsocket)
         except Exception as e:
             raise e
 
@@ -248,8 +289,13 @@ class SAPHostSOAPClient(object):
                         cafile=self.ca_file)  # nosec B323
                 )
         try:
-            client = Client(self.url, username=self.username,
-                            password=self.password)
+            if self.wsdl_client is not None:
+                client = self._clone_wsdl_client(
+                    username=self.username, password=self.password
+                )
+            else:
+                client = Client(self.url, username=self.username,
+                                password=self.password)
         except Exception as e:
             raise Exception(str(e) + self.url)
 
@@ -345,7 +391,13 @@ def saphostctrl(
 
 
 def sapcontrol(
-    instance, hostname=None, username=None, password=None, ca_file=None, security=None
+    instance,
+    hostname=None,
+    username=None,
+    password=None,
+    ca_file=None,
+    security=None,
+    wsdl_client=None,
 ):
     return SAPHostSOAPClient(
         hostname=hostname,
@@ -355,4 +407,5 @@ def sapcontrol(
         security=security,
         instance=instance,
         binary=C.SAPCONTROL,
+        wsdl_client=wsdl_client,
     )
@@ -75,6 +75,10 @@ GREEN = "SAPControl-GREEN"  # Running
 RED = "SAPControl-RED"  # Failure
 GRAY = "SAPControl-GRAY"  # Stopped
 
+DRAIN_WP_TYPES = ("DIA", "UPD", "UP2")  # Work processes serving user work
+DRAIN_WP_BUSY = ("Run", "Hold")  # Work process status counted as busy
+DRAIN_QUEUE_TYPES = ("ABAP/DIA", "ABAP/UPD", "ABAP/UP2", "ABAP/NOWP")
+
 
 def check_sdk(module):
     if not HAS_SUDS_LIBRARY:
@@ -194,6 +198,151 @@ class SAPClient(object):
     def get_system_instance_list(self):
         return [dict(s) for s in self.client.GetSystemInstanceList()[0]]
 
+    def set_server_inactive(self):
+        """Remove ABAP application server of this instance from logon groups (soft shutdown preparation)."""
+        try:
+            self.client.ABAPSetServerInactive()
+        except Exception as e:
+            raise Exception(
+                "ABAPSetServerInactive failed for instance {0} on {1}: {2}".format(
+                    self.instance, self.hostname or "localhost", str(e)
+                )
+            )
+
+    def set_server_active(self):
+        """Return ABAP application server of this instance to logon groups, errors are ignored.
+
+        Used to undo set_server_inactive when drain fails, original error is reported instead.
+        """
+        try:
+            self.client.ABAPSetServerActive()
+        except Exception:
+            pass
+
+    def get_wp_table(self):
+        """Return work processes of this instance."""
+        r = self.client.ABAPGetWPTable()
+        if len(r) > 0:
+            return [dict(p) for p in r[0]]
+        return []
+
+    def get_queue_statistic(self):
+        r = self.client.GetQueueStatistic()
+        if len(r) > 0:
+            return [dict(q) for q in r[0]]
+        return []
+
+    def active_work(self):
+        """Count busy dialog/update work processes and queued dispatcher requests of this instance."""
+        work_processes = sum(
+            1
+            for wp in self.get_wp_table()
+            if wp.get("Typ") in DRAIN_WP_TYPES and wp.get("Status") in DRAIN_WP_BUSY
+        )
+        try:
+            queued = sum(
+                int(q.get("Now") or 0)
+                for q in self.get_queue_statistic()
+                if q.get("Typ") in DRAIN_QUEUE_TYPES
+            )
+        except Exception:
+            queued = 0
+        return dict(work_processes=work_processes, queued=queued)
+
+    def abap_instance_clients(self):
+        """Return connected clients for every ABAP instance of the system.
+
+        Instances are reached by their hostname with the credentials of this client.
+        If this client is connected locally, instances on this host are reached over local socket.
+        """
+        clients = []
+        for instance in self.get_system_instance_list():
+            if "ABAP" not in str(instance.get("features") or "").split("|"):
+                continue
+            hostname = instance.get("hostname")
+            if self.hostname is None and is_local_host(hostname):
+                hostname = None
+            client = SAPClient(
+                hostname,
+                self.username,
+                self.password,
+                self.ca_file,
+                self.secure,
+                str(instance.get("instanceNr")).zfill(2),
+            )
+            try:
+                client.connect()
+            except Exception as e:
+                raise Exception(
+                    "Cannot connect to ABAP instance {0} on {1} to drain it: {2}".format(
+                        client.instance, instance.get("hostname"), str(e)
+                    )
+                )
+            clients.append(client)
+        return clients
+
+    def drain(self, threshold=0, timeout=300):
+        """Take all ABAP instances of the system out of logon groups and wait until active work drops to threshold.
+
+        Active work is summed over all ABAP instances.
+        Waits at most timeout seconds, returns drain report with drain time in seconds.
+        If system is not drained, because of timeout or error, instances are set active again.
+        """
+        start = time.monotonic()
+        deadline = start + timeout
+        clients = self.abap_instance_clients()
+        inactive = []
+        work = None
+        try:
+            for client in clients:
+                client.set_server_inactive()
+                inactive.append(client)
+            work = system_active_work(clients)
+            while work["work_processes"] + work["queued"] > threshold:
+                if time.monotonic() >= deadline:
+                    break
+                time.sleep(self.poll_interval)
+                work = system_active_work(clients)
+        finally:
+            # Instances stay inactive only if system is drained and will be stopped
+            if work is None or work["work_processes"] + work["queued"] > threshold:
+                for client in inactive:
+                    client.set_server_active()
+        drained = work["work_processes"] + work["queued"] <= threshold
+        return dict(
+            drained=drained,
+            drain_time=round(time.monotonic() - start, 3),
+            inactive_instances=[
+                dict(hostname=client.hostname, instance_number=client.instance)
+                for client in (clients if drained else [])
+            ],
+            active_work=work,
+        )
+
+
+def is_local_host(hostname):
+    """Check if hostname (short, fully qualified or virtual) is address of this host."""
+    if not hostname or hostname == "localhost":
+        return True
+    names = set([socket.gethostname().split(".")[0].lower(), socket.getfqdn().split(".")[0].lower()])
+    if hostname.split(".")[0].lower() in names:
+        return True
+    try:
+        address = socket.gethostbyname(hostname)
+        local_addresses = set(socket.gethostbyname_ex(socket.gethostname())[2])
+    except (socket.error, UnicodeError):
+        return False
+    return address.startswith("127.") or address in local_addresses
+
+
+def system_active_work(clients):
+    """Sum active work of all instance clients."""
+    work = dict(work_processes=0, queued=0)
+    for client in clients:
+        for key, value in client.active_work().items():
+            work[key] += value
+    return work
+
 
 class SystemClient(SAPClient):
     # TODO(kirill): What should we wait for in case of specific system definition?
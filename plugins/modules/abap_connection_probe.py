@@ -0,0 +1,325 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_connection_probe
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Measure latency and throughput of connection to SAP ABAP system
+
+description:
+  - Measure network connect time, logon time and function call latency of RFC or HTTP(S) connection
+    to SAP ABAP system, to find out if slowness is caused by network, logon or server processing
+  - Network connect time is time to open TCP connection to gateway port (RFC, I(rfc_connection.ashost) only)
+    or to HTTP(S) port
+  - Logon time is time to open RFC connection with logon, for HTTP(S) it is time of the first call,
+    which includes download of WSDL document
+  - I(count) calls of I(function) are executed and latency percentiles are reported
+  - With I(payload_sizes), STFC_PERFORMANCE is called to transfer payloads of given sizes
+    from SAP ABAP system, and throughput is reported
+
+version_added: 2.13.0
+
+options:
+  function:
+    description: Function module called to measure latency
+    type: str
+    required: false
+    default: RFC_PING
+    choices: [RFC_PING, STFC_CONNECTION]
+
+  count:
+    description: Number of calls to measure latency
+    type: int
+    required: false
+    default: 10
+
+  payload_sizes:
+    description:
+      - Sizes of payloads in bytes transferred from SAP ABAP system with STFC_PERFORMANCE
+      - Payload is transferred in rows of 1000 characters, sizes are rounded up to full rows
+    type: list
+    elements: int
+    required: false
+    default: []
+
+  payload_count:
+    description: Number of calls for every payload size
+    type: int
+    required: false
+    default: 3
+
+  connect_timeout:
+    description: Timeout of TCP connect measurement in seconds
+    type: int
+    required: false
+    default: 10
+"""
+
+EXAMPLES = r"""
+- name: Measure RFC latency baseline
+  sap.sap_operations.abap_connection_probe:
+    count: 50
+    payload_sizes: [1000, 100000, 1000000]
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+
+- name: Measure HTTPS latency
+  sap.sap_operations.abap_connection_probe:
+    http_connection:
+      hostname: application-instance-hostname
+      port: 44300
+      username: DDIC
+      password: "SecretPa$$word"
+      client: "000"
+"""
+
+RETURN = r"""
+abap_connection_probe:
+  description: Measurements, times in seconds
+  type: dict
+  returned: success
+  sample:
+    protocol: rfc
+    target: application-instance-hostname:3300
+    connect_time: 0.0012
+    logon_time: 0.0431
+    first_call_time: 0.0052
+    function: RFC_PING
+    latency:
+      count: 10
+      min: 0.0009
+      mean: 0.0011
+      p50: 0.0010
+      p90: 0.0014
+      p99: 0.0016
+      max: 0.0016
+    calls_per_second: 909.1
+    payloads:
+      - size: 100000
+        latency:
+          count: 3
+          min: 0.0081
+          mean: 0.0085
+          p50: 0.0084
+          p90: 0.0089
+          p99: 0.0089
+          max: 0.0089
+        bytes_per_second: 11764705.9
+  contains:
+    protocol:
+      description: C(rfc) or C(http)
+      type: str
+    target:
+      description: Host and port of TCP connect measurement, null if not measured
+      type: str
+    connect_time:
+      description: Time to open TCP connection, null if not measured
+      type: float
+    logon_time:
+      description: Time to open RFC connection with logon, null for HTTP(S)
+      type: float
+    first_call_time:
+      description: Time of the first call of I(function), for HTTP(S) includes download of WSDL document
+      type: float
+    latency:
+      description: Latency statistics of I(count) calls after the first call
+      type: dict
+    calls_per_second:
+      description: Calls per second, sequential calls over one connection
+      type: float
+    payloads:
+      description: Latency and throughput for every size of I(payload_sizes)
+      type: list
+      elements: dict
+"""
+
+import math
+import socket
+import time
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+    SAPRFCClient,
+)
+
+ABAP_PAYLOAD_ROW_SIZE = 1000
+
+
+def percentile(values, p):
+    """Return p-th percentile of sorted values, nearest rank method."""
+    if not values:
+        return None
+    rank = max(int(math.ceil(p / 100.0 * len(values))), 1)
+    return values[rank - 1]
+
+
+def latency_statistics(latencies):
+    values = sorted(latencies)
+    if not values:
+        return dict(count=0)
+    return dict(
+        count=len(values),
+        min=round(values[0], 6),
+        mean=round(sum(values) / len(values), 6),
+        p50=round(percentile(values, 50), 6),
+        p90=round(percentile(values, 90), 6),
+        p99=round(percentile(values, 99), 6),
+        max=round(values[-1], 6),
+    )
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def tcp_connect_time(host, port, timeout):
+    """Return time to open TCP connection, None if connection failed."""
+    try:
+        seconds, sock = timed(socket.create_connection, (host, port), timeout)
+    except (OSError, socket.timeout):
+        return None
+    sock.close()
+    return seconds
+
+
+def connect_target(module):
+    """Return (host, port) of TCP connect measurement, None if it can not be determined."""
+    rfc_connection = module.params.get("rfc_connection")
+    if rfc_connection:
+        if rfc_connection.get("ashost") and rfc_connection.get("sysnr"):
+            return rfc_connection["ashost"], 3300 + int(rfc_connection["sysnr"])
+        return None
+    http_connection = module.params["http_connection"]
+    return http_connection["hostname"], http_connection["port"]
+
+
+def main():
+    argument_spec = dict(
+        function=dict(
+            type="str",
+            required=False,
+            default="RFC_PING",
+            choices=["RFC_PING", "STFC_CONNECTION"],
+        ),
+        count=dict(type="int", required=False, default=10),
+        payload_sizes=dict(type="list", elements="int", required=False, default=[]),
+        payload_count=dict(type="int", required=False, default=3),
+        connect_timeout=dict(type="int", required=False, default=10),
+    )
+
+    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=True)
+    function = module.params["function"]
+    kwargs = dict(REQUTEXT="ansible") if function == "STFC_CONNECTION" else {}
+
+    target = connect_target(module)
+    abap_connection_probe = dict(
+        protocol="rfc" if module.params.get("rfc_connection") else "http",
+        target="{0}:{1}".format(*target) if target else None,
+        connect_time=None,
+        logon_time=None,
+        function=function,
+    )
+    if target:
+        connect_time = tcp_connect_time(
+            target[0], target[1], module.params["connect_timeout"]
+        )
+        abap_connection_probe["connect_time"] = (
+            round(connect_time, 6) if connect_time is not None else None
+        )
+
+    with module as abap:
+        client = abap.abap_client
+        if isinstance(client, SAPRFCClient):
+            logon_time, _connection = timed(lambda: client.connection)
+            abap_connection_probe["logon_time"] = round(logon_time, 6)
+
+        first_call_time, _result = timed(abap, function, **kwargs)
+        abap_connection_probe["first_call_time"] = round(first_call_time, 6)
+
+        latencies = []
+        for _i in range(module.params["count"]):
+            latency, _result = timed(abap, function, **kwargs)
+            latencies.append(latency)
+        abap_connection_probe["latency"] = latency_statistics(latencies)
+        abap_connection_probe["calls_per_second"] = (
+            round(len(latencies) / sum(latencies), 1) if sum(latencies) else None
+        )
+
+        payloads = []
+        for size in module.params["payload_sizes"]:
+            rows = max(int(math.ceil(size / float(ABAP_PAYLOAD_ROW_SIZE))), 1)
+            payload_latencies = []
+            for _i in range(module.params["payload_count"]):
+                latency, _result = timed(
+                    abap,
+                    "STFC_PERFORMANCE",
+                    CHECKTAB=" ",
+                    LGET0332="0",
+                    LGET1000=str(rows),
+                )
+                payload_latencies.append(latency)
+            payloads.append(
+                dict(
+                    size=rows * ABAP_PAYLOAD_ROW_SIZE,
+                    latency=latency_statistics(payload_latencies),
+                    bytes_per_second=(
+                        round(
+                            rows * ABAP_PAYLOAD_ROW_SIZE * len(payload_latencies)
+                            / sum(payload_latencies),
+                            1,
+                        )
+                        if sum(payload_latencies)
+                        else None
+                    ),
+                )
+            )
+        abap_connection_probe["payloads"] = payloads
+
+    module.exit_json(
+        changed=False,
+        failed=False,
+        abap_connection_probe=abap_connection_probe,
+    )
+
+
+if __name__ == "__main__":
+    main()
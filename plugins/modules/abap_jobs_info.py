@@ -0,0 +1,487 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_jobs_info
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Get information about background jobs of SAP ABAP system and wait for them
+
+description:
+  - Get background jobs of SAP ABAP system by name pattern, user, status and start time window
+  - External management interface XBP is used (BAPI_XMI_LOGON, BAPI_XBP_JOB_SELECT, BAPI_XBP_JOB_STATUS_GET),
+    all calls are executed in one XMI session over one connection
+  - With I(wait=true) module waits until all selected jobs are finished or aborted,
+    polling interval grows while no job changes status and is reset when a job changes status
+  - Runtime and start delay of every job are returned
+  - User needs authorization for XBP interface (S_XMI_PROD) and to display jobs of other users (S_BTCH_ADM)
+
+version_added: 2.13.0
+
+options:
+  jobname:
+    description: Job name pattern, C(*) is wildcard
+    type: str
+    required: false
+    default: "*"
+
+  username:
+    description: Pattern of user name that scheduled the job, C(*) is wildcard
+    type: str
+    required: false
+    default: "*"
+
+  status:
+    description: Select jobs with these statuses
+    type: list
+    elements: str
+    required: false
+    default: [scheduled, released, ready, running, finished, aborted]
+    choices: [scheduled, released, ready, running, finished, aborted]
+
+  from_date:
+    description: Select jobs planned to start on or after this date, YYYYMMDD
+    type: str
+    required: false
+
+  from_time:
+    description: Time of I(from_date), HHMMSS
+    type: str
+    required: false
+    default: "000000"
+
+  to_date:
+    description: Select jobs planned to start on or before this date, YYYYMMDD
+    type: str
+    required: false
+
+  to_time:
+    description: Time of I(to_date), HHMMSS
+    type: str
+    required: false
+    default: "235959"
+
+  jobs:
+    description:
+      - Jobs identified by job name and job count
+      - If provided, jobs are not selected by I(jobname), I(username), I(status) and start time window
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      jobname:
+        description: Job name
+        type: str
+        required: true
+      jobcount:
+        description: Job count (job ID)
+        type: str
+        required: true
+
+  wait:
+    description: Wait until all jobs are finished or aborted
+    type: bool
+    required: false
+    default: false
+
+  wait_timeout:
+    description: Maximum time to wait in seconds
+    type: int
+    required: false
+    default: 3600
+
+  poll_interval:
+    description: Initial interval between status checks in seconds
+    type: int
+    required: false
+    default: 5
+
+  max_poll_interval:
+    description: Maximum interval between status checks in seconds
+    type: int
+    required: false
+    default: 60
+
+  fail_on_abort:
+    description: Fail if one of jobs is aborted, only with I(wait=true)
+    type: bool
+    required: false
+    default: true
+
+  external_user:
+    description: External user name reported to XBP interface, visible in XMI log
+    type: str
+    required: false
+    default: ANSIBLE
+"""
+
+EXAMPLES = r"""
+- name: Get jobs aborted today
+  sap.sap_operations.abap_jobs_info:
+    status: [aborted]
+    from_date: "{{ ansible_date_time.date | replace('-', '') }}"
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+
+- name: Wait for batch chain after maintenance
+  sap.sap_operations.abap_jobs_info:
+    jobname: Z_CHAIN_*
+    status: [released, ready, running]
+    wait: true
+    wait_timeout: 7200
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+"""
+
+RETURN = r"""
+abap_jobs_info:
+  description: Background jobs
+  type: list
+  elements: dict
+  returned: success
+  sample:
+    - JOBNAME: Z_CHAIN_STEP_1
+      JOBCOUNT: "10452100"
+      STATUS: F
+      STATUS_TEXT: finished
+      SDLUNAME: DDIC
+      SDLSTRTDT: "20240101"
+      SDLSTRTTM: "100000"
+      STRTDATE: "20240101"
+      STRTTIME: "100004"
+      ENDDATE: "20240101"
+      ENDTIME: "100130"
+      DELAY: 4
+      RUNTIME: 86
+  contains:
+    JOBNAME:
+      description: Job name
+      type: str
+    JOBCOUNT:
+      description: Job count (job ID)
+      type: str
+    STATUS:
+      description: Job status code
+      type: str
+    STATUS_TEXT:
+      description: Job status, one of I(status) choices, or unknown
+      type: str
+    DELAY:
+      description: Delay of job start after planned start in seconds, null if job did not start
+      type: int
+    RUNTIME:
+      description: Runtime of job in seconds, null if job did not finish
+      type: int
+
+abap_jobs_wait:
+  description: Wait result, returned only with I(wait=true)
+  type: dict
+  returned: success and I(wait=true)
+  contains:
+    wait_time:
+      description: Time waited in seconds
+      type: float
+      sample: 94.2
+    polls:
+      description: Number of status checks
+      type: int
+      sample: 9
+    timed_out:
+      description: True if jobs were not complete within I(wait_timeout)
+      type: bool
+      sample: false
+"""
+
+import time
+from datetime import datetime
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+    AnsibleModuleABAPFailException,
+)
+
+"""
+ABAP_JOB_STATUSES - status: (job status code, flag of JOB_SELECT_PARAM of BAPI_XBP_JOB_SELECT)
+"""
+ABAP_JOB_STATUSES = dict(
+    scheduled=("P", "PRELIM"),
+    released=("S", "SCHEDUL"),
+    ready=("Y", "READY"),
+    running=("R", "RUNNING"),
+    finished=("F", "FINISHED"),
+    aborted=("A", "ABORTED"),
+)
+
+ABAP_JOB_COMPLETE = ("F", "A")
+
+XBP_INTERFACE = "XBP"
+XBP_VERSION = "3.0"
+
+
+def check_return(result, func_name):
+    message = result.get("RETURN") or {}
+    if isinstance(message, list):
+        message = next((m for m in message if m.get("TYPE") in ("E", "A")), {})
+    if message.get("TYPE") in ("E", "A"):
+        raise AnsibleModuleABAPFailException(
+            msg="{0}: {1}".format(func_name, message.get("MESSAGE", ""))
+        )
+    return result
+
+
+def abap_datetime(date, time_of_day):
+    """Return datetime of ABAP date (YYYYMMDD) and time (HHMMSS), None for initial date."""
+    if not date or date.strip("0 ") == "":
+        return None
+    try:
+        return datetime.strptime(date + (time_of_day or "000000"), "%Y%m%d%H%M%S")
+    except ValueError:
+        return None
+
+
+def job_timings(job):
+    """Add STATUS_TEXT, DELAY (planned to actual start) and RUNTIME (actual start to end) to job."""
+    status_texts = {code: text for text, (code, _flag) in ABAP_JOB_STATUSES.items()}
+    planned = abap_datetime(job.get("SDLSTRTDT"), job.get("SDLSTRTTM"))
+    started = abap_datetime(job.get("STRTDATE"), job.get("STRTTIME"))
+    ended = abap_datetime(job.get("ENDDATE"), job.get("ENDTIME"))
+    job["STATUS_TEXT"] = status_texts.get(job.get("STATUS"), "unknown")
+    job["DELAY"] = (
+        int((started - planned).total_seconds()) if planned and started else None
+    )
+    job["RUNTIME"] = int((ended - started).total_seconds()) if started and ended else None
+    return job
+
+
+def select_jobs(
+    abap,
+    external_user,
+    jobname="*",
+    username="*",
+    statuses=None,
+    window=None,
+    jobcount="",
+):
+    select_param = dict(JOBNAME=jobname, USERNAME=username, JOBCOUNT=jobcount)
+    for status in statuses or ABAP_JOB_STATUSES:
+        select_param[ABAP_JOB_STATUSES[status][1]] = "X"
+    if window:
+        select_param.update(window)
+    result = check_return(
+        abap(
+            "BAPI_XBP_JOB_SELECT",
+            JOB_SELECT_PARAM=select_param,
+            EXTERNAL_USER_NAME=external_user,
+        ),
+        "BAPI_XBP_JOB_SELECT",
+    )
+    return result.get("SELECTED_JOBS", [])
+
+
+def job_status(abap, external_user, job):
+    result = check_return(
+        abap(
+            "BAPI_XBP_JOB_STATUS_GET",
+            JOBNAME=job["JOBNAME"],
+            JOBCOUNT=job["JOBCOUNT"],
+            EXTERNAL_USER_NAME=external_user,
+        ),
+        "BAPI_XBP_JOB_STATUS_GET",
+    )
+    return result.get("STATUS", "")
+
+
+def wait_for_jobs(abap, external_user, jobs, timeout, poll_interval, max_poll_interval):
+    """Poll status of incomplete jobs until all are complete or timeout, return wait result.
+
+    Interval grows by half while no job changes status, it is reset when some job changes status.
+    """
+    start = time.monotonic()
+    interval = poll_interval
+    polls = 0
+    statuses = {(job["JOBNAME"], job["JOBCOUNT"]): job.get("STATUS") for job in jobs}
+    while True:
+        pending = [
+            job
+            for job in jobs
+            if statuses[(job["JOBNAME"], job["JOBCOUNT"])] not in ABAP_JOB_COMPLETE
+        ]
+        if not pending:
+            return dict(wait_time=round(time.monotonic() - start, 1), polls=polls, timed_out=False)
+        remaining = timeout - (time.monotonic() - start)
+        if remaining <= 0:
+            return dict(wait_time=round(time.monotonic() - start, 1), polls=polls, timed_out=True)
+        time.sleep(min(interval, remaining))
+        polls += 1
+        changed = False
+        for job in pending:
+            key = (job["JOBNAME"], job["JOBCOUNT"])
+            status = job_status(abap, external_user, job)
+            if status != statuses[key]:
+                statuses[key] = status
+                changed = True
+        interval = poll_interval if changed else min(interval * 1.5, max_poll_interval)
+
+
+def main():
+    argument_spec = dict(
+        jobname=dict(type="str", required=False, default="*"),
+        username=dict(type="str", required=False, default="*"),
+        status=dict(
+            type="list",
+            elements="str",
+            required=False,
+            default=list(ABAP_JOB_STATUSES),
+            choices=list(ABAP_JOB_STATUSES),
+        ),
+        from_date=dict(type="str", required=False),
+        from_time=dict(type="str", required=False, default="000000"),
+        to_date=dict(type="str", required=False),
+        to_time=dict(type="str", required=False, default="235959"),
+        jobs=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=dict(
+                jobname=dict(type="str", required=True),
+                jobcount=dict(type="str", required=True),
+            ),
+        ),
+        wait=dict(type="bool", required=False, default=False),
+        wait_timeout=dict(type="int", required=False, default=3600),
+        poll_interval=dict(type="int", required=False, default=5),
+        max_poll_interval=dict(type="int", required=False, default=60),
+        fail_on_abort=dict(type="bool", required=False, default=True),
+        external_user=dict(type="str", required=False, default="ANSIBLE"),
+    )
+
+    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=True)
+    external_user = module.params["external_user"]
+    window = {}
+    if module.params["from_date"]:
+        window.update(
+            FROM_DATE=module.params["from_date"], FROM_TIME=module.params["from_time"]
+        )
+    if module.params["to_date"]:
+        window.update(TO_DATE=module.params["to_date"], TO_TIME=module.params["to_time"])
+
+    abap_jobs_wait = None
+    with module as abap:
+        check_return(
+            abap(
+                "BAPI_XMI_LOGON",
+                EXTCOMPANY="ANSIBLE",
+                EXTPRODUCT="SAP_OPERATIONS",
+                INTERFACE=XBP_INTERFACE,
+                VERSION=XBP_VERSION,
+            ),
+            "BAPI_XMI_LOGON",
+        )
+        try:
+            if module.params["jobs"]:
+                jobs = []
+                for job in module.params["jobs"]:
+                    jobs.extend(
+                        select_jobs(
+                            abap,
+                            external_user,
+                            jobname=job["jobname"],
+                            jobcount=job["jobcount"],
+                        )
+                    )
+            else:
+                jobs = select_jobs(
+                    abap,
+                    external_user,
+                    jobname=module.params["jobname"],
+                    username=module.params["username"],
+                    statuses=module.params["status"],
+                    window=window,
+                )
+
+            if module.params["wait"]:
+                abap_jobs_wait = wait_for_jobs(
+                    abap,
+                    external_user,
+                    jobs,
+                    module.params["wait_timeout"],
+                    module.params["poll_interval"],
+                    module.params["max_poll_interval"],
+                )
+                # Start and end times are read once, after jobs are complete
+                jobs = [
+                    selected
+                    for job in jobs
+                    for selected in select_jobs(
+                        abap, external_user, jobname=job["JOBNAME"], jobcount=job["JOBCOUNT"]
+                    )
+                ]
+        finally:
+            abap("BAPI_XMI_LOGOFF", INTERFACE=XBP_INTERFACE)
+
+        abap_jobs_info = [job_timings(job) for job in jobs]
+        if abap_jobs_wait is not None:
+            if abap_jobs_wait["timed_out"]:
+                raise AnsibleModuleABAPFailException(
+                    msg="Jobs are not complete after {0} seconds".format(
+                        module.params["wait_timeout"]
+                    ),
+                    abap_jobs_info=abap_jobs_info,
+                    abap_jobs_wait=abap_jobs_wait,
+                )
+            aborted = [job["JOBNAME"] for job in abap_jobs_info if job.get("STATUS") == "A"]
+            if module.params["fail_on_abort"] and aborted:
+                raise AnsibleModuleABAPFailException(
+                    msg="Jobs aborted: {0}".format(", ".join(aborted)),
+                    abap_jobs_info=abap_jobs_info,
+                    abap_jobs_wait=abap_jobs_wait,
+                )
+
+    result = dict(changed=False, failed=False, abap_jobs_info=abap_jobs_info)
+    if abap_jobs_wait is not None:
+        result["abap_jobs_wait"] = abap_jobs_wait
+    module.exit_json(**result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_rfc_batch
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.abap_rfc_doc.result_format
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Execute list of remote enabled function modules in SAP ABAP system
+
+description:
+  - Execute list of remote enabled function modules in SAP ABAP system with one logon
+  - Calls are executed sequentially over one connection, or spread over several parallel connections
+  - Results are returned in the same order as calls, with latency of each call
+  - Failure of one call does not stop execution of other calls
+
+version_added: 2.13.0
+
+options:
+  calls:
+    description: List of function modules to call
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      function:
+        description: Name of remote enabled function module
+        type: str
+        required: true
+      parameters:
+        description: Function module parameters
+        type: dict
+        required: false
+        default: {}
+
+  parallel_connections:
+    description:
+      - Number of connections to SAP ABAP system used to execute calls
+      - With C(1) all calls are executed sequentially over one connection
+      - Order of execution is not guaranteed when more than one connection is used
+    type: int
+    required: false
+    default: 1
+
+  fail_on_error:
+    description: Fail module if any of the calls failed
+    type: bool
+    required: false
+    default: true
+
+  distribution:
+    description:
+      - Spread calls over application servers of SAP ABAP system instead of one logon server
+      - Active application servers are read with C(TH_SERVER_LIST), servers of logon group with C(SMLG_GET_SETUP)
+      - Connections are opened directly to application servers, I(parallel_connections) is ignored
+      - Supported only with I(rfc_connection)
+    type: dict
+    required: false
+    version_added: 2.13.0
+    suboptions:
+      logon_group:
+        description:
+          - Use only application servers of this logon group (SMLG)
+          - If not set, group of I(rfc_connection) is used, all active servers if it is not set either
+        type: str
+        required: false
+      connections_per_server:
+        description:
+          - Maximum number of parallel connections to one application server
+          - Every connection uses one dialog work process of the server while call is running
+        type: int
+        required: false
+        default: 1
+      max_servers:
+        description: Maximum number of application servers to use, C(0) uses all servers
+        type: int
+        required: false
+        default: 0
+"""
+
+EXAMPLES = r"""
+- name: Read several transport requests with one logon
+  sap.sap_operations.abap_rfc_batch:
+    calls:
+      - function: CTS_API_READ_CHANGE_REQUEST
+        parameters:
+          REQUEST: NPLK900002
+      - function: CTS_API_READ_CHANGE_REQUEST
+        parameters:
+          REQUEST: NPLK900003
+    parallel_connections: 2
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+
+- name: Spread calls over application servers of logon group, two connections per server
+  sap.sap_operations.abap_rfc_batch:
+    calls: "{{ calls }}"
+    distribution:
+      logon_group: PUBLIC
+      connections_per_server: 2
+    rfc_connection:
+      mshost: message-server-hostname
+      sysid: NPL
+      group: PUBLIC
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+"""
+
+RETURN = r"""
+abap_rfc_batch:
+  description: Results of function calls, in order of I(calls)
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - function: RFC_PING
+      failed: false
+      latency: 0.004213
+      result: {}
+  contains:
+    function:
+      description: Function module name
+      type: str
+    failed:
+      description: True if call failed
+      type: bool
+    msg:
+      description: Error message, returned only for failed calls
+      type: str
+    latency:
+      description: Duration of call in seconds
+      type: float
+    server:
+      description: Application server call was executed on, returned only with I(distribution)
+      type: str
+    result:
+      description: Result of function call, returned only for successful calls
+      type: dict
+"""
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+    AnsibleModuleABAPFailException,
+)
+
+
+def main():
+    argument_spec = dict(
+        calls=dict(
+            type="list",
+            required=True,
+            elements="dict",
+            options=dict(
+                function=dict(type="str", required=True),
+                parameters=dict(type="dict", required=False, default={}),
+            ),
+        ),
+        parallel_connections=dict(type="int", required=False, default=1),
+        fail_on_error=dict(type="bool", required=False, default=True),
+        distribution=dict(
+            type="dict",
+            required=False,
+            options=dict(
+                logon_group=dict(type="str", required=False),
+                connections_per_server=dict(type="int", required=False, default=1),
+                max_servers=dict(type="int", required=False, default=0),
+            ),
+        ),
+    )
+
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec, supports_check_mode=False, result_format=True
+    )
+    calls = [
+        (call["function"], call["parameters"] or {}) for call in module.params["calls"]
+    ]
+    parallel_connections = module.params["parallel_connections"]
+    fail_on_error = module.params["fail_on_error"]
+    distribution = module.params["distribution"]
+    if distribution is not None:
+        distribution = dict(
+            group=distribution["logon_group"]
+            or (module.params["rfc_connection"] or {}).get("group"),
+            connections_per_server=distribution["connections_per_server"],
+            max_servers=distribution["max_servers"],
+        )
+
+    with module as abap:
+        abap_rfc_batch = abap.call_many(
+            calls, connections=parallel_connections, distribution=distribution
+        )
+        for call_result in abap_rfc_batch:
+            if "result" in call_result:
+                call_result["result"] = abap.format_result(
+                    call_result["result"], call_result["function"]
+                )
+        if fail_on_error and any(result["failed"] for result in abap_rfc_batch):
+            raise AnsibleModuleABAPFailException(
+                msg="One or more function calls failed",
+                changed=True,
+                abap_rfc_batch=abap_rfc_batch,
+            )
+
+    module.exit_json(
+        changed=True,
+        failed=False,
+        abap_rfc_batch=abap_rfc_batch,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_rfc_fanout
+
+extends_documentation_fragment:
+  - sap.sap_operations.community
+  - sap.sap_operations.action_plugin
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Execute remote enabled function module in many SAP ABAP systems from Ansible controller
+
+description:
+  - Execute the same remote enabled function module in every target system and client
+  - Targets are processed on Ansible controller by thread pool, no module is started per target
+  - Every target has its own timeout for logon and call, timed out target does not delay others
+  - Failure of one target does not stop execution in other targets
+  - Results are returned in the same order as I(targets)
+
+version_added: 2.13.0
+
+requirements:
+  - pyrfc (on Ansible controller)
+
+options:
+  function:
+    description: Name of remote enabled function module
+    type: str
+    required: true
+
+  parameters:
+    description: Function module parameters, used for all targets
+    type: dict
+    required: false
+    default: {}
+
+  targets:
+    description: SAP ABAP systems and clients to execute function module in
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      name:
+        description:
+          - Name of target in result
+          - Default is SID (or application server and instance number) and client, for example C(NPL/001)
+        type: str
+        required: false
+      rfc_connection:
+        description: RFC connection parameters, same as I(rfc_connection) of M(sap.sap_operations.abap_system_info)
+        type: dict
+        required: true
+      parameters:
+        description: Function module parameters of this target, merged over I(parameters)
+        type: dict
+        required: false
+        default: {}
+
+  parallel_targets:
+    description: Maximum number of targets processed in parallel
+    type: int
+    required: false
+    default: 8
+
+  timeout:
+    description:
+      - Timeout in seconds for logon and call of one target, C(0) disables timeout
+      - Call of timed out target is cancelled if supported by installed pyrfc version
+      - Worker of timed out target is replaced by new worker, at most I(parallel_targets) workers
+        of timed out targets are replaced at the same time
+      - If all workers are blocked by timed out targets for I(timeout) seconds,
+        targets that were not started are reported as timed out
+    type: int
+    required: false
+    default: 60
+
+  fail_on_error:
+    description: Fail if function module failed or timed out in any of the targets
+    type: bool
+    required: false
+    default: false
+"""
+
+EXAMPLES = r"""
+- name: Read installed software products in all systems of landscape
+  sap.sap_operations.abap_rfc_fanout:
+    function: OCS_GET_INSTALLED_SWPRODUCTS
+    parallel_targets: 16
+    timeout: 30
+    targets:
+      - rfc_connection:
+          ashost: npl-hostname
+          sysnr: "00"
+          client: "001"
+          user: DDIC
+          passwd: "SecretPa$$word"
+      - name: QAS/100
+        rfc_connection:
+          mshost: qas-message-server-hostname
+          sysid: QAS
+          group: PUBLIC
+          client: "100"
+          user: DDIC
+          passwd: "SecretPa$$word"
+
+- name: Build targets from inventory
+  sap.sap_operations.abap_rfc_fanout:
+    function: RFC_SYSTEM_INFO
+    targets: "{{ groups['abap'] | map('extract', hostvars, 'rfc_connection') | map('community.general.dict_kv', 'rfc_connection') | list }}"
+"""
+
+RETURN = r"""
+abap_rfc_fanout:
+  description: Results of function call, in order of I(targets)
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - name: NPL/001
+      failed: false
+      timed_out: false
+      elapsed: 0.052311
+      result:
+        RFCSI_EXPORT:
+          RFCSYSID: NPL
+    - name: QAS/100
+      failed: true
+      timed_out: true
+      elapsed: 30.000412
+      msg: Target did not respond in 30 seconds
+abap_rfc_fanout_summary:
+  description: Number of targets, succeeded, failed and timed out targets, and total time in seconds
+  type: dict
+  returned: always
+  sample:
+    targets: 2
+    succeeded: 1
+    failed: 1
+    timed_out: 1
+    elapsed: 30.001237
+"""
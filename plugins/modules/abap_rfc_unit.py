@@ -0,0 +1,322 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_rfc_unit
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Submit function calls to SAP ABAP system as background or transactional units
+
+description:
+  - Fill list of function calls into background (bgRFC) or transactional (tRFC/qRFC) units
+    and submit them without waiting for the function modules to finish
+  - Throughput of bulk changes does not depend on round-trip latency to SAP ABAP system
+  - Submitted units are confirmed in the same task, or later with I(state=confirmed)
+  - Only I(rfc_connection) is supported
+
+version_added: 2.13.0
+
+options:
+  state:
+    description:
+      - C(submitted) fills I(calls) into units and submits them
+      - C(confirmed) confirms previously submitted I(units)
+      - C(queried) returns state of previously submitted I(units) without confirming them
+    type: str
+    required: false
+    default: submitted
+    choices:
+      - submitted
+      - confirmed
+      - queried
+
+  calls:
+    description:
+      - List of function modules to call, required with I(state=submitted)
+      - Function modules are executed in SAP ABAP system asynchronously,
+        their export parameters are not returned
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      function:
+        description: Name of remote enabled function module
+        type: str
+        required: true
+      parameters:
+        description: Function module parameters
+        type: dict
+        required: false
+        default: {}
+
+  background:
+    description:
+      - Use background units (bgRFC) if true, transactional units (tRFC) otherwise
+      - Transactional units with I(queue_names) are executed as qRFC
+    type: bool
+    required: false
+    default: true
+
+  queue_names:
+    description:
+      - Names of inbound queues, calls are executed in order of queue
+      - Without queue names units are executed without serialization
+    type: list
+    elements: str
+    required: false
+
+  unit_size:
+    description:
+      - Maximum number of calls in one unit, C(0) puts all calls into one unit
+      - All calls of one unit are executed in one logical unit of work
+    type: int
+    required: false
+    default: 0
+
+  confirm:
+    description:
+      - Confirm submitted units in the same task
+      - Set to false to confirm units later with I(state=confirmed)
+    type: bool
+    required: false
+    default: true
+
+  units:
+    description:
+      - Units to confirm or query, as returned in RV(abap_rfc_unit), required with I(state=confirmed)
+        and I(state=queried)
+    type: list
+    elements: dict
+    required: false
+    suboptions:
+      id:
+        description: Unit ID
+        type: str
+        required: true
+      background:
+        description: True for background unit
+        type: bool
+        required: false
+        default: true
+      queued:
+        description: True for queued unit
+        type: bool
+        required: false
+        default: false
+      calls:
+        description: Ignored, accepted so that units returned in RV(abap_rfc_unit) can be passed as is
+        type: int
+        required: false
+      confirmed:
+        description: Ignored, accepted so that units returned in RV(abap_rfc_unit) can be passed as is
+        type: bool
+        required: false
+      state:
+        description: Ignored, accepted so that units returned in RV(abap_rfc_unit) can be passed as is
+        type: str
+        required: false
+"""
+
+EXAMPLES = r"""
+- name: Lock users with one background unit
+  sap.sap_operations.abap_rfc_unit:
+    calls:
+      - function: BAPI_USER_LOCK
+        parameters:
+          USERNAME: USER1
+      - function: BAPI_USER_LOCK
+        parameters:
+          USERNAME: USER2
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+
+- name: Submit queued units of 100 calls, confirm them later
+  sap.sap_operations.abap_rfc_unit:
+    calls: "{{ calls }}"
+    queue_names:
+      - ANSIBLE_QUEUE
+    unit_size: 100
+    confirm: false
+    rfc_connection: "{{ rfc_connection }}"
+  register: submitted
+
+- name: Read state of units
+  sap.sap_operations.abap_rfc_unit:
+    state: queried
+    units: "{{ submitted.abap_rfc_unit }}"
+    rfc_connection: "{{ rfc_connection }}"
+
+- name: Confirm units
+  sap.sap_operations.abap_rfc_unit:
+    state: confirmed
+    units: "{{ submitted.abap_rfc_unit }}"
+    rfc_connection: "{{ rfc_connection }}"
+"""
+
+RETURN = r"""
+abap_rfc_unit:
+  description: Submitted, confirmed or queried units
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - id: 005056A3F1A21EDE9BA1C0A8B1C2D3E4
+      background: true
+      queued: false
+      calls: 2
+      confirmed: true
+      state: null
+  contains:
+    id:
+      description: Unit ID
+      type: str
+    background:
+      description: True for background unit
+      type: bool
+    queued:
+      description: True for queued unit
+      type: bool
+    calls:
+      description: Number of calls in unit, returned only with I(state=submitted)
+      type: int
+    confirmed:
+      description: True if unit was confirmed
+      type: bool
+    state:
+      description:
+        - State of background unit, read before confirmation because confirmed unit has no state
+        - Not available for transactional units
+      type: str
+"""
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+)
+
+
+def main():
+    argument_spec = dict(
+        state=dict(
+            type="str",
+            required=False,
+            default="submitted",
+            choices=["submitted", "confirmed", "queried"],
+        ),
+        calls=dict(
+            type="list",
+            required=False,
+            elements="dict",
+            options=dict(
+                function=dict(type="str", required=True),
+                parameters=dict(type="dict", required=False, default={}),
+            ),
+        ),
+        background=dict(type="bool", required=False, default=True),
+        queue_names=dict(type="list", elements="str", required=False),
+        unit_size=dict(type="int", required=False, default=0),
+        confirm=dict(type="bool", required=False, default=True),
+        units=dict(
+            type="list",
+            required=False,
+            elements="dict",
+            options=dict(
+                id=dict(type="str", required=True),
+                background=dict(type="bool", required=False, default=True),
+                queued=dict(type="bool", required=False, default=False),
+                calls=dict(type="int", required=False),
+                confirmed=dict(type="bool", required=False),
+                state=dict(type="str", required=False),
+            ),
+        ),
+    )
+
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec,
+        supports_check_mode=False,
+        required_if=[
+            ("state", "submitted", ("calls",)),
+            ("state", "confirmed", ("units",)),
+            ("state", "queried", ("units",)),
+        ],
+    )
+    state = module.params["state"]
+
+    with module as abap:
+        if state == "submitted":
+            calls = [
+                (call["function"], call["parameters"] or {})
+                for call in module.params["calls"]
+            ]
+            abap_rfc_unit = abap.submit_units(
+                calls,
+                unit_size=module.params["unit_size"],
+                background=module.params["background"],
+                queue_names=module.params["queue_names"],
+            )
+            confirm = module.params["confirm"]
+        else:
+            abap_rfc_unit = [
+                dict(
+                    (key, value)
+                    for key, value in unit.items()
+                    if key in ("id", "background", "queued", "calls")
+                    and value is not None
+                )
+                for unit in module.params["units"]
+            ]
+            confirm = state == "confirmed"
+        for unit, state_info in zip(
+            abap_rfc_unit, abap.get_units_state(abap_rfc_unit)
+        ):
+            unit["state"] = state_info["state"]
+            unit["confirmed"] = False
+        if confirm:
+            abap.confirm_units(abap_rfc_unit)
+            for unit in abap_rfc_unit:
+                unit["confirmed"] = True
+
+    module.exit_json(
+        changed=state == "submitted" or confirm,
+        failed=False,
+        abap_rfc_unit=abap_rfc_unit,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,7 @@ module: abap_system_info
 
 extends_documentation_fragment:
   - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.abap_rfc_doc.result_format
 
 author:
   - Kirill Satarin (@kksat)
@@ -49,8 +50,98 @@ description:
       SMLG_GET_DEFINED_SERVERS
       SMLG_GET_SETUP
       SLDAG_GET_COMPUTER_INFO
+  - Only sections selected with I(gather_subset) are fetched
+  - Selected sections are fetched concurrently over up to I(parallel_connections) connections
+  - With I(cache=true), result is cached on Ansible controller by action plugin, keyed by SID, client,
+    connection target and I(result_format). Before cached result is used, cheap probe (RFC_SYSTEM_INFO and sections
+    of I(cache_probe)) is executed, cached result is used only if system level fields of probe result
+    (SID, database, kernel and SAP release, probed sections) did not change.
+    Fields of the application server that answered the probe are not compared
 
 version_added: 1.2.0
+
+options:
+  gather_subset:
+    description:
+      - List of sections of ABAP system information to fetch
+      - C(all) fetches all sections
+    type: list
+    elements: str
+    required: false
+    default: ['all']
+    choices:
+      - all
+      - swproducts
+      - software_components
+      - host_data
+      - installed_components
+      - smlg_groups
+      - smlg_servers
+      - smlg_setup
+      - computer_info
+    version_added: 2.13.0
+
+  parallel_connections:
+    description:
+      - Maximum number of connections to SAP ABAP system used to fetch sections concurrently
+      - With C(1) all sections are fetched sequentially over one connection,
+        as in earlier versions of the module
+      - Each additional connection is a separate logon to SAP ABAP system
+    type: int
+    required: false
+    default: 1
+    version_added: 2.13.0
+
+  cache:
+    description:
+      - Cache result on Ansible controller, see I(cache_dir), I(cache_max_age) and I(cache_probe)
+      - Result is fetched from SAP ABAP system only if probe shows that system changed, or cache is expired
+    type: bool
+    required: false
+    default: false
+    version_added: 2.13.0
+
+  cache_dir:
+    description: Directory on Ansible controller to store cached results
+    type: path
+    required: false
+    default: ~/.ansible/cache/sap_operations/abap_system_info
+    version_added: 2.13.0
+
+  cache_max_age:
+    description: Maximum age of cached result in seconds, C(0) means cached result does not expire
+    type: int
+    required: false
+    default: 0
+    version_added: 2.13.0
+
+  cache_probe:
+    description:
+      - Sections fetched on every run to check if cached result is still valid,
+        in addition to RFC_SYSTEM_INFO (SID, database, kernel and SAP release)
+      - C(installed_components) detects support package imports (release and support package of components)
+      - Only system level sections can be probed, C(host_data) and C(computer_info) differ between
+        application servers
+    type: list
+    elements: str
+    required: false
+    default: [installed_components]
+    choices:
+      - swproducts
+      - software_components
+      - installed_components
+      - smlg_groups
+      - smlg_servers
+      - smlg_setup
+    version_added: 2.13.0
+
+  probe:
+    description:
+      - Execute only cache probe and return I(abap_system_info_probe), used by action plugin with I(cache=true)
+    type: bool
+    required: false
+    default: false
+    version_added: 2.13.0
 """
 
 EXAMPLES = r"""
@@ -62,9 +153,48 @@ EXAMPLES = r"""
     user: DDIC
     passwd: "SecretPa$$word" # notsecret
     sysnr: '00'
+
+- name: Fetch only logon groups and servers of SAP ABAP system
+  sap.sap_operations.abap_system_info:
+    gather_subset:
+      - smlg_groups
+      - smlg_servers
+    parallel_connections: 2
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: '000'
+      user: DDIC
+      passwd: "SecretPa$$word" # notsecret
+      sysnr: '00'
 """
 
 RETURN = r"""
+abap_system_info_cache:
+  description: Cache status, returned only with I(cache=true)
+  type: dict
+  returned: I(cache=true)
+  sample:
+    hit: true
+    sid: NPL
+    client: "001"
+    target: vhcalnplci/00
+    age: 3600
+abap_system_info_probe:
+  description: Probe result, returned only with I(probe=true)
+  type: dict
+  returned: I(probe=true)
+  sample:
+    sid: NPL
+    system_info:
+      RFCSYSID: NPL
+      RFCKERNRL: "793"
+      RFCSAPRL: "757"
+    sections:
+      installed_components:
+        TT_COMPTAB:
+          - COMPONENT: SAP_BASIS
+            RELEASE: "757"
+            EXTRELEASE: "0002"
 abap_system_info:
   description: ABAP system info
   type: dict
@@ -470,33 +600,98 @@ from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
     AnsibleModuleABAP,
 )
 
+ABAP_SYSTEM_INFO_SECTIONS = dict(
+    swproducts="OCS_GET_INSTALLED_SWPRODUCTS",
+    software_components="OCS_GET_SFW_COMPONENTS",
+    host_data="TH_GET_VIRT_HOST_DATA",
+    installed_components="DELIVERY_GET_INSTALLED_COMPS",
+    smlg_groups="SMLG_GET_DEFINED_GROUPS",
+    smlg_servers="SMLG_GET_DEFINED_SERVERS",
+    smlg_setup="SMLG_GET_SETUP",
+    computer_info="SLDAG_GET_COMPUTER_INFO",
+)
+
+# Sections with the same result on every application server of the system
+ABAP_SYSTEM_INFO_PROBE_SECTIONS = [
+    "swproducts",
+    "software_components",
+    "installed_components",
+    "smlg_groups",
+    "smlg_servers",
+    "smlg_setup",
+]
+
 
 def main():
-    module = AnsibleModuleABAP(argument_spec={}, supports_check_mode=True)
+    argument_spec = dict(
+        gather_subset=dict(
+            type="list",
+            elements="str",
+            required=False,
+            default=["all"],
+            choices=["all"] + list(ABAP_SYSTEM_INFO_SECTIONS),
+        ),
+        parallel_connections=dict(type="int", required=False, default=1),
+        # Cache options are handled by action plugin on controller
+        cache=dict(type="bool", required=False, default=False),
+        cache_dir=dict(
+            type="path",
+            required=False,
+            default="~/.ansible/cache/sap_operations/abap_system_info",
+        ),
+        cache_max_age=dict(type="int", required=False, default=0),
+        cache_probe=dict(
+            type="list",
+            elements="str",
+            required=False,
+            default=["installed_components"],
+            choices=ABAP_SYSTEM_INFO_PROBE_SECTIONS,
+        ),
+        probe=dict(type="bool", required=False, default=False),
+    )
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec, supports_check_mode=True, result_format=True
+    )
+    gather_subset = module.params["gather_subset"]
+    parallel_connections = module.params["parallel_connections"]
+
+    if module.params["probe"]:
+        cache_probe = module.params["cache_probe"]
+        with module as abap:
+            system_info = abap("RFC_SYSTEM_INFO").get("RFCSI_EXPORT", {})
+            results = [abap(ABAP_SYSTEM_INFO_SECTIONS[section]) for section in cache_probe]
+        module.exit_json(
+            changed=False,
+            failed=False,
+            abap_system_info_probe=dict(
+                sid=system_info.get("RFCSYSID"),
+                system_info=system_info,
+                sections=dict(zip(cache_probe, results)),
+            ),
+        )
+
+    sections = [
+        section
+        for section in ABAP_SYSTEM_INFO_SECTIONS
+        if "all" in gather_subset or section in gather_subset
+    ]
 
     with module as abap:
-        swproducts = abap("OCS_GET_INSTALLED_SWPRODUCTS")
-        software_components = abap("OCS_GET_SFW_COMPONENTS")
-        host_data = abap("TH_GET_VIRT_HOST_DATA")
-        installed_components = abap("DELIVERY_GET_INSTALLED_COMPS")
-        smlg_groups = abap("SMLG_GET_DEFINED_GROUPS")
-        smlg_servers = abap("SMLG_GET_DEFINED_SERVERS")
-        smlg_setup = abap("SMLG_GET_SETUP")
-        computer_info = abap("SLDAG_GET_COMPUTER_INFO")
+        results = abap.map_parallel(
+            lambda abap, section: abap(ABAP_SYSTEM_INFO_SECTIONS[section]),
+            sections,
+            connections=parallel_connections,
+        )
 
     module.exit_json(
         changed=False,
         failed=False,
-        abap_system_info=dict(
-            swproducts=swproducts,
-            host_data=host_data,
-            installed_components=installed_components,
-            smlg_groups=smlg_groups,
-            smlg_servers=smlg_servers,
-            smlg_setup=smlg_setup,
-            computer_info=computer_info,
-            software_components=software_components,
-        ),
+        abap_system_info={
+            section: module.format_result(
+                result, ABAP_SYSTEM_INFO_SECTIONS[section]
+            )
+            for section, result in zip(sections, results)
+        },
     )
 
 
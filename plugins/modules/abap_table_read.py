@@ -0,0 +1,294 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_table_read
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.abap_rfc_doc.result_format
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Read ABAP table page by page
+
+description:
+  - Read content of ABAP table using remote enabled function RFC_READ_TABLE, BBP_RFC_READ_TABLE or /BODS/RFC_READ_TABLE2
+  - Table is read in pages of I(page_size) rows (ROWSKIPS/ROWCOUNT)
+  - Rows wider than maximum row width of the function (512 characters for RFC_READ_TABLE) are read in field groups,
+    key fields of the table (from DD03L) are read in every group and groups are joined on key
+  - Read functions do not sort rows, module fails if rows of field groups do not match or if the same row
+    is returned on two pages (rows were skipped), table content should not change while it is read
+  - In check mode table is read, but file I(dest) is not written
+  - Rows are written to file I(dest) on managed host as JSON lines or CSV, so big tables are not returned to Ansible
+  - If I(dest) is not provided, rows are returned in the module result,
+    as table in columnar format with I(result_format=columnar)
+  - All values are returned as strings, as provided by the function
+
+version_added: 2.13.0
+
+options:
+  table:
+    description: Name of ABAP table
+    type: str
+    required: true
+
+  fields:
+    description:
+      - List of table fields to read
+      - All fields are read if not provided
+    type: list
+    elements: str
+    required: false
+    default: []
+
+  where:
+    description:
+      - ABAP SQL WHERE conditions, lines are joined with space
+      - Conditions are split to OPTIONS lines of 72 characters at word boundaries
+    type: list
+    elements: str
+    required: false
+    default: []
+
+  page_size:
+    description: Number of rows read with one function call
+    type: int
+    required: false
+    default: 10000
+
+  max_rows:
+    description: Maximum number of rows to read, C(0) reads all rows
+    type: int
+    required: false
+    default: 0
+
+  function:
+    description:
+      - Remote enabled function used to read table
+      - C(auto) uses /BODS/RFC_READ_TABLE2 if it exists in the system, RFC_READ_TABLE otherwise,
+        any other error of /BODS/RFC_READ_TABLE2 fails the module
+    type: str
+    required: false
+    default: auto
+    choices: [auto, RFC_READ_TABLE, BBP_RFC_READ_TABLE, /BODS/RFC_READ_TABLE2]
+
+  dest:
+    description: Path to file on managed host, rows are written to this file
+    type: path
+    required: false
+
+  format:
+    description: Format of file I(dest)
+    type: str
+    required: false
+    default: jsonl
+    choices: [jsonl, csv]
+"""
+
+EXAMPLES = r"""
+- name: Export transport request headers to file
+  sap.sap_operations.abap_table_read:
+    table: E070
+    fields: [TRKORR, TRFUNCTION, TRSTATUS, AS4USER, AS4DATE, AS4TIME]
+    where:
+      - "AS4DATE >= '20240101'"
+    dest: /tmp/e070.jsonl
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+
+- name: Read users locked by administrator
+  sap.sap_operations.abap_table_read:
+    table: USR02
+    fields: [BNAME, USTYP, UFLAG, TRDAT]
+    where:
+      - "UFLAG = '64'"
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+"""
+
+RETURN = r"""
+abap_table_read:
+  description: Result of table read
+  type: dict
+  returned: success
+  contains:
+    table:
+      description: Name of ABAP table
+      type: str
+      sample: E070
+    function:
+      description: Function used to read table
+      type: str
+      sample: RFC_READ_TABLE
+    fields:
+      description: Descriptions of fields that were read
+      type: list
+      elements: dict
+      sample:
+        - FIELDNAME: TRKORR
+          OFFSET: "000000"
+          LENGTH: "000020"
+          TYPE: C
+          FIELDTEXT: Request/Task
+    rows_count:
+      description: Number of rows read
+      type: int
+      sample: 1542
+    dest:
+      description: Path to file with rows, returned if I(dest) was provided, file is not written in check mode
+      type: str
+      sample: /tmp/e070.jsonl
+    rows:
+      description:
+        - Table rows, returned if I(dest) was not provided
+        - With I(result_format=columnar), dictionary with I(columns) (names of fields that were read)
+          and I(rows) (list of lists of values)
+      type: raw
+      sample:
+        - TRKORR: NPLK900002
+          TRFUNCTION: K
+"""
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+    AnsibleModuleABAPFailException,
+)
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    ABAPResultFileWriter,
+    ABAPTableReadError,
+    function_not_found,
+    read_table,
+    read_table_fields,
+)
+
+
+def main():
+    argument_spec = dict(
+        table=dict(type="str", required=True),
+        fields=dict(type="list", elements="str", required=False, default=[]),
+        where=dict(type="list", elements="str", required=False, default=[]),
+        page_size=dict(type="int", required=False, default=10000),
+        max_rows=dict(type="int", required=False, default=0),
+        function=dict(
+            type="str",
+            required=False,
+            default="auto",
+            choices=[
+                "auto",
+                "RFC_READ_TABLE",
+                "BBP_RFC_READ_TABLE",
+                "/BODS/RFC_READ_TABLE2",
+            ],
+        ),
+        dest=dict(type="path", required=False),
+        format=dict(
+            type="str", required=False, default="jsonl", choices=["jsonl", "csv"]
+        ),
+    )
+
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec, supports_check_mode=True, result_format=True
+    )
+    table = module.params["table"]
+    fields = module.params["fields"]
+    where = module.params["where"]
+    page_size = module.params["page_size"]
+    max_rows = module.params["max_rows"]
+    function = module.params["function"]
+    dest = module.params["dest"]
+    output_format = module.params["format"]
+
+    with module as abap:
+        if function == "auto":
+            try:
+                function = "/BODS/RFC_READ_TABLE2"
+                table_fields = read_table_fields(abap, table, fields, function)
+            except Exception as e:
+                if not function_not_found(e):
+                    raise
+                function = "RFC_READ_TABLE"
+                table_fields = read_table_fields(abap, table, fields, function)
+        else:
+            table_fields = read_table_fields(abap, table, fields, function)
+
+        rows = read_table(
+            abap,
+            table,
+            fields=fields,
+            where=where,
+            page_size=page_size,
+            max_rows=max_rows,
+            function=function,
+            table_fields=table_fields,
+        )
+        abap_table_read = dict(table=table, function=function, fields=table_fields)
+        try:
+            if dest and module.check_mode:
+                abap_table_read["rows_count"] = sum(1 for _row in rows)
+                abap_table_read["dest"] = dest
+            elif dest:
+                with ABAPResultFileWriter(
+                    dest,
+                    output_format=output_format,
+                    columns=[field["FIELDNAME"] for field in table_fields],
+                ) as writer:
+                    writer.write_rows(rows)
+                abap_table_read["rows_count"] = writer.count
+                abap_table_read["dest"] = dest
+            elif module.params["result_format"] == "columnar":
+                columns = [field["FIELDNAME"] for field in table_fields]
+                values = [[row.get(column) for column in columns] for row in rows]
+                abap_table_read["rows"] = dict(columns=columns, rows=values)
+                abap_table_read["rows_count"] = len(values)
+            else:
+                abap_table_read["rows"] = list(rows)
+                abap_table_read["rows_count"] = len(abap_table_read["rows"])
+        except ABAPTableReadError as e:
+            raise AnsibleModuleABAPFailException(msg=str(e))
+
+    module.exit_json(
+        changed=bool(dest),
+        failed=False,
+        abap_table_read=abap_table_read,
+    )
+
+
+if __name__ == "__main__":
+    main()
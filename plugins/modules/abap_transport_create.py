@@ -31,6 +31,7 @@ module: abap_transport_create
 
 extends_documentation_fragment:
   - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.abap_rfc_doc.result_format
   - sap.sap_operations.community
 
 author:
@@ -129,7 +130,9 @@ def main():
         category=dict(type="str", required=True, choices=["K", "W"]),
     )
 
-    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=False)
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec, supports_check_mode=False, result_format=True
+    )
     description = module.params["description"]
     owner = module.params["owner"]
     client = module.params["client"]
@@ -156,7 +159,7 @@ def main():
         failed=False,
         REQUEST=abap_transport_create["REQUEST"],
         RETCODE=abap_transport_create["RETCODE"],
-        abap_transport_info=abap_transport_info,
+        abap_transport_info=module.format_result(abap_transport_info),
     )
 
 
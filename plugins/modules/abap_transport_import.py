@@ -43,26 +43,93 @@ description:
   - Module uses SAP ABAP system remote enabled RFC CTS_API_IMPORT_CHANGE_REQUEST
   - Tested only on single system, transport to other systems is not supported
   - Transport system (trx STMS) must be configured in SAP ABAP system for this module to function properly
+  - |
+    With I(bulk=true) requests are split into batches of I(batch_size). Every batch is imported
+    asynchronously with one TMS_MGR_IMPORT_TR_REQUEST call (IV_OFFLINE), in order of I(transport_request_ids),
+    then import queue of target system is polled with TMS_MGR_READ_TRANSPORT_QUEUE, with increasing interval,
+    until all requests of the batch have new import time (TRTIME) and return code for target client.
+    Import time and return code that request already had in import queue before import are not taken
+    as result, return code of re-import is taken even if it is equal to return code of earlier import.
+    Only then next batch is started. Several targets (I(targets)) are processed in parallel.
 
 version_added: 1.13.0
 
 options:
 
   client:
-    description: SAP ABAP system client
+    description:
+      - SAP ABAP system client
+      - Required if I(targets) is not provided or I(bulk=false)
     type: str
-    required: true
+    required: false
 
   system:
-    description: SAP ABAP system name
+    description:
+      - SAP ABAP system name
+      - Required if I(targets) is not provided or I(bulk=false)
     type: str
-    required: true
+    required: false
 
   transport_request_ids:
     description: List of transport request IDs
     type: list
     required: true
     elements: str
+
+  bulk:
+    description: Import requests asynchronously in batches and track progress
+    type: bool
+    required: false
+    default: false
+    version_added: 2.13.0
+
+  targets:
+    description:
+      - List of target systems and clients to import requests to, only allowed with I(bulk=true)
+      - Targets are processed in parallel, each over its own connection
+    type: list
+    elements: dict
+    required: false
+    version_added: 2.13.0
+    suboptions:
+      system:
+        description: SAP ABAP system name
+        type: str
+        required: true
+      client:
+        description: SAP ABAP system client
+        type: str
+        required: true
+
+  batch_size:
+    description: Number of requests imported at once to one target, used with I(bulk=true)
+    type: int
+    required: false
+    default: 10
+    version_added: 2.13.0
+
+  poll_interval:
+    description:
+      - Initial interval in seconds between import queue checks, used with I(bulk=true)
+      - Interval grows by half after every check, up to 60 seconds
+    type: int
+    required: false
+    default: 5
+    version_added: 2.13.0
+
+  poll_timeout:
+    description: Maximum time in seconds to wait for imports of one batch, used with I(bulk=true)
+    type: int
+    required: false
+    default: 3600
+    version_added: 2.13.0
+
+  max_return_code:
+    description: Highest import return code considered successful, used with I(bulk=true)
+    type: int
+    required: false
+    default: 4
+    version_added: 2.13.0
 """
 
 EXAMPLES = r"""
@@ -78,6 +145,23 @@ EXAMPLES = r"""
       user: DDIC
       passwd: "SecretPa$$word"
       sysnr: "00"
+
+- name: Import transport requests to two clients in batches of 5
+  sap.sap_operations.abap_transport_import:
+    transport_request_ids: "{{ transport_request_ids }}"
+    bulk: true
+    batch_size: 5
+    targets:
+      - system: NPL
+        client: "001"
+      - system: NPL
+        client: "100"
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
 """
 
 RETURN = r"""
@@ -106,27 +190,205 @@ MESSAGE:
   type: str
   returned: success
   sample: Request NPLK900002 imported
+
+abap_transport_import:
+  description: Import result per target and request, returned with I(bulk=true)
+  type: list
+  elements: dict
+  returned: I(bulk=true)
+  sample:
+    - REQUEST: NPLK900002
+      SYSTEM: NPL
+      CLIENT: "001"
+      RETCODE: "0000"
+      DURATION: 48.2
+      FAILED: false
 """
 
+import time
+
 from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
     AnsibleModuleABAP,
     AnsibleModuleABAPFailException,
 )
 
+POLL_INTERVAL_MAX = 60
+
+
+def import_queue_imports(abap, system, client, request_ids):
+    """Return dictionary request id -> (return code, import time) for requests of import queue imported to client.
+
+    Requests that have no return code yet are not returned.
+    """
+    result = abap("TMS_MGR_READ_TRANSPORT_QUEUE", IV_SYSTEM=system, IV_COLLECT_DATA="X")
+    return {
+        entry.get("TRKORR"): (
+            str(entry.get("MAXRC", "")).strip(),
+            str(entry.get("TRTIME", "")).strip(),
+        )
+        for entry in result.get("ET_REQUESTS", [])
+        if entry.get("TRKORR") in request_ids
+        and entry.get("TARCLI") == client
+        and str(entry.get("MAXRC", "")).strip()
+    }
+
+
+def imported_return_codes(imports, before):
+    """Return return codes of requests imported after `before` snapshot of import queue.
+
+    Return code and import time from earlier import of request stay in import queue,
+    only request with import time or return code changed since snapshot belongs to current import.
+    Import time changes on every import, so re-import with the same return code is recognised.
+    """
+    return {
+        request_id: return_code
+        for request_id, (return_code, import_time) in imports.items()
+        if before.get(request_id) != (return_code, import_time)
+    }
+
+
+def bulk_import(abap, target, transport_request_ids, batch_size, poll_interval, poll_timeout, max_return_code):
+    """Import requests to one target in batches, return result per request.
+
+    Every batch is imported with one TMS_MGR_IMPORT_TR_REQUEST call, so that one tp run imports
+    requests of batch in order of I(transport_request_ids).
+    """
+    system, client = target["system"], target["client"]
+    results = []
+    for i in range(0, len(transport_request_ids), batch_size):
+        batch = transport_request_ids[i:i + batch_size]
+        before = import_queue_imports(abap, system, client, batch)
+        start = time.monotonic()
+        batch_results = {}
+        triggered = abap(
+            "TMS_MGR_IMPORT_TR_REQUEST",
+            IV_SYSTEM=system,
+            IV_CLIENT=client,
+            IV_REQUEST="SOME",
+            IV_OFFLINE="X",
+            IV_MONITOR="X",
+            IT_REQUESTS=[{"TRKORR": request_id} for request_id in batch],
+        )
+        exception = triggered.get("ES_EXCEPTION") or {}
+        if any(str(v).strip() for v in exception.values()):
+            for request_id in batch:
+                batch_results[request_id] = dict(
+                    REQUEST=request_id,
+                    SYSTEM=system,
+                    CLIENT=client,
+                    RETCODE=str(triggered.get("EV_TP_RET_CODE", "")),
+                    DURATION=round(time.monotonic() - start, 3),
+                    FAILED=True,
+                    MESSAGE=exception,
+                )
+
+        deadline = start + poll_timeout
+        interval = poll_interval
+        while len(batch_results) < len(batch):
+            waiting = [request_id for request_id in batch if request_id not in batch_results]
+            return_codes = imported_return_codes(
+                import_queue_imports(abap, system, client, waiting), before
+            )
+            for request_id, return_code in return_codes.items():
+                batch_results[request_id] = dict(
+                    REQUEST=request_id,
+                    SYSTEM=system,
+                    CLIENT=client,
+                    RETCODE=return_code,
+                    DURATION=round(time.monotonic() - start, 3),
+                    FAILED=int(return_code) > max_return_code,
+                )
+            if len(batch_results) == len(batch):
+                break
+            if time.monotonic() >= deadline:
+                for request_id in batch:
+                    batch_results.setdefault(
+                        request_id,
+                        dict(
+                            REQUEST=request_id,
+                            SYSTEM=system,
+                            CLIENT=client,
+                            RETCODE="",
+                            DURATION=round(time.monotonic() - start, 3),
+                            FAILED=True,
+                            MESSAGE="Timeout waiting for import",
+                        ),
+                    )
+                break
+            time.sleep(interval)
+            interval = min(interval * 1.5, POLL_INTERVAL_MAX)
+        results.extend(batch_results[request_id] for request_id in batch)
+    return results
+
 
 def main():
     argument_spec = dict(
-        client=dict(type="str", required=True),
-        system=dict(type="str", required=True),
+        client=dict(type="str", required=False),
+        system=dict(type="str", required=False),
         transport_request_ids=dict(type="list", required=True, elements="str"),
+        bulk=dict(type="bool", required=False, default=False),
+        targets=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            options=dict(
+                system=dict(type="str", required=True),
+                client=dict(type="str", required=True),
+            ),
+        ),
+        batch_size=dict(type="int", required=False, default=10),
+        poll_interval=dict(type="int", required=False, default=5),
+        poll_timeout=dict(type="int", required=False, default=3600),
+        max_return_code=dict(type="int", required=False, default=4),
+    )
+
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec,
+        supports_check_mode=False,
+        required_one_of=[("system", "targets")],
+        required_together=[("system", "client")],
+        required_if=[("bulk", False, ("system",))],
     )
 
-    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=False)
+    if module.params["targets"] and not module.params["bulk"]:
+        module.fail_json(msg="targets can only be used with bulk=true")
 
     client = module.params["client"]
     system = module.params["system"]
     transport_request_ids = module.params["transport_request_ids"]
 
+    if module.params["bulk"]:
+        targets = module.params["targets"] or [dict(system=system, client=client)]
+        with module as abap:
+            results = abap.map_parallel(
+                lambda abap, target: bulk_import(
+                    abap,
+                    target,
+                    transport_request_ids,
+                    max(module.params["batch_size"], 1),
+                    module.params["poll_interval"],
+                    module.params["poll_timeout"],
+                    module.params["max_return_code"],
+                ),
+                targets,
+                connections=len(targets),
+            )
+            abap_transport_import = [
+                result for target_results in results for result in target_results
+            ]
+            if any(result["FAILED"] for result in abap_transport_import):
+                raise AnsibleModuleABAPFailException(
+                    msg="Failed to import transport request",
+                    changed=True,
+                    abap_transport_import=abap_transport_import,
+                )
+
+        module.exit_json(
+            changed=True,
+            failed=False,
+            abap_transport_import=abap_transport_import,
+        )
+
     with module as abap:
         abap_transport_import = abap(
             "CTS_API_IMPORT_CHANGE_REQUEST",
@@ -31,6 +31,7 @@ module: abap_transport_info
 
 extends_documentation_fragment:
   - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.abap_rfc_doc.result_format
   - sap.sap_operations.community
 
 author:
@@ -166,7 +167,9 @@ def main():
         transport_request_id=dict(type="str", required=True),
     )
 
-    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=True)
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec, supports_check_mode=True, result_format=True
+    )
     transport_request_id = module.params["transport_request_id"]
 
     with module as abap:
@@ -175,7 +178,7 @@ def main():
     module.exit_json(
         changed=False,
         failed=False,
-        abap_transport_info=abap_transport_info,
+        abap_transport_info=module.format_result(abap_transport_info),
     )
 
 
@@ -31,6 +31,7 @@ module: abap_transports_info
 
 extends_documentation_fragment:
   - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.abap_rfc_doc.result_format
   - sap.sap_operations.community
 
 author:
@@ -108,6 +109,37 @@ options:
     type: bool
     required: false
     default: false
+
+  incremental:
+    description:
+      - If true, module keeps snapshot of transport requests on managed host in I(snapshot_dir)
+      - Snapshot is kept per SAP system ID, client and search criteria
+      - First run reads all transport requests with CTS_WBO_API_READ_REQUESTS_RFC
+      - Later runs read only requests changed since the day of last change seen (table E070, field AS4DATE)
+        and merge them into the snapshot, texts (in logon language) and clients are read from tables E07T and E070C,
+        attributes from table E070A
+      - Requests of incremental result contain only fields listed in return value I(abap_transports_info),
+        attributes only ATTRIBUTE and REFERENCE, whichever source they were read from
+      - With I(owner), requests owned by the user or with a task owned by the user match
+      - Transport requests deleted in the system are not detected, use I(full_sync) to rebuild snapshot
+    type: bool
+    required: false
+    default: false
+    version_added: 2.13.0
+
+  snapshot_dir:
+    description: Directory on managed host where snapshots are kept
+    type: path
+    required: false
+    default: ~/.ansible/sap_operations/abap_transports_info
+    version_added: 2.13.0
+
+  full_sync:
+    description: If true, snapshot is rebuilt from full CTS_WBO_API_READ_REQUESTS_RFC result
+    type: bool
+    required: false
+    default: false
+    version_added: 2.13.0
 """
 
 EXAMPLES = r"""
@@ -129,6 +161,17 @@ EXAMPLES = r"""
       user: DDIC
       passwd: "SecretPa$$word"
       sysnr: '00'
+
+- name: Synchronise all changeable transport requests incrementally
+  sap.sap_operations.abap_transports_info:
+    owner: "*"
+    incremental: true
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: '000'
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: '00'
 """
 
 RETURN = r"""
@@ -179,11 +222,317 @@ abap_transports_info:
             TRFUNCTION: Q
             TRKORR: NPLK900063
             TRSTATUS: D
+
+abap_transports_delta:
+  description: Changes since previous run, returned only with I(incremental=true)
+  type: dict
+  returned: success and I(incremental=true)
+  contains:
+    full_sync:
+      description: True if snapshot was built from full result
+      type: bool
+      sample: false
+    changed:
+      description: Transport requests added or changed since previous run, same format as I(REQUESTS)
+      type: list
+      elements: dict
+    removed:
+      description: IDs of transport requests that do not match search criteria anymore
+      type: list
+      elements: str
+      sample: [NPLK900022]
+    watermark:
+      description: Date (AS4DATE) from which changes will be read on next run
+      type: str
+      sample: '20231214'
 """
 
+import hashlib
+import json
+import os
+
 from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    ABAP_LANG2SPRAS,
     AnsibleModuleABAP,
 )
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    read_table,
+    read_table_metadata,
+)
+
+E070_FIELDS = [
+    "TRKORR",
+    "TRFUNCTION",
+    "TRSTATUS",
+    "TARSYSTEM",
+    "AS4USER",
+    "AS4DATE",
+    "AS4TIME",
+    "STRKORR",
+]
+TRANSPORT_STATUS_GROUPS = {"D": ("D", "L"), "R": ("R", "O")}
+TRKORR_IN_CHUNK = 50
+
+# Fields of incremental result, both CTS_WBO_API_READ_REQUESTS_RFC results and requests
+# read from tables are reduced to them, so snapshot entries of both sources compare equal
+REQUEST_HEADER_FIELDS = [
+    "AS4DATE",
+    "AS4TEXT",
+    "AS4TIME",
+    "AS4USER",
+    "CLIENT",
+    "TARSYSTEM",
+    "TRFUNCTION",
+    "TRKORR",
+    "TRSTATUS",
+]
+TASK_HEADER_FIELDS = [
+    "AS4DATE",
+    "AS4TEXT",
+    "AS4TIME",
+    "AS4USER",
+    "TRFUNCTION",
+    "TRKORR",
+    "TRSTATUS",
+]
+REQUEST_ATTRIBUTE_FIELDS = ["ATTRIBUTE", "REFERENCE"]
+
+
+def normalise_request(request):
+    """Return transport request in schema of incremental result, independent of its source."""
+    return dict(
+        REQ_ATTRS=sorted(
+            (
+                {field: attribute.get(field, "") for field in REQUEST_ATTRIBUTE_FIELDS}
+                for attribute in request.get("REQ_ATTRS") or []
+            ),
+            key=lambda attribute: (attribute["ATTRIBUTE"], attribute["REFERENCE"]),
+        ),
+        REQ_HEADER={
+            field: request["REQ_HEADER"].get(field, "") for field in REQUEST_HEADER_FIELDS
+        },
+        TASK_HEADERS=sorted(
+            (
+                {field: task.get(field, "") for field in TASK_HEADER_FIELDS}
+                for task in request.get("TASK_HEADERS") or []
+            ),
+            key=lambda task: task["TRKORR"],
+        ),
+    )
+
+
+def where_in(field, values):
+    return "{0} IN ( {1} )".format(
+        field, " , ".join("'{0}'".format(value) for value in values)
+    )
+
+
+class TableReader(object):
+    """Read ABAP tables with field and key metadata read once per table and fields."""
+
+    def __init__(self, abap):  # noqa: D107
+        self.abap = abap
+        self.metadata = {}
+
+    def read(self, table, fields, where=None):
+        key = (table, tuple(fields))
+        if key not in self.metadata:
+            self.metadata[key] = read_table_metadata(self.abap, table, fields)
+        table_fields, key_fields = self.metadata[key]
+        return read_table(
+            self.abap,
+            table,
+            fields=fields,
+            where=where,
+            table_fields=table_fields,
+            key_fields=key_fields,
+        )
+
+    def read_in(self, table, fields, field, values, where=None):
+        """Read table rows where field value is one of values, in chunks."""
+        values = sorted(values)
+        rows = []
+        for i in range(0, len(values), TRKORR_IN_CHUNK):
+            condition = where_in(field, values[i:i + TRKORR_IN_CHUNK])
+            if where:
+                condition = "{0} AND {1}".format(where, condition)
+            rows.extend(self.read(table, fields, where=condition))
+        return rows
+
+
+def request_matches(request, selection, owners=None):
+    """Check if request matches search criteria.
+
+    Owner matches if user owns request or one of its tasks, `owners` are owners of request and tasks.
+    """
+    header = request["REQ_HEADER"]
+    if selection["TRFUNCTION"] != "*" and header["TRFUNCTION"] != selection["TRFUNCTION"]:
+        return False
+    if selection["TRSTATUS"] != "*" and header["TRSTATUS"] not in TRANSPORT_STATUS_GROUPS.get(
+        selection["TRSTATUS"], (selection["TRSTATUS"],)
+    ):
+        return False
+    if selection["TARSYSTEM"] != "*" and header["TARSYSTEM"] != selection["TARSYSTEM"]:
+        return False
+    if selection.get("AS4USER") not in (None, "*"):
+        if owners is None:
+            owners = set([header["AS4USER"]]) | set(
+                task["AS4USER"] for task in request.get("TASK_HEADERS") or []
+            )
+        if selection["AS4USER"] not in owners:
+            return False
+    if selection.get("CLIENT") and header.get("CLIENT") != selection["CLIENT"]:
+        return False
+    return True
+
+
+def read_changed_requests(abap, watermark, selection, language):
+    """Read requests changed since watermark (AS4DATE) from E070, E07T, E070C and E070A.
+
+    Returns (requests, owners, watermark), requests normalised with normalise_request keyed by TRKORR,
+    owners are sets of owners of request and its tasks keyed by TRKORR.
+    Texts are read in `language` (one character language key).
+    """
+    reader = TableReader(abap)
+    changed_rows = list(
+        reader.read("E070", E070_FIELDS, where="AS4DATE >= '{0}'".format(watermark))
+    )
+    if not changed_rows:
+        return {}, {}, watermark
+    new_watermark = max([watermark] + [row["AS4DATE"] for row in changed_rows])
+
+    request_ids = set(
+        row["STRKORR"] if row["STRKORR"] else row["TRKORR"] for row in changed_rows
+    )
+    headers = reader.read_in("E070", E070_FIELDS, "TRKORR", request_ids)
+    tasks = reader.read_in("E070", E070_FIELDS, "STRKORR", request_ids)
+    texts = {
+        row["TRKORR"]: row["AS4TEXT"]
+        for row in reader.read_in(
+            "E07T",
+            ["TRKORR", "AS4TEXT"],
+            "TRKORR",
+            request_ids
+            | set(task["TRKORR"] for task in tasks if selection["READ_TASK_HEADERS"] == "X"),
+            where="LANGU = '{0}'".format(language),
+        )
+    }
+    clients = {
+        row["TRKORR"]: row["CLIENT"]
+        for row in reader.read_in("E070C", ["TRKORR", "CLIENT"], "TRKORR", request_ids)
+    }
+    attributes = {}
+    if selection["READ_ATTRS"] == "X":
+        for row in reader.read_in(
+            "E070A", ["TRKORR"] + REQUEST_ATTRIBUTE_FIELDS, "TRKORR", request_ids
+        ):
+            if not selection["REQ_ATTR_KEYS"] or row.get("ATTRIBUTE") in selection["REQ_ATTR_KEYS"]:
+                attributes.setdefault(row["TRKORR"], []).append(row)
+
+    owners = {}
+    task_headers = {}
+    for task in tasks:
+        owners.setdefault(task["STRKORR"], set()).add(task["AS4USER"])
+        if selection["READ_TASK_HEADERS"] == "X":
+            task_headers.setdefault(task["STRKORR"], []).append(
+                dict(task, AS4TEXT=texts.get(task["TRKORR"], ""))
+            )
+
+    requests = {}
+    for header in headers:
+        if header["STRKORR"]:
+            continue
+        owners.setdefault(header["TRKORR"], set()).add(header["AS4USER"])
+        requests[header["TRKORR"]] = normalise_request(
+            dict(
+                REQ_ATTRS=attributes.get(header["TRKORR"], []),
+                REQ_HEADER=dict(
+                    header,
+                    AS4TEXT=texts.get(header["TRKORR"], ""),
+                    CLIENT=clients.get(header["TRKORR"], ""),
+                ),
+                TASK_HEADERS=task_headers.get(header["TRKORR"], []),
+            )
+        )
+    return requests, owners, new_watermark
+
+
+def snapshot_path(snapshot_dir, sid, client, selection):
+    selection_hash = hashlib.sha256(
+        json.dumps(selection, sort_keys=True).encode("utf-8")
+    ).hexdigest()[:16]
+    return os.path.join(
+        snapshot_dir, "{0}_{1}_{2}.json".format(sid, client, selection_hash)
+    )
+
+
+def load_snapshot(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as snapshot_file:
+        return json.load(snapshot_file)
+
+
+def save_snapshot(path, snapshot):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as snapshot_file:
+        json.dump(snapshot, snapshot_file)
+    os.replace(tmp_path, path)
+
+
+def incremental_transports_info(abap, params, snapshot_dir, full_sync, check_mode):
+    """Return (merged result, delta), snapshot is updated unless check_mode."""
+    connection = abap.rfc_connection or abap.http_connection
+    language = ABAP_LANG2SPRAS.get(
+        connection.get("lang") or connection.get("language") or "EN", "E"
+    )
+    sid = abap("RFC_SYSTEM_INFO")["RFCSI_EXPORT"]["RFCSYSID"]
+    selection = dict(params)
+    if "AS4USER" not in selection:
+        selection["AS4USER"] = connection.get("user") or connection.get("username")
+    path = snapshot_path(snapshot_dir, sid, connection.get("client"), selection)
+    snapshot = None if full_sync else load_snapshot(path)
+
+    if snapshot is None:
+        result = abap("CTS_WBO_API_READ_REQUESTS_RFC", **params)
+        requests = {
+            request["REQ_HEADER"]["TRKORR"]: normalise_request(request)
+            for request in result.get("REQUESTS", [])
+        }
+        dates = [request["REQ_HEADER"]["AS4DATE"] for request in requests.values()] + [
+            task["AS4DATE"]
+            for request in requests.values()
+            for task in request.get("TASK_HEADERS", [])
+        ]
+        snapshot = dict(watermark=max(dates or ["00000000"]), requests=requests)
+        delta = dict(full_sync=True, changed=list(requests.values()), removed=[])
+    else:
+        snapshot["requests"] = {
+            request_id: normalise_request(request)
+            for request_id, request in snapshot["requests"].items()
+        }
+        changed, owners, watermark = read_changed_requests(
+            abap, snapshot["watermark"], selection, language
+        )
+        delta = dict(full_sync=False, changed=[], removed=[])
+        for request_id, request in sorted(changed.items()):
+            if request_matches(request, selection, owners.get(request_id)):
+                if snapshot["requests"].get(request_id) != request:
+                    snapshot["requests"][request_id] = request
+                    delta["changed"].append(request)
+            elif request_id in snapshot["requests"]:
+                del snapshot["requests"][request_id]
+                delta["removed"].append(request_id)
+        snapshot["watermark"] = watermark
+
+    delta["watermark"] = snapshot["watermark"]
+    if not check_mode:
+        save_snapshot(path, snapshot)
+    merged = dict(
+        REQUESTS=[request for _request_id, request in sorted(snapshot["requests"].items())]
+    )
+    return merged, delta
 
 
 def main():
@@ -200,9 +549,18 @@ def main():
             type="list", required=False, default=[], elements="str", no_log=False
         ),
         read_task_headers=dict(type="bool", required=False, default=False),
+        incremental=dict(type="bool", required=False, default=False),
+        snapshot_dir=dict(
+            type="path",
+            required=False,
+            default="~/.ansible/sap_operations/abap_transports_info",
+        ),
+        full_sync=dict(type="bool", required=False, default=False),
     )
 
-    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=True)
+    module = AnsibleModuleABAP(
+        argument_spec=argument_spec, supports_check_mode=True, result_format=True
+    )
     category = module.params["category"]
     transport_status = module.params["transport_status"]
     target_system = module.params["target_system"]
@@ -227,16 +585,33 @@ def main():
     if client:
         params["CLIENT"] = client
 
+    if not module.params["incremental"]:
+        with module as abap:
+            abap_transports_info = abap(
+                "CTS_WBO_API_READ_REQUESTS_RFC",
+                **params,
+            )
+
+        module.exit_json(
+            changed=False,
+            failed=False,
+            abap_transports_info=module.format_result(abap_transports_info),
+        )
+
     with module as abap:
-        abap_transports_info = abap(
-            "CTS_WBO_API_READ_REQUESTS_RFC",
-            **params,
+        abap_transports_info, abap_transports_delta = incremental_transports_info(
+            abap,
+            params,
+            module.params["snapshot_dir"],
+            module.params["full_sync"],
+            module.check_mode,
         )
 
     module.exit_json(
         changed=False,
         failed=False,
-        abap_transports_info=abap_transports_info,
+        abap_transports_info=module.format_result(abap_transports_info),
+        abap_transports_delta=abap_transports_delta,
     )
 
 
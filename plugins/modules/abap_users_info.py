@@ -0,0 +1,444 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_users_info
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Get information about users of SAP ABAP system
+
+description:
+  - Get list of users of SAP ABAP system with BAPI_USER_GETLIST, page by page of I(page_size) users
+  - Details of every user are read with BAPI_USER_GET_DETAIL, over I(parallel_connections) connections
+  - Only details selected with I(projections) are returned
+  - Users are written to file I(dest) on managed host as JSON lines while they are read,
+    so users of big systems are not returned to Ansible and not kept in memory
+  - In check mode users are read, but file I(dest) is not written
+  - If I(dest) is not provided, users are returned in the module result
+  - Pages are read in order of user name, users created while module runs may be missed
+
+version_added: 2.13.0
+
+options:
+  username:
+    description:
+      - User name patterns to select, C(*) and C(+) are wildcards
+      - All users are selected if neither I(username) nor I(selection) are provided
+    type: list
+    elements: str
+    required: false
+    default: []
+
+  selection:
+    description:
+      - Additional selection ranges of BAPI_USER_GETLIST (table SELECTION_RANGE)
+      - See documentation of BAPI_USER_GETLIST for parameters and fields
+    type: list
+    elements: dict
+    required: false
+    default: []
+    suboptions:
+      parameter:
+        description: Parameter of BAPI_USER_GET_DETAIL, for example C(LOGONDATA) or C(ADDRESS)
+        type: str
+        required: true
+      field:
+        description: Field of parameter, for example C(USTYP) or C(CLASS)
+        type: str
+        required: false
+        default: ""
+      sign:
+        description: Include C(I) or exclude C(E) values
+        type: str
+        required: false
+        default: I
+        choices: [I, E]
+      option:
+        description: Comparison operator, for example C(EQ), C(CP), C(BT)
+        type: str
+        required: false
+        default: EQ
+      low:
+        description: Value or lower limit of the range
+        type: str
+        required: true
+      high:
+        description: Upper limit of the range, for I(option=BT)
+        type: str
+        required: false
+        default: ""
+
+  projections:
+    description:
+      - Details of user to return, read with BAPI_USER_GET_DETAIL
+      - C(logondata) - user type, validity, user group, last logon (LOGONDATA)
+      - C(lock) - lock status (ISLOCKED)
+      - C(defaults) - user defaults (DEFAULTS)
+      - C(address) - name, e-mail and address (ADDRESS)
+      - C(roles) - assigned roles (ACTIVITYGROUPS)
+      - C(profiles) - assigned profiles (PROFILES)
+      - C(parameters) - user parameters (PARAMETER)
+      - C(groups) - user groups (GROUPS)
+      - With empty list only user list is read, BAPI_USER_GET_DETAIL is not called
+    type: list
+    elements: str
+    required: false
+    default: [logondata, lock]
+    choices: [logondata, lock, defaults, address, roles, profiles, parameters, groups]
+
+  page_size:
+    description: Number of users read with one BAPI_USER_GETLIST call
+    type: int
+    required: false
+    default: 1000
+
+  max_users:
+    description: Maximum number of users to read, C(0) reads all users
+    type: int
+    required: false
+    default: 0
+
+  parallel_connections:
+    description: Number of connections to SAP ABAP system used to read user details
+    type: int
+    required: false
+    default: 4
+
+  dest:
+    description: Path to file on managed host, users are written to this file as JSON lines
+    type: path
+    required: false
+"""
+
+EXAMPLES = r"""
+- name: Export users with roles and lock status for access review
+  sap.sap_operations.abap_users_info:
+    projections: [logondata, lock, roles, profiles]
+    parallel_connections: 8
+    dest: /tmp/users.jsonl
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+
+- name: Get dialog users with name starting with A
+  sap.sap_operations.abap_users_info:
+    username:
+      - A*
+    selection:
+      - parameter: LOGONDATA
+        field: USTYP
+        low: A
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+"""
+
+RETURN = r"""
+abap_users_info:
+  description: Result of users read
+  type: dict
+  returned: success
+  contains:
+    users_count:
+      description: Number of users read
+      type: int
+      sample: 40213
+    failed_count:
+      description: Number of users, details of which could not be read
+      type: int
+      sample: 0
+    dest:
+      description: Path to file with users, returned if I(dest) was provided, file is not written in check mode
+      type: str
+      sample: /tmp/users.jsonl
+    users:
+      description:
+        - Users, returned if I(dest) was not provided
+        - Every user has USERNAME, FULLNAME and parameters of BAPI_USER_GET_DETAIL selected with I(projections)
+      type: list
+      elements: dict
+      sample:
+        - USERNAME: DDIC
+          FULLNAME: DDIC
+          ISLOCKED:
+            GLOB_LOCK: U
+            LOCAL_LOCK: U
+            NO_USER_PW: U
+            WRNG_LOGON: U
+          LOGONDATA:
+            CLASS: SUPER
+            GLTGB: "00000000"
+            GLTGV: "00000000"
+            LTIME: "20240101"
+            USTYP: A
+"""
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+)
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    ABAPResultFileWriter,
+)
+
+"""
+ABAP_USER_PROJECTIONS - projection: parameter of BAPI_USER_GET_DETAIL
+"""
+ABAP_USER_PROJECTIONS = dict(
+    logondata="LOGONDATA",
+    lock="ISLOCKED",
+    defaults="DEFAULTS",
+    address="ADDRESS",
+    roles="ACTIVITYGROUPS",
+    profiles="PROFILES",
+    parameters="PARAMETER",
+    groups="GROUPS",
+)
+
+
+def user_selection_range(username, selection):
+    """Build SELECTION_RANGE of BAPI_USER_GETLIST from user name patterns and selection options."""
+    selection_range = [
+        dict(
+            PARAMETER="USERNAME",
+            FIELD="",
+            SIGN="I",
+            OPTION="CP" if "*" in pattern or "+" in pattern else "EQ",
+            LOW=pattern,
+            HIGH="",
+        )
+        for pattern in username
+    ]
+    selection_range += [
+        dict(
+            PARAMETER=option["parameter"],
+            FIELD=option["field"],
+            SIGN=option["sign"],
+            OPTION=option["option"],
+            LOW=option["low"],
+            HIGH=option["high"],
+        )
+        for option in selection
+    ]
+    return selection_range
+
+
+def check_return(result, func_name):
+    errors = [
+        message.get("MESSAGE", "")
+        for message in result.get("RETURN", [])
+        if message.get("TYPE") in ("E", "A")
+    ]
+    if errors:
+        raise Exception("{0}: {1}".format(func_name, "; ".join(errors)))
+
+
+def user_list_pages(abap, selection_range, page_size, max_users=0):
+    """Generator, yields pages of BAPI_USER_GETLIST USERLIST.
+
+    Next page is selected by excluding user names up to the last user name of the previous page,
+    exclusion is combined with other selection ranges, inclusions are not affected.
+    """
+    last_username = None
+    users_read = 0
+    while True:
+        rows = page_size
+        if max_users:
+            rows = min(page_size, max_users - users_read)
+            if rows <= 0:
+                return
+        page_range = list(selection_range)
+        if last_username is not None:
+            page_range.append(
+                dict(
+                    PARAMETER="USERNAME",
+                    FIELD="",
+                    SIGN="E",
+                    OPTION="LE",
+                    LOW=last_username,
+                    HIGH="",
+                )
+            )
+        result = abap(
+            "BAPI_USER_GETLIST",
+            MAX_ROWS=rows,
+            WITH_USERNAME="X",
+            SELECTION_RANGE=page_range,
+        )
+        check_return(result, "BAPI_USER_GETLIST")
+        page = sorted(result.get("USERLIST", []), key=lambda user: user["USERNAME"])
+        if page:
+            yield page
+        users_read += len(page)
+        if len(page) < rows:
+            return
+        last_username = page[-1]["USERNAME"]
+
+
+def user_details(abap, user, parameters):
+    """Return user of USERLIST with selected parameters of BAPI_USER_GET_DETAIL."""
+    details = dict(USERNAME=user["USERNAME"], FULLNAME=user.get("FULLNAME", ""))
+    if not parameters:
+        return details
+    try:
+        result = abap(
+            "BAPI_USER_GET_DETAIL", USERNAME=user["USERNAME"], CACHE_RESULTS=" "
+        )
+        check_return(result, "BAPI_USER_GET_DETAIL")
+    except Exception as e:
+        details.update(failed=True, msg=str(e))
+        return details
+    for parameter in parameters:
+        details[parameter] = result.get(parameter)
+    return details
+
+
+def read_users(abap, selection_range, parameters, page_size, max_users, connections, write):
+    """Read users page by page, details of one page in parallel, pass every user to write.
+
+    Return number of users and number of users details of which could not be read.
+    """
+    users_count = 0
+    failed_count = 0
+    for page in user_list_pages(abap, selection_range, page_size, max_users):
+        details = abap.map_parallel(
+            lambda abap, user: user_details(abap, user, parameters),
+            page,
+            connections=connections,
+        )
+        for user in details:
+            users_count += 1
+            if user.get("failed"):
+                failed_count += 1
+            write(user)
+    return users_count, failed_count
+
+
+def main():
+    argument_spec = dict(
+        username=dict(type="list", elements="str", required=False, default=[]),
+        selection=dict(
+            type="list",
+            elements="dict",
+            required=False,
+            default=[],
+            options=dict(
+                parameter=dict(type="str", required=True),
+                field=dict(type="str", required=False, default=""),
+                sign=dict(type="str", required=False, default="I", choices=["I", "E"]),
+                option=dict(type="str", required=False, default="EQ"),
+                low=dict(type="str", required=True),
+                high=dict(type="str", required=False, default=""),
+            ),
+        ),
+        projections=dict(
+            type="list",
+            elements="str",
+            required=False,
+            default=["logondata", "lock"],
+            choices=list(ABAP_USER_PROJECTIONS),
+        ),
+        page_size=dict(type="int", required=False, default=1000),
+        max_users=dict(type="int", required=False, default=0),
+        parallel_connections=dict(type="int", required=False, default=4),
+        dest=dict(type="path", required=False),
+    )
+
+    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=True)
+    selection_range = user_selection_range(
+        module.params["username"], module.params["selection"]
+    )
+    parameters = [
+        ABAP_USER_PROJECTIONS[projection] for projection in module.params["projections"]
+    ]
+    page_size = module.params["page_size"]
+    max_users = module.params["max_users"]
+    parallel_connections = module.params["parallel_connections"]
+    dest = module.params["dest"]
+
+    users = []
+    with module as abap:
+        if dest and module.check_mode:
+            users_count, failed_count = read_users(
+                abap,
+                selection_range,
+                parameters,
+                page_size,
+                max_users,
+                parallel_connections,
+                lambda user: None,
+            )
+        elif dest:
+            with ABAPResultFileWriter(dest) as writer:
+                users_count, failed_count = read_users(
+                    abap,
+                    selection_range,
+                    parameters,
+                    page_size,
+                    max_users,
+                    parallel_connections,
+                    writer.write,
+                )
+        else:
+            users_count, failed_count = read_users(
+                abap,
+                selection_range,
+                parameters,
+                page_size,
+                max_users,
+                parallel_connections,
+                users.append,
+            )
+
+    abap_users_info = dict(users_count=users_count, failed_count=failed_count)
+    if dest:
+        abap_users_info["dest"] = dest
+    else:
+        abap_users_info["users"] = users
+
+    module.exit_json(
+        changed=bool(dest),
+        failed=False,
+        abap_users_info=abap_users_info,
+    )
+
+
+if __name__ == "__main__":
+    main()
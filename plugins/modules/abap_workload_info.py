@@ -0,0 +1,438 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+module: abap_workload_info
+
+extends_documentation_fragment:
+  - sap.sap_operations.abap_rfc_doc
+  - sap.sap_operations.community
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Extract workload statistics (ST03 aggregates) of SAP ABAP system
+
+description:
+  - Read workload aggregates of SAP ABAP system (transaction ST03) with remote enabled function
+    SWNC_COLLECTOR_GET_AGGREGATES, one call per period of I(period_type) between I(start_date) and I(end_date)
+  - Rows of aggregate tables selected with I(tables) are written to file I(dest) on managed host as JSON lines,
+    every row has PERIOD, COMPONENT and TABLE keys added
+  - In check mode aggregates are read, but file I(dest) is not written
+  - Compact summary per task type and top transactions by total response time are returned to Ansible
+  - Times are returned by SWNC_COLLECTOR_GET_AGGREGATES in milliseconds
+  - Legacy SAPWL_* functions of releases before 6.40 are not supported
+
+version_added: 2.13.0
+
+options:
+  component:
+    description:
+      - Component (instance) of workload statistics, for example C(vhcalnplci_NPL_00)
+      - C(TOTAL) returns aggregates of all instances of the system
+    type: str
+    required: false
+    default: TOTAL
+
+  system:
+    description:
+      - System ID of workload statistics (ASSIGNDSYS)
+      - If not provided, system ID of connected system is used
+    type: str
+    required: false
+
+  period_type:
+    description:
+      - Aggregation period
+      - Week periods start on Monday, month periods on first day of month
+    type: str
+    required: false
+    default: day
+    choices: [day, week, month]
+
+  start_date:
+    description: First period to read, YYYYMMDD, it is aligned to start of I(period_type)
+    type: str
+    required: true
+
+  end_date:
+    description: Last period to read, YYYYMMDD, I(start_date) if not provided
+    type: str
+    required: false
+
+  tables:
+    description:
+      - Aggregate tables of SWNC_COLLECTOR_GET_AGGREGATES written to I(dest)
+      - C(TASKTYPE) - workload per task type, C(TCDET) - per transaction, C(USERTCODE) - per user and transaction,
+        C(USERWORKLOAD) - per user, C(RFCSRVR) and C(RFCCLNT) - RFC server and client, C(HITLIST_RESPTIME) - top steps
+    type: list
+    elements: str
+    required: false
+    default: [TASKTYPE, TCDET, USERTCODE]
+
+  dest:
+    description:
+      - Path to file on managed host, rows of I(tables) are written to this file as JSON lines
+      - If not provided, only summary is returned
+    type: path
+    required: false
+
+  top_transactions:
+    description: Number of transactions with highest total response time returned in summary
+    type: int
+    required: false
+    default: 10
+
+  parallel_connections:
+    description: Number of connections used to read periods in parallel
+    type: int
+    required: false
+    default: 2
+"""
+
+EXAMPLES = r"""
+- name: Export daily workload of last week for capacity planning
+  sap.sap_operations.abap_workload_info:
+    start_date: "20240101"
+    end_date: "20240107"
+    dest: "/tmp/workload_{{ inventory_hostname }}.jsonl"
+    rfc_connection:
+      ashost: application-instance-hostname
+      client: "000"
+      user: DDIC
+      passwd: "SecretPa$$word"
+      sysnr: "00"
+  register: workload
+
+- name: Monthly summary per task type
+  sap.sap_operations.abap_workload_info:
+    period_type: month
+    start_date: "20240101"
+    end_date: "20240601"
+    tables: []
+    rfc_connection: "{{ rfc_connection }}"
+"""
+
+RETURN = r"""
+abap_workload_info:
+  description: Workload summary
+  type: dict
+  returned: success
+  contains:
+    system:
+      description: System ID of workload statistics
+      type: str
+      sample: NPL
+    component:
+      description: Component of workload statistics
+      type: str
+      sample: TOTAL
+    periods:
+      description: Start dates of periods read
+      type: list
+      elements: str
+      sample: ["20240101", "20240102"]
+    rows_count:
+      description: Number of rows written to I(dest), in check mode number of rows that would be written
+      type: int
+      sample: 15230
+    dest:
+      description: Path to file with rows, returned if I(dest) was provided, file is not written in check mode
+      type: str
+      sample: /tmp/workload.jsonl
+    task_types:
+      description: Workload per task type, summed over all periods, times in milliseconds
+      type: list
+      elements: dict
+      sample:
+        - TASKTYPE: DIALOG
+          STEPS: 152340
+          RESPTI: 91404000
+          AVG_RESPTI: 600.0
+          AVG_CPUTI: 120.5
+          AVG_DBTI: 240.1
+          AVG_QUEUETI: 2.1
+    top_transactions:
+      description: Transactions with highest total response time, summed over all periods
+      type: list
+      elements: dict
+      sample:
+        - ENTRY_ID: VA01
+          STEPS: 1200
+          RESPTI: 1440000
+          AVG_RESPTI: 1200.0
+"""
+
+from datetime import date, timedelta
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    AnsibleModuleABAP,
+)
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    ABAPResultFileWriter,
+    table2columnar,
+)
+
+ABAP_WORKLOAD_PERIOD_TYPES = dict(day="D", week="W", month="M")
+
+# Task type codes (RAW 1) of workload statistics
+ABAP_WORKLOAD_TASK_TYPES = {
+    "01": "DIALOG",
+    "02": "UPDATE",
+    "03": "SPOOL",
+    "04": "BACKGROUND",
+    "05": "ENQUEUE",
+    "06": "BUF.SYNC",
+    "07": "AUTOABAP",
+    "08": "UPDATE2",
+    "0B": "AUTOTH",
+    "0C": "RPCTH",
+    "0D": "RFCVMC",
+    "0E": "DDLOG CLEANUP",
+    "0F": "DEL. THCALL",
+    "10": "AUTOJAVA",
+    "11": "LICENCESRV",
+    "12": "AUTOCCMS",
+    "21": "OTHER",
+    "22": "DINOGUI",
+    "23": "B.INPUT",
+    "65": "HTTP",
+    "66": "HTTPS",
+    "67": "NNTP",
+    "68": "SMTP",
+    "69": "FTP",
+    "6C": "LCOM",
+    "75": "HTTP/JSP",
+    "76": "HTTPS/JSP",
+    "FC": "ESI",
+    "FD": "ALE",
+    "FE": "RFC",
+    "FF": "CPIC",
+}
+
+# Database time is not aggregated separately, it is sum of direct read, sequential read and change times
+ABAP_WORKLOAD_DB_TIMES = ("READDIRTI", "READSEQTI", "CHNGTI")
+
+
+def abap_date(value):
+    return date(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+
+
+def workload_periods(start_date, end_date, period_type):
+    """Return start dates (YYYYMMDD) of periods of type D, W or M between start and end date."""
+    start = abap_date(start_date)
+    end = abap_date(end_date or start_date)
+    if period_type == "W":
+        start -= timedelta(days=start.weekday())
+    elif period_type == "M":
+        start = start.replace(day=1)
+    periods = []
+    current = start
+    while current <= end:
+        periods.append(current.strftime("%Y%m%d"))
+        if period_type == "D":
+            current += timedelta(days=1)
+        elif period_type == "W":
+            current += timedelta(days=7)
+        else:
+            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return periods
+
+
+def task_type_name(code):
+    """Return name of task type code, code is hex string, raw byte, or one character string."""
+    if isinstance(code, bytes):
+        code = code.hex()
+    elif isinstance(code, str) and len(code) == 1:
+        code = "{0:02X}".format(ord(code))
+    code = str(code).upper()
+    return ABAP_WORKLOAD_TASK_TYPES.get(code, code)
+
+
+def number_column(columnar, name):
+    """Return column of columnar table as list of numbers, zeros if column does not exist."""
+    if name not in columnar["columns"]:
+        return [0] * len(columnar["rows"])
+    index = columnar["columns"].index(name)
+    return [float(row[index] or 0) for row in columnar["rows"]]
+
+
+def sum_by_key(totals, columnar, key_column, value_columns, key=None):
+    """Add value columns of columnar table to totals {key: {column: sum}}, column by column."""
+    if not columnar["rows"]:
+        return
+    key_index = columnar["columns"].index(key_column)
+    keys = [row[key_index] for row in columnar["rows"]]
+    if key is not None:
+        keys = [key(k) for k in keys]
+    for column in value_columns:
+        for k, value in zip(keys, number_column(columnar, column)):
+            entry = totals.setdefault(k, {})
+            entry[column] = entry.get(column, 0) + value
+
+
+def summary_rows(totals, key_column):
+    rows = []
+    for k, entry in totals.items():
+        steps = entry.get("COUNT", 0)
+        row = {key_column: k, "STEPS": int(steps), "RESPTI": int(entry.get("RESPTI", 0))}
+        for column in ("RESPTI", "CPUTI", "QUEUETI"):
+            if column in entry:
+                row["AVG_" + column] = round(entry[column] / steps, 1) if steps else 0.0
+        if "DBTI" in entry:
+            row["AVG_DBTI"] = round(entry["DBTI"] / steps, 1) if steps else 0.0
+        rows.append(row)
+    return sorted(rows, key=lambda row: row["RESPTI"], reverse=True)
+
+
+def read_period(abap, system, component, period_type, period):
+    return abap(
+        "SWNC_COLLECTOR_GET_AGGREGATES",
+        COMPONENT=component,
+        ASSIGNDSYS=system,
+        PERIODTYPE=period_type,
+        PERIODSTRT=period,
+    )
+
+
+def main():
+    argument_spec = dict(
+        component=dict(type="str", required=False, default="TOTAL"),
+        system=dict(type="str", required=False),
+        period_type=dict(
+            type="str",
+            required=False,
+            default="day",
+            choices=list(ABAP_WORKLOAD_PERIOD_TYPES),
+        ),
+        start_date=dict(type="str", required=True),
+        end_date=dict(type="str", required=False),
+        tables=dict(
+            type="list",
+            elements="str",
+            required=False,
+            default=["TASKTYPE", "TCDET", "USERTCODE"],
+        ),
+        dest=dict(type="path", required=False),
+        top_transactions=dict(type="int", required=False, default=10),
+        parallel_connections=dict(type="int", required=False, default=2),
+    )
+
+    module = AnsibleModuleABAP(argument_spec=argument_spec, supports_check_mode=True)
+    component = module.params["component"]
+    period_type = ABAP_WORKLOAD_PERIOD_TYPES[module.params["period_type"]]
+    tables = [table.upper() for table in module.params["tables"]]
+    dest = module.params["dest"]
+    parallel_connections = max(module.params["parallel_connections"], 1)
+    try:
+        periods = workload_periods(
+            module.params["start_date"], module.params["end_date"], period_type
+        )
+    except ValueError as e:
+        module.fail_json(msg="Invalid date: {0}".format(e))
+
+    task_types = {}
+    transactions = {}
+    rows_count = 0
+
+    def process(period, result, write):
+        # Tables are converted to columns once, sums are computed column by column
+        tasktype = table2columnar(result.get("TASKTYPE") or [])
+        sum_by_key(
+            task_types,
+            tasktype,
+            "TASKTYPE",
+            ("COUNT", "RESPTI", "CPUTI", "QUEUETI") + ABAP_WORKLOAD_DB_TIMES,
+            key=task_type_name,
+        )
+        tcdet = table2columnar(result.get("TCDET") or [])
+        if "ENTRY_ID" in tcdet["columns"]:
+            sum_by_key(transactions, tcdet, "ENTRY_ID", ("COUNT", "RESPTI", "CPUTI"))
+        written = 0
+        if write is not None:
+            for table in tables:
+                for row in result.get(table) or []:
+                    if "TASKTYPE" in row:
+                        row["TASKTYPE"] = task_type_name(row["TASKTYPE"])
+                    write(dict(row, PERIOD=period, COMPONENT=component, TABLE=table))
+                    written += 1
+        return written
+
+    def read_all(abap, system, write):
+        count = 0
+        for start in range(0, len(periods), parallel_connections):
+            chunk = periods[start:start + parallel_connections]
+            results = abap.map_parallel(
+                lambda abap, period: read_period(
+                    abap, system, component, period_type, period
+                ),
+                chunk,
+                connections=parallel_connections,
+            )
+            for period, result in zip(chunk, results):
+                count += process(period, result, write)
+        return count
+
+    with module as abap:
+        system = module.params["system"]
+        if not system:
+            system = abap("RFC_SYSTEM_INFO")["RFCSI_EXPORT"]["RFCSYSID"]
+        if dest and module.check_mode:
+            rows_count = read_all(abap, system, lambda row: None)
+        elif dest:
+            with ABAPResultFileWriter(dest) as writer:
+                rows_count = read_all(abap, system, writer.write)
+        else:
+            read_all(abap, system, None)
+
+    for entry in task_types.values():
+        entry["DBTI"] = sum(entry.pop(column, 0) for column in ABAP_WORKLOAD_DB_TIMES)
+
+    abap_workload_info = dict(
+        system=system,
+        component=component,
+        periods=periods,
+        rows_count=rows_count,
+        task_types=summary_rows(task_types, "TASKTYPE"),
+        top_transactions=summary_rows(transactions, "ENTRY_ID")[
+            : module.params["top_transactions"]
+        ],
+    )
+    if dest:
+        abap_workload_info["dest"] = dest
+
+    module.exit_json(
+        changed=bool(dest),
+        failed=False,
+        abap_workload_info=abap_workload_info,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2024 Kirill Satarin (@kksat)
+#
+# Copyright 2024 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = r"""
+---
+module: ha_info
+extends_documentation_fragment:
+  - sap.sap_operations.saphost
+
+author:
+  - Kirill Satarin (@kksat)
+
+short_description: Run sap host agent HA functions for all SAP instances on the host
+
+description:
+  - Discover SAP instances installed on the host using sap host agent function ListInstances
+  - For every instance run HACheckConfig, HACheckFailoverConfig and HAGetFailoverConfig
+  - Instances are processed concurrently, one sapcontrol connection is used for all functions of an instance
+  - sapcontrol WSDL is downloaded once and reused for all instances
+  - Errors for a single instance are reported in the result of this instance and do not fail the module
+
+options:
+  instance_numbers:
+    description:
+      - List of instance numbers to check
+      - If not provided, all instances found on the host are checked
+    type: list
+    elements: str
+    required: false
+  max_workers:
+    description: Maximum number of instances processed concurrently
+    type: int
+    required: false
+    default: 4
+
+version_added: 2.13.0
+"""
+
+RETURN = """
+ha_info:
+    description: HA information per SAP instance installed on the host
+    type: list
+    elements: dict
+    returned: success
+    sample:
+    - sid: S4H
+      instance_number: "01"
+      hostname: s4hascs
+      failed: false
+      ha_check_config_info:
+      - category: SAPControl-SAP-CONFIGURATION
+        comment: All Enqueue server separated from application server
+        description: Enqueue separation
+        state: SAPControl-HA-SUCCESS
+      ha_check_failoverconfig_info:
+      - category: SAPControl-SAP-CONFIGURATION
+        comment: SAPInstance includes is-ers patch
+        description: SAPInstance RA sufficient version
+        state: SAPControl-HA-SUCCESS
+      ha_get_failoverconfig_info:
+        HAActive: "TRUE"
+        HAActiveNode: s4hana09
+        HADocumentation: https://github.com/ClusterLabs/sap_cluster_connector
+        HANodes: s4hana09
+        HAProductVersion: Pacemaker
+        HASAPInterfaceVersion: sap_cluster_connector
+    contains:
+        sid:
+            description: SAP system ID of the instance
+            type: str
+            returned: success
+        instance_number:
+            description: Instance number
+            type: str
+            returned: success
+        hostname:
+            description: Instance hostname
+            type: str
+            returned: success
+        failed:
+            description: True if any of HA functions failed for the instance
+            type: bool
+            returned: success
+        msg:
+            description: Error message if HA functions failed for the instance
+            type: str
+            returned: failure of the instance
+        ha_check_config_info:
+            description: Result of HACheckConfig
+            type: list
+            elements: dict
+            returned: success
+        ha_check_failoverconfig_info:
+            description: Result of HACheckFailoverConfig
+            type: list
+            elements: dict
+            returned: success
+        ha_get_failoverconfig_info:
+            description: Result of HAGetFailoverConfig
+            type: dict
+            returned: success
+"""
+
+EXAMPLES = """
+- name: Run ha_info for all instances on the host
+  sap.sap_operations.ha_info:
+
+- name: Run ha_info for ASCS and ERS instances only
+  sap.sap_operations.ha_info:
+    instance_numbers:
+      - "01"
+      - "02"
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.saphost import (
+    AnsibleModuleSAPHostAgent,
+    saphostctrl,
+    sapcontrol,
+    convert2ansible,
+)
+
+HA_FUNCTIONS = (
+    ("ha_check_config_info", "HACheckConfig"),
+    ("ha_check_failoverconfig_info", "HACheckFailoverConfig"),
+    ("ha_get_failoverconfig_info", "HAGetFailoverConfig"),
+)
+
+
+def instance_list(instances):
+    """Return ListInstances result as list, convert2ansible returns dict when there are no items."""
+    if isinstance(instances, list):
+        return instances
+    return []
+
+
+def wsdl_client(instances, connection_params):
+    """Return sapcontrol suds client of the first instance to share its WSDL, None if not reachable."""
+    if not instances:
+        return None
+    try:
+        return sapcontrol(
+            instance=instances[0].get("mSystemNumber"), **connection_params
+        ).client
+    except Exception:
+        return None
+
+
+def instance_ha_info(instance, connection_params, shared_wsdl_client=None):
+    """Run all HA functions for one instance over a single sapcontrol client."""
+    ret = dict(
+        sid=instance.get("mSid"),
+        instance_number=instance.get("mSystemNumber"),
+        hostname=instance.get("mHostname"),
+        failed=False,
+    )
+    try:
+        instance_sapcontrol = sapcontrol(
+            instance=instance.get("mSystemNumber"),
+            wsdl_client=shared_wsdl_client,
+            **connection_params
+        )
+        for key, function_name in HA_FUNCTIONS:
+            ret[key] = convert2ansible(
+                getattr(instance_sapcontrol.client.service, function_name)()
+            )
+    except Exception as e:
+        ret["failed"] = True
+        ret["msg"] = str(e)
+    return ret
+
+
+def main():
+    argument_spec = dict(
+        instance_numbers=dict(type="list", elements="str", required=False),
+        max_workers=dict(type="int", required=False, default=4),
+    )
+    module = AnsibleModuleSAPHostAgent(
+        argument_spec=argument_spec, supports_check_mode=True
+    )
+
+    connection_params = dict(
+        hostname=module.params.get("hostname"),
+        username=module.params.get("username"),
+        password=module.params.get("password"),
+        ca_file=module.params.get("ca_file"),
+        security=module.params.get("security"),
+    )
+    instance_numbers = module.params.get("instance_numbers")
+
+    try:
+        instances = instance_list(
+            convert2ansible(
+                saphostctrl(**connection_params).client.service.ListInstances()
+            )
+        )
+    except Exception as e:
+        module.fail_json(
+            msg="Issue during calling SOAP host agent methods",
+            exception=str(e),
+        )
+
+    if instance_numbers:
+        instances = [
+            instance
+            for instance in instances
+            if instance.get("mSystemNumber") in instance_numbers
+        ]
+
+    ha_info = []
+    if instances:
+        shared_wsdl_client = wsdl_client(instances, connection_params)
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(module.params.get("max_workers"), len(instances)))
+        ) as executor:
+            ha_info = list(
+                executor.map(
+                    lambda instance: instance_ha_info(
+                        instance, connection_params, shared_wsdl_client
+                    ),
+                    instances,
+                )
+            )
+
+    module.exit_json(
+        changed=False,
+        ha_info=ha_info,
+    )
+
+
+if __name__ == "__main__":
+    main()
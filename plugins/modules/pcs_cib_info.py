@@ -41,8 +41,82 @@ description:
   - This module will execute command C(cibadmin --query) and process results to present them nicely in Ansible
   - If pacemaker is not running, or ansible user does not have authorizations to execution C(cibadmin --query) command, module will fail
   - Recommended to use C(root) user
+  - With I(scope) or I(xpath) only part of CIB is queried and returned,
+    filters of this collection expect full CIB or I(scope=configuration)
+  - With I(since), CIB is queried only if its version changed, and only changes against copy of CIB
+    cached on the host are returned, see I(since) and I(cache_dir)
 
-options: {}
+options:
+  scope:
+    description:
+      - Query only this section of CIB, passed to C(cibadmin --query --scope)
+      - Root element of result is the section, for example C(resources)
+    type: str
+    required: false
+    choices:
+      - configuration
+      - resources
+      - constraints
+      - crm_config
+      - nodes
+      - status
+    version_added: 2.13.0
+  xpath:
+    description:
+      - Query only elements matching XPath expression, passed to C(cibadmin --query --xpath)
+      - If several elements match, they are returned in C(xpath-query) element
+      - If no element matches, empty I(pacemaker_cib) and I(pacemaker_cib_xml) are returned
+    type: str
+    required: false
+    version_added: 2.13.0
+  since:
+    description:
+      - Last known CIB version, usually I(pacemaker_cib_version) of previous run
+      - CIB version is read first with C(cibadmin --query --xpath /cib --no-children),
+        if it is the same as I(since), nothing else is queried and I(pacemaker_cib_changed=false) is returned
+      - Otherwise full CIB is queried and compared with C(crm_diff) against copy of CIB cached on the host in I(cache_dir),
+        patch is returned as I(pacemaker_cib_diff) and I(pacemaker_cib_diff_xml)
+      - If there is no cached copy of CIB version I(since), full CIB is returned, use C({}) for first run
+      - C({}) (no attribute set) means that no CIB version is known, full CIB is returned
+      - In check mode cached copy of CIB is not updated
+      - C(num_updates) changes with every status update, omit it to detect configuration changes only
+      - Mutually exclusive with I(scope) and I(xpath)
+    type: dict
+    required: false
+    version_added: 2.13.0
+    suboptions:
+      admin_epoch:
+        description: CIB admin_epoch
+        type: int
+        required: false
+      epoch:
+        description: CIB epoch
+        type: int
+        required: false
+      num_updates:
+        description: CIB num_updates
+        type: int
+        required: false
+  cache_dir:
+    description:
+      - Directory on the host to cache last queried CIB, used with I(since)
+      - CIB may contain secrets, cache file is readable only by its owner
+    type: path
+    required: false
+    default: /var/lib/sap_operations/pcs_cib_info
+    version_added: 2.13.0
+  return_xml:
+    description: Return CIB XML as I(pacemaker_cib_xml)
+    type: bool
+    required: false
+    default: true
+    version_added: 2.13.0
+  return_dict:
+    description: Return CIB converted to dictionary as I(pacemaker_cib)
+    type: bool
+    required: false
+    default: true
+    version_added: 2.13.0
 
 version_added: 1.4.0-galaxy
 
@@ -53,13 +127,79 @@ EXAMPLES = r"""
   sap.sap_operations.pcs_cib_info:
   become: true
   become_user: root
+
+- name: Get cluster properties only, as dictionary
+  sap.sap_operations.pcs_cib_info:
+    scope: crm_config
+    return_xml: false
+  become: true
+  become_user: root
+
+- name: Poll for CIB changes since last run
+  sap.sap_operations.pcs_cib_info:
+    since: "{{ previous.pacemaker_cib_version | default({}) }}"
+  register: current
+  become: true
+  become_user: root
+
+- name: Get configuration of one resource
+  sap.sap_operations.pcs_cib_info:
+    xpath: "//primitive[@id='rsc_SAPHana_HAN_HDB00']"
+  become: true
+  become_user: root
 """
 
 RETURN = r"""
+pacemaker_cib_version:
+    description: CIB version
+    type: dict
+    returned: I(since) is set
+    sample:
+        admin_epoch: 0
+        epoch: 53
+        num_updates: 4
+pacemaker_cib_changed:
+    description: CIB version is different from I(since)
+    type: bool
+    returned: I(since) is set
+pacemaker_cib_diff_xml:
+    description: Patch from CIB version I(since) to current CIB, as returned by C(crm_diff)
+    type: str
+    returned: I(since) is set, CIB changed and CIB version I(since) is cached, I(return_xml=true)
+pacemaker_cib_diff:
+    description: Patch from CIB version I(since) to current CIB, converted to dictionary
+    type: dict
+    returned: I(since) is set, CIB changed and CIB version I(since) is cached, I(return_dict=true)
+    sample:
+        diff:
+            attrib:
+                format: "2"
+            diff:
+                - version:
+                    source:
+                        admin_epoch: "0"
+                        epoch: "52"
+                        num_updates: "0"
+                    target:
+                        admin_epoch: "0"
+                        epoch: "53"
+                        num_updates: "0"
+                - change:
+                    operation: modify
+                    path: /cib/configuration/crm_config/cluster_property_set[@id='cib-bootstrap-options']/nvpair[@id='cib-bootstrap-options-maintenance-mode']
+                    change-list:
+                        - change-attr:
+                            name: value
+                            operation: set
+                            value: "true"
+pacemaker_cib_xml:
+    description: Pacemaker CIB XML, as returned by C(cibadmin --query)
+    type: str
+    returned: I(return_xml=true)
 pacemaker_cib:
     description: Pacemaker CIB (configuration information base)
     type: dict
-    returned: success
+    returned: I(return_dict=true)
     sample: |-
         {
             "cib": {
@@ -973,22 +1113,129 @@ pacemaker_cib:
         }
 """
 
+import os
+import tempfile
 import xml.etree.ElementTree as ET  # nosec B405
 
 from ansible.module_utils.basic import AnsibleModule
 from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import Element2Dict
 from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import get_pacemaker_cib_query_xml
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import get_pacemaker_cib_version
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import get_pacemaker_cib_diff_xml
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import pcs_cib_version
+
+
+def version_matches(since, version):
+    """Compare CIB version with known version, attributes not set in since are ignored.
+
+    since without any attribute set means that no version is known, it matches no version.
+    """
+    known = dict((attribute, value) for attribute, value in since.items() if value is not None)
+    return bool(known) and all(
+        value == version.get(attribute) for attribute, value in known.items()
+    )
+
+
+def cib_changes(module, since, pcs_cib_query_xml_string):
+    """Return patch XML from cached CIB of version since to queried CIB, cache queried CIB.
+
+    None is returned if there is no cached CIB of version since.
+    In check mode queried CIB is compared, but cache is not changed.
+    """
+    cache_dir = module.params["cache_dir"]
+    cache_filename = os.path.join(cache_dir, "cib.xml")
+    tmp_filename = None
+    try:
+        try:
+            if module.check_mode:
+                fd, tmp_filename = tempfile.mkstemp(suffix=".xml")
+            else:
+                os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+                fd, tmp_filename = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(pcs_cib_query_xml_string)
+        except OSError as e:
+            module.fail_json(msg="Failed to write CIB cache", exception=str(e), cache_dir=cache_dir)
+
+        diff_xml = None
+        try:
+            cached_version = pcs_cib_version(ET.parse(cache_filename).getroot())  # nosec B314
+        except (OSError, ET.ParseError):
+            cached_version = None
+        if cached_version is not None and version_matches(since, cached_version):
+            diff_xml = get_pacemaker_cib_diff_xml(module, cache_filename, tmp_filename) or ""
+
+        if not module.check_mode:
+            try:
+                os.replace(tmp_filename, cache_filename)
+            except OSError as e:
+                module.fail_json(msg="Failed to write CIB cache", exception=str(e), cache_dir=cache_dir)
+            tmp_filename = None
+        return diff_xml
+    finally:
+        if tmp_filename is not None and os.path.exists(tmp_filename):
+            os.unlink(tmp_filename)
 
 
 def main():
-    module = AnsibleModule(argument_spec={}, supports_check_mode=True)
-    pcs_cib_query_xml_string = get_pacemaker_cib_query_xml(module)
-    pacemaker_cib = Element2Dict(ET.fromstring(pcs_cib_query_xml_string))  # nosec B314
-    module.exit_json(
-        changed=False,
-        pacemaker_cib=pacemaker_cib,
-        pacemaker_cib_xml=pcs_cib_query_xml_string,
+    argument_spec = dict(
+        scope=dict(
+            type="str",
+            required=False,
+            choices=["configuration", "resources", "constraints", "crm_config", "nodes", "status"],
+        ),
+        xpath=dict(type="str", required=False),
+        since=dict(
+            type="dict",
+            required=False,
+            options=dict(
+                admin_epoch=dict(type="int", required=False),
+                epoch=dict(type="int", required=False),
+                num_updates=dict(type="int", required=False),
+            ),
+        ),
+        cache_dir=dict(type="path", required=False, default="/var/lib/sap_operations/pcs_cib_info"),
+        return_xml=dict(type="bool", required=False, default=True),
+        return_dict=dict(type="bool", required=False, default=True),
     )
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        mutually_exclusive=[("scope", "xpath"), ("since", "scope"), ("since", "xpath")],
+        supports_check_mode=True,
+    )
+    since = module.params["since"]
+    result = dict(changed=False)
+    pcs_cib_root = None
+
+    if since is not None:
+        version = get_pacemaker_cib_version(module)
+        if version_matches(since, version):
+            module.exit_json(pacemaker_cib_version=version, pacemaker_cib_changed=False, **result)
+        pcs_cib_query_xml_string = get_pacemaker_cib_query_xml(module)
+        pcs_cib_root = ET.fromstring(pcs_cib_query_xml_string)  # nosec B314
+        result["pacemaker_cib_version"] = pcs_cib_version(pcs_cib_root)
+        result["pacemaker_cib_changed"] = True
+        diff_xml = cib_changes(module, since, pcs_cib_query_xml_string)
+        if diff_xml is not None:
+            if module.params["return_dict"]:
+                result["pacemaker_cib_diff"] = (
+                    Element2Dict(ET.fromstring(diff_xml)) if diff_xml else {}  # nosec B314
+                )
+            if module.params["return_xml"]:
+                result["pacemaker_cib_diff_xml"] = diff_xml
+            module.exit_json(**result)
+    else:
+        pcs_cib_query_xml_string = get_pacemaker_cib_query_xml(
+            module, scope=module.params["scope"], xpath=module.params["xpath"]
+        )
+
+    if module.params["return_dict"]:
+        if pcs_cib_root is None and pcs_cib_query_xml_string:
+            pcs_cib_root = ET.fromstring(pcs_cib_query_xml_string)  # nosec B314
+        result["pacemaker_cib"] = Element2Dict(pcs_cib_root) if pcs_cib_root is not None else {}
+    if module.params["return_xml"]:
+        result["pacemaker_cib_xml"] = pcs_cib_query_xml_string or ""
+    module.exit_json(**result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,394 @@
+#!/usr/bin/python
+
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+# -*- coding: utf-8 -*-
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+
+DOCUMENTATION = r"""
+module: pcs_wait_for
+
+extends_documentation_fragment: sap.sap_operations.community
+
+author: Kirill Satarin (@kksat)
+
+short_description: Wait until pacemaker cluster resources and nodes are in expected state
+
+description:
+  - Wait until all I(predicates) are true at the same time, for example after promote, migration or cleanup
+  - Cluster status is read with C(crm_mon --one-shot --inactive --output-as=xml), all predicates are evaluated
+    in one module run, without starting C(pcs) or new module for every retry
+  - Polling interval grows by half while cluster does not change, up to I(max_poll_interval)
+  - Between polls CIB version is checked every I(change_check_interval) seconds with
+    C(cibadmin --query --xpath /cib --no-children), status is read again as soon as CIB changes
+    and polling interval is reset
+  - Time each predicate took to become true is returned
+  - Recommended to use C(root) user
+
+version_added: 2.13.0
+
+options:
+  predicates:
+    description: Conditions to wait for, all of them have to be true
+    type: list
+    elements: dict
+    required: true
+    suboptions:
+      type:
+        description:
+          - C(resource_role) - resource I(resource) (or any instance of clone) has role I(role),
+            on node I(node) if it is set
+          - C(no_failed_actions) - there are no failed resource actions, of resource I(resource) if it is set
+          - C(nodes_online) - all nodes are online, only node I(node) if it is set
+          - C(node_attribute) - node attribute I(name) of node I(node) has value I(value)
+        type: str
+        required: true
+        choices: [resource_role, no_failed_actions, nodes_online, node_attribute]
+      resource:
+        description: Resource ID, for clones ID of primitive or of clone instance
+        type: str
+        required: false
+      role:
+        description:
+          - Resource role, for example C(Started), C(Stopped), C(Promoted), C(Unpromoted)
+          - C(Promoted) and C(Master), C(Unpromoted) and C(Slave) are the same role
+        type: str
+        required: false
+      node:
+        description: Node name
+        type: str
+        required: false
+      name:
+        description: Node attribute name
+        type: str
+        required: false
+      value:
+        description: Node attribute value
+        type: str
+        required: false
+
+  timeout:
+    description: Maximum time to wait, in seconds
+    type: int
+    required: false
+    default: 300
+
+  poll_interval:
+    description: Initial interval between polls of cluster status, in seconds
+    type: float
+    required: false
+    default: 2
+
+  max_poll_interval:
+    description: Maximum interval between polls of cluster status, in seconds
+    type: float
+    required: false
+    default: 30
+
+  change_check_interval:
+    description: Interval of CIB version checks between polls, in seconds, C(0) disables the checks
+    type: float
+    required: false
+    default: 1
+
+  fail_on_timeout:
+    description: Fail if predicates are not true after I(timeout)
+    type: bool
+    required: false
+    default: true
+"""
+
+EXAMPLES = r"""
+- name: Wait until SAP HANA is promoted on node1 and secondary is in sync
+  sap.sap_operations.pcs_wait_for:
+    predicates:
+      - type: resource_role
+        resource: rsc_SAPHana_HAN_HDB00
+        role: Promoted
+        node: node1
+      - type: node_attribute
+        node: node2
+        name: hana_han_sync_state
+        value: SOK
+      - type: no_failed_actions
+    timeout: 900
+  become: true
+  become_user: root
+
+- name: Wait until all nodes are online after maintenance
+  sap.sap_operations.pcs_wait_for:
+    predicates:
+      - type: nodes_online
+  become: true
+  become_user: root
+"""
+
+RETURN = r"""
+pcs_wait_for:
+  description: Result of every predicate, in order of I(predicates)
+  type: list
+  elements: dict
+  returned: always
+  sample:
+    - type: resource_role
+      resource: rsc_SAPHana_HAN_HDB00
+      role: Promoted
+      node: node1
+      satisfied: true
+      seconds: 42.3
+    - type: no_failed_actions
+      satisfied: true
+      seconds: 0.0
+pcs_wait_for_summary:
+  description: Total wait time in seconds, number of status polls and CIB changes, and whether wait timed out
+  type: dict
+  returned: always
+  sample:
+    seconds: 42.3
+    polls: 9
+    cib_changes: 4
+    timed_out: false
+"""
+
+import time
+import xml.etree.ElementTree as ET  # nosec B405
+
+from ansible.module_utils.basic import AnsibleModule
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import get_pacemaker_cib_version
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import get_pacemaker_crm_mon_xml
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import PacemakerIndex
+
+PACEMAKER_ROLE_ALIASES = {
+    "Master": "Promoted",
+    "Slave": "Unpromoted",
+}
+
+PREDICATE_REQUIRED_OPTIONS = dict(
+    resource_role=("resource", "role"),
+    no_failed_actions=(),
+    nodes_online=(),
+    node_attribute=("node", "name", "value"),
+)
+
+
+def normalize_role(role):
+    return PACEMAKER_ROLE_ALIASES.get(role, role)
+
+
+def resource_instance_of(pcs_status_index, pcs_resource, resource_id):
+    """Check if status resource is resource_id, its instance (resource_id:N), or member of clone or group resource_id."""
+    element = pcs_resource
+    while element is not None and element.tag in ("resource", "group", "clone"):
+        if (element.get("id") or "").split(":")[0] == resource_id:
+            return True
+        element = pcs_status_index.parent(element)
+    return False
+
+
+def resource_role(pcs_status_index, predicate):
+    role = normalize_role(predicate["role"])
+    # Primitive resources only, without groups
+    for pcs_resource in pcs_status_index.resources("resource", path_indexes=range(4)):
+        if not resource_instance_of(pcs_status_index, pcs_resource, predicate["resource"]):
+            continue
+        if normalize_role(pcs_resource.get("role")) != role:
+            continue
+        if predicate["node"] is None or any(
+            node.get("name") == predicate["node"] for node in pcs_resource.findall("node")
+        ):
+            return True
+    return False
+
+
+# Operations with underscore in name, op_key of their failures has one more underscore
+PACEMAKER_MIGRATE_TASKS = ("migrate_to", "migrate_from")
+
+
+def failure_resource(failure):
+    """Return resource ID of failed action, from its resource attribute or parsed from op_key.
+
+    op_key is <resource>_<task>_<interval>, resource ID and task (migrate_to, migrate_from)
+    may contain underscores, suffix is taken from task and interval attributes of failure.
+    """
+    resource = failure.get("rsc") or failure.get("resource")
+    if resource is not None:
+        return resource
+    op_key = failure.get("op_key", "")
+    suffix = "_{0}_{1}".format(failure.get("task"), failure.get("interval"))
+    if failure.get("task") is not None and op_key.endswith(suffix):
+        return op_key[: -len(suffix)]
+    parts = op_key.rsplit("_", 3)
+    if len(parts) == 4 and "_".join(parts[1:3]) in PACEMAKER_MIGRATE_TASKS:
+        return parts[0]
+    return op_key.rsplit("_", 2)[0]
+
+
+def no_failed_actions(pcs_status_index, predicate):
+    failures = pcs_status_index.root.findall("failures/failure")
+    if predicate["resource"] is not None:
+        # Failures of clone instances have resource ID <resource>:N
+        failures = [
+            failure
+            for failure in failures
+            if predicate["resource"]
+            in (failure_resource(failure), failure_resource(failure).split(":")[0])
+        ]
+    return not failures
+
+
+def nodes_online(pcs_status_index, predicate):
+    nodes = pcs_status_index.root.findall("nodes/node")
+    if predicate["node"] is not None:
+        nodes = [node for node in nodes if node.get("name") == predicate["node"]]
+    return bool(nodes) and all(node.get("online") == "true" for node in nodes)
+
+
+def node_attribute(pcs_status_index, predicate):
+    attributes = pcs_status_index.node_attributes.get(predicate["node"], {})
+    return attributes.get(predicate["name"]) == predicate["value"]
+
+
+PREDICATES = dict(
+    resource_role=resource_role,
+    no_failed_actions=no_failed_actions,
+    nodes_online=nodes_online,
+    node_attribute=node_attribute,
+)
+
+
+def wait_for(module, predicates):
+    """Poll cluster status until all predicates are true or timeout, return predicate results and summary."""
+    timeout = module.params["timeout"]
+    poll_interval = module.params["poll_interval"]
+    max_poll_interval = module.params["max_poll_interval"]
+    change_check_interval = module.params["change_check_interval"]
+
+    start = time.monotonic()
+    interval = poll_interval
+    polls = 0
+    cib_changes = 0
+    satisfied_after = [None] * len(predicates)
+    while True:
+        polls += 1
+        # Version is read before status, so change between the two is not missed
+        version = get_pacemaker_cib_version(module) if change_check_interval else None
+        pcs_status_index = PacemakerIndex(
+            ET.fromstring(get_pacemaker_crm_mon_xml(module))  # nosec B314
+        )
+        now = time.monotonic()
+        results = [PREDICATES[predicate["type"]](pcs_status_index, predicate) for predicate in predicates]
+        for i, result in enumerate(results):
+            if result and satisfied_after[i] is None:
+                satisfied_after[i] = round(now - start, 1)
+            elif not result:
+                # Time until predicate became true and stayed true
+                satisfied_after[i] = None
+        if all(results) or now - start >= timeout:
+            break
+
+        # Sleep until next poll, but poll immediately if CIB changed in the meantime
+        deadline = min(now + interval, start + timeout)
+        changed = False
+        while time.monotonic() < deadline:
+            time.sleep(min(change_check_interval or interval, max(deadline - time.monotonic(), 0)))
+            if change_check_interval and get_pacemaker_cib_version(module) != version:
+                changed = True
+                break
+        if changed:
+            cib_changes += 1
+            interval = poll_interval
+        else:
+            interval = min(interval * 1.5, max_poll_interval)
+
+    return (
+        [
+            dict(
+                dict((k, v) for k, v in predicate.items() if v is not None),
+                satisfied=result,
+                seconds=satisfied_after[i],
+            )
+            for i, (predicate, result) in enumerate(zip(predicates, results))
+        ],
+        dict(
+            seconds=round(time.monotonic() - start, 1),
+            polls=polls,
+            cib_changes=cib_changes,
+            timed_out=not all(results),
+        ),
+    )
+
+
+def main():
+    argument_spec = dict(
+        predicates=dict(
+            type="list",
+            elements="dict",
+            required=True,
+            options=dict(
+                type=dict(type="str", required=True, choices=list(PREDICATES)),
+                resource=dict(type="str", required=False),
+                role=dict(type="str", required=False),
+                node=dict(type="str", required=False),
+                name=dict(type="str", required=False),
+                value=dict(type="str", required=False),
+            ),
+        ),
+        timeout=dict(type="int", required=False, default=300),
+        poll_interval=dict(type="float", required=False, default=2),
+        max_poll_interval=dict(type="float", required=False, default=30),
+        change_check_interval=dict(type="float", required=False, default=1),
+        fail_on_timeout=dict(type="bool", required=False, default=True),
+    )
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    predicates = module.params["predicates"]
+    for predicate in predicates:
+        missing = [
+            option for option in PREDICATE_REQUIRED_OPTIONS[predicate["type"]] if predicate[option] is None
+        ]
+        if missing:
+            module.fail_json(
+                msg="Predicate {0} requires options: {1}".format(predicate["type"], ", ".join(missing)),
+                predicate=predicate,
+            )
+
+    results, summary = wait_for(module, predicates)
+    if summary["timed_out"] and module.params["fail_on_timeout"]:
+        module.fail_json(
+            msg="Timeout waiting for predicates: {0}".format(
+                ", ".join(result["type"] for result in results if not result["satisfied"])
+            ),
+            pcs_wait_for=results,
+            pcs_wait_for_summary=summary,
+        )
+    module.exit_json(
+        changed=False,
+        pcs_wait_for=results,
+        pcs_wait_for_summary=summary,
+    )
+
+
+if __name__ == "__main__":
+    main()
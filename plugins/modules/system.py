@@ -99,6 +99,37 @@ options:
       - Wait timeout for the operation to complete before returning.
     type: int
     default: 600
+  drain:
+    description:
+      - Used only with I(state=stopped).
+      - If set to C(true), all ABAP instances of the system are taken out of logon groups
+        with sapcontrol function ABAPSetServerInactive before stop,
+        and module waits until active dialog and update work drops to I(drain_threshold).
+        Only then the system is stopped.
+      - ABAP instances are reached by hostname from GetSystemInstanceList with the same
+        I(username) and I(password). If I(hostname) is not set, instances on this host
+        are reached over local socket.
+      - Module fails if any ABAP instance cannot be taken out of logon groups,
+        or if active work does not drop in I(drain_timeout). ABAP instances are then returned
+        to logon groups with ABAPSetServerActive and the system is not stopped.
+      - Active work is monitored on every ABAP instance with sapcontrol functions
+        ABAPGetWPTable and GetQueueStatistic.
+    type: bool
+    default: false
+    version_added: 2.13.0
+  drain_threshold:
+    description:
+      - Number of busy (status Run or Hold) dialog/update work processes plus queued
+        dispatcher requests, summed over all ABAP instances, at which system is considered drained.
+    type: int
+    default: 0
+    version_added: 2.13.0
+  drain_timeout:
+    description:
+      - Maximum time in seconds to wait for active work to drain, system is not stopped if it is not drained.
+    type: int
+    default: 300
+    version_added: 2.13.0
 requirements:
   - python >= 3.6
   - suds >= 1.1.2
@@ -124,6 +155,16 @@ EXAMPLES = r"""
     hostname: "sap.system.example.com"
     instance_number: "0"
     state: stopped
+
+- name: Stop system after user work is drained, wait for work at most 15 minutes
+  sap.sap_operations.system:
+    username: "npladm"
+    password: "secret123!"
+    hostname: "sap.system.example.com"
+    instance_number: "0"
+    state: stopped
+    drain: true
+    drain_timeout: 900
 """
 
 RETURN = r"""
@@ -139,6 +180,19 @@ system:
     startPriority: 1,
     features: MESSAGESERVER|ENQUE,
     dispstatus: SAPControl-GREEN
+drain:
+  description: Drain report, instances are inactive only if system was drained
+  type: dict
+  returned: when I(drain=true) and system was running
+  sample:
+    drained: true
+    drain_time: 42.318
+    inactive_instances:
+      - hostname: vhcalnplci
+        instance_number: "00"
+    active_work:
+      work_processes: 0
+      queued: 0
 """
 
 
@@ -167,17 +221,23 @@ def ensure_started(client, name, check_mode):
     return True, client.get_system_instance_list()
 
 
-def ensure_stopped(client, name, check_mode):
+def ensure_stopped(client, name, check_mode, drain=None):
     client.wait_for_system_transition()
 
     if client.is_system_down():
-        return False, client.get_system_instance_list()
+        return False, client.get_system_instance_list(), None
 
     if check_mode:
-        return True, client.get_system_instance_list()
+        return True, client.get_system_instance_list(), None
+
+    drain_report = None
+    if drain is not None:
+        drain_report = client.drain(**drain)
+        if not drain_report["drained"]:
+            return False, client.get_system_instance_list(), drain_report
 
     client.stop_system(name)
-    return True, client.get_system_instance_list()
+    return True, client.get_system_instance_list(), drain_report
 
 
 def main():
@@ -216,6 +276,9 @@ def main():
         ),
         wait=dict(type="bool", default=True),
         wait_timeout=dict(type="int", default=600),
+        drain=dict(type="bool", default=False),
+        drain_threshold=dict(type="int", default=0),
+        drain_timeout=dict(type="int", default=300),
     )
 
     module = AnsibleModule(
@@ -256,9 +319,26 @@ def main():
             client, name, module.check_mode
         )
     else:
-        result["changed"], result["system"] = ensure_stopped(
-            client, name, module.check_mode
-        )
+        drain = None
+        if module.params.get("drain"):
+            drain = dict(
+                threshold=module.params.get("drain_threshold"),
+                timeout=module.params.get("drain_timeout"),
+            )
+        try:
+            result["changed"], result["system"], drain_report = ensure_stopped(
+                client, name, module.check_mode, drain
+            )
+        except Exception as err:
+            module.fail_json(msg=(str(err)))
+        if drain_report is not None:
+            result["drain"] = drain_report
+            if not drain_report["drained"]:
+                module.fail_json(
+                    msg="Active work did not drop to drain_threshold in drain_timeout seconds, "
+                    "ABAP instances were set active again and system was not stopped",
+                    **result
+                )
 
     module.exit_json(**result)
 
@@ -0,0 +1,274 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Benchmark ABAP modules and clients of the collection against stand-in backends.
+
+Measures wall time, calls per second, conversion cost and peak memory of
+abap_system_info, abap_transports_info, result conversion and the HTTP(S) SOAP client.
+Requires ansible-core (and suds for the HTTP benchmark), pyrfc and SAP system are not needed.
+
+python tests/performance/abap/benchmark_abap.py --rows 1000 --latency 0.005
+"""
+
+import argparse
+import contextlib
+import copy
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_ROOT = os.path.abspath(os.path.join(HERE, "..", "..", ".."))
+
+
+def setup_collection_path():
+    """Make collection importable as ansible_collections.sap.sap_operations, stand-ins as top-level modules."""
+    root = tempfile.mkdtemp(prefix="sap_operations_benchmark_")
+    namespace = os.path.join(root, "ansible_collections", "sap")
+    os.makedirs(namespace)
+    os.symlink(COLLECTION_ROOT, os.path.join(namespace, "sap_operations"))
+    sys.path.insert(0, root)
+    sys.path.insert(0, HERE)
+    import fake_pyrfc
+
+    # module_utils/abap.py imports Connection from pyrfc, stand-in is imported instead
+    sys.modules["pyrfc"] = fake_pyrfc
+    return root
+
+
+def run_module(name, args):
+    """Run module main() in process, return (result, seconds)."""
+    from ansible.module_utils import basic
+    from ansible.module_utils.common.text.converters import to_bytes
+
+    module = importlib.import_module(
+        "ansible_collections.sap.sap_operations.plugins.modules.{0}".format(name)
+    )
+    basic._ANSIBLE_ARGS = to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args)))
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        basic._ANSIBLE_PROFILE = "legacy"
+    stdout = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(stdout):
+        try:
+            module.main()
+        except SystemExit:
+            pass
+    seconds = time.perf_counter() - start
+    return json.loads(stdout.getvalue()), seconds
+
+
+def measure(label, iterations, func):
+    """Run func iterations times, return dictionary with timings, stand-in calls and peak memory."""
+    import fake_pyrfc
+
+    fake_pyrfc.reset_statistics()
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _i in range(iterations):
+        func()
+    seconds = time.perf_counter() - start
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    calls = fake_pyrfc.STATISTICS["calls"]
+    return dict(
+        benchmark=label,
+        iterations=iterations,
+        seconds_per_iteration=round(seconds / iterations, 6),
+        rfc_calls=calls,
+        calls_per_second=round(calls / seconds, 1) if seconds else None,
+        logons=fake_pyrfc.STATISTICS["logons"],
+        peak_memory_kb=round(peak / 1024, 1),
+    )
+
+
+RFC_CONNECTION = dict(
+    ashost="vhcalnplci", sysnr="00", client="001", user="DDIC", passwd="secret"
+)
+
+
+def benchmark_system_info(iterations):
+    results = []
+    for connections in (1, 4):
+        for result_format in ("dict", "columnar"):
+            args = dict(
+                rfc_connection=RFC_CONNECTION,
+                parallel_connections=connections,
+                result_format=result_format,
+            )
+            results.append(
+                measure(
+                    "abap_system_info connections={0} format={1}".format(
+                        connections, result_format
+                    ),
+                    iterations,
+                    lambda args=args: run_module("abap_system_info", args),
+                )
+            )
+    return results
+
+
+def benchmark_transports_info(iterations):
+    snapshot_dir = tempfile.mkdtemp(prefix="sap_operations_snapshots_")
+    results = [
+        measure(
+            "abap_transports_info full",
+            iterations,
+            lambda: run_module("abap_transports_info", dict(rfc_connection=RFC_CONNECTION)),
+        )
+    ]
+    args = dict(
+        rfc_connection=RFC_CONNECTION, incremental=True, snapshot_dir=snapshot_dir
+    )
+    run_module("abap_transports_info", args)
+    results.append(
+        measure(
+            "abap_transports_info incremental",
+            iterations,
+            lambda: run_module("abap_transports_info", args),
+        )
+    )
+    return results
+
+
+def benchmark_conversion(iterations, rows):
+    import canned
+    from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+        convert2ansible,
+    )
+    from ansible_collections.sap.sap_operations.plugins.module_utils.abap_metadata import (
+        result_types,
+    )
+
+    result = canned.call("CTS_WBO_API_READ_REQUESTS_RFC", {}, rows)
+    types = result_types(canned.description("CTS_WBO_API_READ_REQUESTS_RFC"))
+    return [
+        measure(
+            "convert2ansible rows={0}".format(rows),
+            iterations,
+            lambda: convert2ansible(copy.deepcopy(result)),
+        ),
+        measure(
+            "convert2ansible typed rows={0}".format(rows),
+            iterations,
+            lambda: convert2ansible(copy.deepcopy(result), types),
+        ),
+    ]
+
+
+def benchmark_http(iterations):
+    from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+        HAS_SUDS_LIBRARY,
+        SAPHTTPSOAPClient,
+    )
+
+    if not HAS_SUDS_LIBRARY:
+        print("suds is not installed, HTTP benchmark is skipped", file=sys.stderr)
+        return []
+
+    import fake_soap
+
+    server = fake_soap.start()
+    results = []
+    try:
+        for cache_dir in (None, tempfile.mkdtemp(prefix="sap_operations_wsdl_")):
+
+            def run(cache_dir=cache_dir):
+                client = SAPHTTPSOAPClient(
+                    hostname="127.0.0.1",
+                    username="DDIC",
+                    password="secret",
+                    language="EN",
+                    client="001",
+                    port=server.server_port,
+                    security=False,
+                    wsdl_cache_dir=cache_dir,
+                )
+                try:
+                    for func_name in ("RFC_SYSTEM_INFO", "TH_SERVER_LIST", "SMLG_GET_SETUP"):
+                        client(func_name)
+                finally:
+                    client.close()
+
+            fake_soap.STATISTICS.update(wsdl=0, calls=0)
+            result = measure(
+                "SAPHTTPSOAPClient wsdl_cache={0}".format(bool(cache_dir)), iterations, run
+            )
+            result.update(
+                soap_calls=fake_soap.STATISTICS["calls"],
+                wsdl_downloads=fake_soap.STATISTICS["wsdl"],
+                calls_per_second=round(
+                    fake_soap.STATISTICS["calls"]
+                    / (result["seconds_per_iteration"] * iterations),
+                    1,
+                ),
+            )
+            results.append(result)
+    finally:
+        server.shutdown()
+    return results
+
+
+BENCHMARKS = ["system_info", "transports_info", "conversion", "http"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100, help="rows of table parameters")
+    parser.add_argument("--latency", type=float, default=0.0, help="round-trip latency in seconds")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--benchmark", action="append", choices=BENCHMARKS)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    os.environ["SAP_OPERATIONS_STANDIN_ROWS"] = str(args.rows)
+    os.environ["SAP_OPERATIONS_STANDIN_LATENCY"] = str(args.latency)
+    setup_collection_path()
+
+    results = []
+    for benchmark in args.benchmark or BENCHMARKS:
+        if benchmark == "system_info":
+            results += benchmark_system_info(args.iterations)
+        elif benchmark == "transports_info":
+            results += benchmark_transports_info(args.iterations)
+        elif benchmark == "conversion":
+            results += benchmark_conversion(args.iterations, args.rows)
+        elif benchmark == "http":
+            results += benchmark_http(args.iterations)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for result in results:
+        print(
+            "{benchmark:50} {seconds_per_iteration:>10.4f}s {calls_per_second!s:>10} calls/s "
+            "{peak_memory_kb:>10.1f} KiB".format(**result)
+        )
+
+
+if __name__ == "__main__":
+    main()
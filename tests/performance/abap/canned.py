@@ -0,0 +1,555 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Canned responses of function modules used by the collection, for stand-in SAP ABAP backends.
+
+Responses are generated, table parameters have configurable number of rows.
+Function descriptions are derived from responses, so that parameter validation
+and typed conversion of the collection work with the stand-ins as with real system.
+"""
+
+SID = "NPL"
+SERVERS = ["vhcalnplci_NPL_00", "vhcalnplap1_NPL_01", "vhcalnplap2_NPL_02"]
+
+
+def _request(index):
+    return "{0}K9{1:05d}".format(SID, index)
+
+
+def _transport_header(index, status="D"):
+    return dict(
+        TRKORR=_request(index),
+        TRFUNCTION="K" if index % 2 else "W",
+        TRSTATUS=status,
+        TARSYSTEM="",
+        AS4USER="DDIC",
+        AS4DATE="20240101",
+        AS4TIME="120000",
+        AS4TEXT="Transport request {0}".format(index),
+        CLIENT="001",
+        STRKORR="",
+    )
+
+
+def ocs_get_installed_swproducts(kwargs, rows):
+    return dict(
+        ET_SWPRODUCTS=[
+            dict(
+                ID="73554900100900000{0:03d}".format(i % 1000),
+                NAME="PRODUCT_{0}".format(i),
+                VERSION="7.51",
+                VENDOR="sap.com",
+                DESCRIPTION="Software product {0}".format(i),
+                PPMS_NUMBER="0100000{0:04d}".format(i % 10000),
+            )
+            for i in range(rows)
+        ]
+    )
+
+
+def ocs_get_sfw_components(kwargs, rows):
+    return dict(
+        ET_SFW_COMPS=[
+            dict(COMPONENT="SFW_COMP_{0}".format(i), RELEASE="751", EXTRELEASE="0002")
+            for i in range(rows)
+        ],
+        ET_ACTIVE_BFUNCS=[],
+        ET_BSET_COMP_MAPPING=[],
+    )
+
+
+def delivery_get_installed_comps(kwargs, rows):
+    return dict(
+        TT_COMPTAB=[
+            dict(
+                COMPONENT="COMP_{0}".format(i),
+                COMP_TYPE="S",
+                DESC_TEXT="Software component {0}".format(i),
+                EXTRELEASE="0002",
+                LANGU="E",
+                RELEASE="751",
+            )
+            for i in range(rows)
+        ]
+    )
+
+
+def th_get_virt_host_data(kwargs, rows):
+    return dict(HOSTNAME="vhcalnplci.dummy.nodomain", PORT="8000")
+
+
+def th_server_list(kwargs, rows):
+    return dict(
+        LIST=[
+            dict(NAME=name, HOST="10.0.0.{0}".format(i + 10), SERV="sapdp{0}".format(name[-2:]), STATE=1)
+            for i, name in enumerate(SERVERS)
+        ]
+    )
+
+
+def smlg_get_defined_groups(kwargs, rows):
+    return dict(GROUPS=[dict(GROUPNAME="PUBLIC")])
+
+
+def smlg_get_defined_servers(kwargs, rows):
+    return dict(INSTANCES=[dict(APPLSERVER=name) for name in SERVERS])
+
+
+def smlg_get_setup(kwargs, rows):
+    return dict(
+        SETUP=[
+            dict(APPLSERVER=name, CLASSNAME="PUBLIC", GROUPTYPE="", RESP_TIME="000000", USERS="0000")
+            for name in SERVERS
+        ],
+        ERFC_SETUP=[],
+    )
+
+
+def sldag_get_computer_info(kwargs, rows):
+    return dict(
+        COMPUTER_INFO=dict(
+            LOCALHOST="vhcalnplci",
+            LOCALHOSTFULL="vhcalnplci.dummy.nodomain",
+            OPSYS="Linux",
+            PHYS_RAM="32161",
+        ),
+        IP_ADDRESSES=[dict(VALUE="127.0.0.1"), dict(VALUE="10.0.0.234")],
+    )
+
+
+def rfc_system_info(kwargs, rows):
+    return dict(RFCSI_EXPORT=dict(RFCSYSID=SID, RFCHOST="vhcalnplci", RFCDBSYS="HDB"))
+
+
+def rfc_ping(kwargs, rows):
+    return dict()
+
+
+def stfc_connection(kwargs, rows):
+    return dict(ECHOTEXT=kwargs.get("REQUTEXT", ""), RESPTEXT="SAP R/3 Rel. 751")
+
+
+def cts_wbo_api_read_requests_rfc(kwargs, rows):
+    return dict(
+        REQUESTS=[
+            dict(
+                REQ_HEADER=_transport_header(i),
+                REQ_ATTRS=[],
+                TASK_HEADERS=[_transport_header(i + rows)],
+            )
+            for i in range(rows)
+        ]
+    )
+
+
+def cts_api_read_change_request(kwargs, rows):
+    return dict(
+        ES_REQ_HEADER=_transport_header(1),
+        ET_OBJECTS=[
+            dict(PGMID="R3TR", OBJECT="PROG", OBJ_NAME="Z_PROGRAM_{0}".format(i))
+            for i in range(rows)
+        ],
+    )
+
+
+# Requests imported with TMS_MGR_IMPORT_TR_REQUEST, (TRKORR, TARCLI) -> (MAXRC, TRTIME)
+IMPORTED = {}
+
+
+def tms_mgr_read_transport_queue(kwargs, rows):
+    queue = dict(((_request(i), "000"), ("0000", "20240102100000")) for i in range(rows))
+    queue.update(IMPORTED)
+    return dict(
+        ET_REQUESTS=[
+            dict(TRKORR=trkorr, TARCLI=tarcli, MAXRC=maxrc, TRTIME=trtime)
+            for (trkorr, tarcli), (maxrc, trtime) in queue.items()
+        ]
+    )
+
+
+def tms_mgr_import_tr_request(kwargs, rows):
+    requests = [line["TRKORR"] for line in kwargs.get("IT_REQUESTS") or []]
+    if kwargs.get("IV_REQUEST") != "SOME":
+        requests = [kwargs.get("IV_REQUEST")]
+    trtime = "{0:014d}".format(20240102100000 + len(IMPORTED) + 1)
+    for request in requests:
+        IMPORTED[(request, kwargs.get("IV_CLIENT"))] = ("0000", trtime)
+    return dict(EV_TP_RET_CODE="0000", ES_EXCEPTION=dict(MSGTY="", TEXT=""))
+
+
+def bapi_user_getlist(kwargs, rows):
+    """Users USER00000..., number of users is rows, USERNAME exclusion ranges (E LE) are applied."""
+    excluded = [
+        line["LOW"]
+        for line in kwargs.get("SELECTION_RANGE") or []
+        if line.get("PARAMETER") == "USERNAME" and line.get("SIGN") == "E" and line.get("OPTION") == "LE"
+    ]
+    users = [
+        dict(USERNAME="USER{0:05d}".format(i), FIRSTNAME="First", LASTNAME="Last {0}".format(i), FULLNAME="First Last {0}".format(i))
+        for i in range(rows)
+    ]
+    users = [user for user in users if not any(user["USERNAME"] <= low for low in excluded)]
+    max_rows = int(kwargs.get("MAX_ROWS") or 0)
+    if max_rows:
+        users = users[:max_rows]
+    return dict(USERLIST=users, ROWS=len(users), RETURN=[])
+
+
+def bapi_user_get_detail(kwargs, rows):
+    return dict(
+        LOGONDATA=dict(USTYP="A", CLASS="SUPER", GLTGV="00000000", GLTGB="00000000", LTIME="20240101"),
+        ISLOCKED=dict(WRNG_LOGON="U", LOCAL_LOCK="U", GLOB_LOCK="U", NO_USER_PW="U"),
+        DEFAULTS=dict(SPLD="LOCL", DATFM="1", DCPFM=""),
+        ADDRESS=dict(FIRSTNAME="First", LASTNAME="Last", E_MAIL="user@example.com"),
+        ACTIVITYGROUPS=[
+            dict(AGR_NAME="Z_ROLE_{0}".format(i), FROM_DAT="20240101", TO_DAT="99991231")
+            for i in range(10)
+        ],
+        PROFILES=[dict(BAPIPROF="Z_PROFILE", BAPIPTEXT="Profile", BAPITYPE="G")],
+        PARAMETER=[],
+        GROUPS=[dict(USERGROUP="SUPER")],
+        RETURN=[],
+    )
+
+
+XBP_STARTED = {}
+
+
+def _job(index, status):
+    return dict(
+        JOBNAME="Z_JOB_{0}".format(index),
+        JOBCOUNT="{0:08d}".format(index),
+        STATUS=status,
+        SDLUNAME="DDIC",
+        SDLSTRTDT="20240101",
+        SDLSTRTTM="100000",
+        STRTDATE="20240101" if status in ("R", "F", "A") else "00000000",
+        STRTTIME="100004" if status in ("R", "F", "A") else "000000",
+        ENDDATE="20240101" if status in ("F", "A") else "00000000",
+        ENDTIME="100130" if status in ("F", "A") else "000000",
+    )
+
+
+def bapi_xmi_logon(kwargs, rows):
+    return dict(SESSIONID="ANSIBLE{0}".format(len(XBP_STARTED)), RETURN=dict(TYPE="S", MESSAGE=""))
+
+
+def bapi_xmi_logoff(kwargs, rows):
+    return dict(RETURN=dict(TYPE="S", MESSAGE=""))
+
+
+def bapi_xbp_job_select(kwargs, rows):
+    """Jobs Z_JOB_n, every third job running, others finished, selected by JOBCOUNT if given."""
+    select_param = kwargs.get("JOB_SELECT_PARAM") or {}
+    jobs = [_job(i, "R" if i % 3 == 0 else "F") for i in range(rows)]
+    if select_param.get("JOBCOUNT"):
+        jobs = [_job(int(select_param["JOBCOUNT"]), job_status(select_param["JOBCOUNT"]))]
+    return dict(SELECTED_JOBS=jobs, RETURN=dict(TYPE="S", MESSAGE=""))
+
+
+def job_status(jobcount):
+    """Running jobs finish on the second status request."""
+    if int(jobcount) % 3:
+        return "F"
+    XBP_STARTED[jobcount] = XBP_STARTED.get(jobcount, 0) + 1
+    return "F" if XBP_STARTED[jobcount] > 1 else "R"
+
+
+def bapi_xbp_job_status_get(kwargs, rows):
+    return dict(STATUS=job_status(kwargs.get("JOBCOUNT") or "1"), RETURN=dict(TYPE="S", MESSAGE=""))
+
+
+WORKLOAD_TASK_TYPES = [b"\x01", b"\x02", b"\x04", b"\xfe", b"\x65"]
+
+
+def swnc_collector_get_aggregates(kwargs, rows):
+    """Workload aggregates, task types with raw codes, rows transactions and rows user/transaction lines."""
+    tasktype = [
+        dict(TASKTYPE=code, COUNT=1000 * (i + 1), RESPTI=600000 * (i + 1), CPUTI=120000 * (i + 1),
+             QUEUETI=2000, READDIRTI=50000, READSEQTI=150000, CHNGTI=40000)
+        for i, code in enumerate(WORKLOAD_TASK_TYPES)
+    ]
+    tcdet = [
+        dict(ENTRY_ID="Z_TCODE_{0}".format(i), TASKTYPE=b"\x01", COUNT=10 + i, RESPTI=1000 * (10 + i) * (i % 7 + 1),
+             CPUTI=200 * (10 + i))
+        for i in range(rows)
+    ]
+    usertcode = [
+        dict(ACCOUNT="USER{0:05d}".format(i), ENTRY_ID="Z_TCODE_{0}".format(i % 10), TASKTYPE=b"\x01",
+             COUNT=5, RESPTI=3000)
+        for i in range(rows)
+    ]
+    return dict(TASKTYPE=tasktype, TCDET=tcdet, USERTCODE=usertcode, USERWORKLOAD=[], RFCSRVR=[], RFCCLNT=[],
+                HITLIST_RESPTIME=[])
+
+
+def stfc_performance(kwargs, rows):
+    return dict(
+        EXITCODE="0",
+        ETAB0332=[dict(ETAB0332="X" * 332) for _i in range(int(kwargs.get("LGET0332") or 0))],
+        ETAB1000=[dict(ETAB1000="X" * 1000) for _i in range(int(kwargs.get("LGET1000") or 0))],
+        ITAB0332=[],
+        ITAB1000=[],
+    )
+
+
+READ_TABLE_FIELDS = dict(
+    E070=[
+        ("TRKORR", 20),
+        ("TRFUNCTION", 1),
+        ("TRSTATUS", 1),
+        ("TARSYSTEM", 10),
+        ("AS4USER", 12),
+        ("AS4DATE", 8),
+        ("AS4TIME", 6),
+        ("STRKORR", 20),
+    ],
+    E07T=[("TRKORR", 20), ("LANGU", 1), ("AS4TEXT", 60)],
+    E070C=[("TRKORR", 20), ("CLIENT", 3)],
+    E070A=[("TRKORR", 20), ("POS", 6), ("ATTRIBUTE", 20), ("REFERENCE", 32)],
+    DD03L=[("FIELDNAME", 30), ("POSITION", 4)],
+)
+
+READ_TABLE_KEYS = dict(
+    E070=["TRKORR"],
+    E07T=["TRKORR", "LANGU"],
+    E070C=["TRKORR"],
+    E070A=["TRKORR", "POS"],
+)
+
+
+def _read_table_row(table, index):
+    header = _transport_header(index)
+    return dict(
+        header,
+        LANGU="E",
+        POS="{0:06d}".format(index),
+        ATTRIBUTE="SAP_CTS_PROJECT",
+        REFERENCE="PROJECT_{0}".format(index),
+    )
+
+
+def _key_fields(kwargs):
+    """Key fields of table named in DD03L WHERE condition TABNAME = '...'."""
+    where = " ".join(option["TEXT"] for option in kwargs.get("OPTIONS") or [])
+    table = where.split("TABNAME = '", 1)[-1].split("'", 1)[0]
+    return READ_TABLE_KEYS.get(table, ["FIELD0"])
+
+
+def rfc_read_table(kwargs, rows):
+    """RFC_READ_TABLE with NO_DATA, FIELDS, ROWSKIPS and ROWCOUNT, WHERE conditions are ignored.
+
+    DD03L returns key fields of the table named in WHERE condition.
+    """
+    table_fields = READ_TABLE_FIELDS.get(
+        kwargs.get("QUERY_TABLE"),
+        [("FIELD{0}".format(i), 10) for i in range(10)],
+    )
+    requested = [field["FIELDNAME"] for field in kwargs.get("FIELDS") or []]
+    if requested:
+        table_fields = [field for field in table_fields if field[0] in requested]
+    fields = []
+    offset = 0
+    for name, length in table_fields:
+        fields.append(
+            dict(FIELDNAME=name, OFFSET="{0:06d}".format(offset), LENGTH="{0:06d}".format(length), TYPE="C", FIELDTEXT=name)
+        )
+        offset += length
+    if kwargs.get("NO_DATA") == "X":
+        return dict(FIELDS=fields, DATA=[], OPTIONS=kwargs.get("OPTIONS") or [])
+    skip = int(kwargs.get("ROWSKIPS") or 0)
+    count = int(kwargs.get("ROWCOUNT") or 0) or rows
+    data = []
+    if kwargs.get("QUERY_TABLE") == "DD03L":
+        keys = [
+            dict(FIELDNAME=name, POSITION="{0:04d}".format(position))
+            for position, name in enumerate(_key_fields(kwargs), start=1)
+        ]
+        for row in keys[skip:skip + count]:
+            data.append(
+                dict(WA="".join(str(row.get(name, ""))[:length].ljust(length) for name, length in table_fields))
+            )
+        return dict(FIELDS=fields, DATA=data, OPTIONS=kwargs.get("OPTIONS") or [])
+    for index in range(skip, min(skip + count, rows)):
+        row = _read_table_row(kwargs.get("QUERY_TABLE"), index)
+        data.append(
+            dict(WA="".join(str(row.get(name, ""))[:length].ljust(length) for name, length in table_fields))
+        )
+    return dict(FIELDS=fields, DATA=data, OPTIONS=kwargs.get("OPTIONS") or [])
+
+
+"""
+FUNCTIONS - function module name: (importing parameters, tables parameters passed by caller, response).
+Response is function (kwargs, rows) returning result of the call.
+"""
+FUNCTIONS = {
+    "OCS_GET_INSTALLED_SWPRODUCTS": ((), (), ocs_get_installed_swproducts),
+    "OCS_GET_SFW_COMPONENTS": ((), (), ocs_get_sfw_components),
+    "DELIVERY_GET_INSTALLED_COMPS": ((), (), delivery_get_installed_comps),
+    "TH_GET_VIRT_HOST_DATA": ((), (), th_get_virt_host_data),
+    "TH_SERVER_LIST": (("SERVICES", "ACTIVE_SERVER"), (), th_server_list),
+    "SMLG_GET_DEFINED_GROUPS": (("GROUPTYPE",), (), smlg_get_defined_groups),
+    "SMLG_GET_DEFINED_SERVERS": (("GROUPTYPE", "GROUPNAME"), (), smlg_get_defined_servers),
+    "SMLG_GET_SETUP": (("GROUPTYPE",), (), smlg_get_setup),
+    "SLDAG_GET_COMPUTER_INFO": ((), (), sldag_get_computer_info),
+    "RFC_SYSTEM_INFO": ((), (), rfc_system_info),
+    "RFC_PING": ((), (), rfc_ping),
+    "STFC_CONNECTION": (("REQUTEXT",), (), stfc_connection),
+    "CTS_WBO_API_READ_REQUESTS_RFC": (
+        (
+            "TRFUNCTION",
+            "TRSTATUS",
+            "TARSYSTEM",
+            "AS4USER",
+            "CLIENT",
+            "READ_ATTRS",
+            "READ_TASK_HEADERS",
+        ),
+        ("REQ_ATTR_KEYS",),
+        cts_wbo_api_read_requests_rfc,
+    ),
+    "CTS_API_READ_CHANGE_REQUEST": (("REQUEST",), (), cts_api_read_change_request),
+    "TMS_MGR_READ_TRANSPORT_QUEUE": (
+        ("IV_SYSTEM", "IV_COLLECT_DATA", "IV_READ_SHADOW", "IV_MONITOR", "IV_VERBOSE"),
+        (),
+        tms_mgr_read_transport_queue,
+    ),
+    "TMS_MGR_IMPORT_TR_REQUEST": (
+        (
+            "IV_SYSTEM",
+            "IV_REQUEST",
+            "IV_CLIENT",
+            "IV_OFFLINE",
+            "IV_MONITOR",
+            "IV_IGNORE_ORIGINALITY",
+            "IV_IGNORE_REPAIRS",
+            "IV_IGNORE_TRANSTYPE",
+            "IV_IGNORE_TABLETYPE",
+            "IV_IGNORE_PREDECESSOR",
+            "IV_IGNORE_CVERS",
+            "IV_OVERTAKE",
+            "IV_IMPORT_AGAIN",
+        ),
+        ("IT_REQUESTS",),
+        tms_mgr_import_tr_request,
+    ),
+    "BAPI_USER_GETLIST": (("MAX_ROWS", "WITH_USERNAME"), ("SELECTION_RANGE",), bapi_user_getlist),
+    "BAPI_USER_GET_DETAIL": (("USERNAME", "CACHE_RESULTS"), (), bapi_user_get_detail),
+    "BAPI_XMI_LOGON": (("EXTCOMPANY", "EXTPRODUCT", "INTERFACE", "VERSION"), (), bapi_xmi_logon),
+    "BAPI_XMI_LOGOFF": (("INTERFACE",), (), bapi_xmi_logoff),
+    "BAPI_XBP_JOB_SELECT": (
+        ("JOB_SELECT_PARAM", "EXTERNAL_USER_NAME", "SYSTEMID", "SELECTION"),
+        (),
+        bapi_xbp_job_select,
+    ),
+    "BAPI_XBP_JOB_STATUS_GET": (
+        ("JOBNAME", "JOBCOUNT", "EXTERNAL_USER_NAME"),
+        (),
+        bapi_xbp_job_status_get,
+    ),
+    "SWNC_COLLECTOR_GET_AGGREGATES": (
+        ("COMPONENT", "ASSIGNDSYS", "PERIODTYPE", "PERIODSTRT", "SUMMARY_ONLY", "FACTOR"),
+        (),
+        swnc_collector_get_aggregates,
+    ),
+    "STFC_PERFORMANCE": (
+        ("CHECKTAB", "LGET0332", "LGET1000", "LGIT0332", "LGIT1000"),
+        ("ITAB0332", "ITAB1000"),
+        stfc_performance,
+    ),
+    "RFC_READ_TABLE": (
+        ("QUERY_TABLE", "DELIMITER", "NO_DATA", "ROWSKIPS", "ROWCOUNT"),
+        ("OPTIONS", "FIELDS", "DATA"),
+        rfc_read_table,
+    ),
+}
+
+
+# Arguments used to generate sample response of one row, to derive function description
+SAMPLE_KWARGS = dict(QUERY_TABLE="E070", FIELDS=[], ROWCOUNT=1, LGET0332=1, LGET1000=1)
+
+
+def call(func_name, kwargs, rows):
+    """Return canned result of function call, KeyError for unknown functions."""
+    return FUNCTIONS[func_name][2](kwargs, rows)
+
+
+def _field_type(value):
+    if isinstance(value, bytes):
+        return "RFCTYPE_BYTE"
+    if isinstance(value, list):
+        return "RFCTYPE_TABLE"
+    if isinstance(value, dict):
+        return "RFCTYPE_STRUCTURE"
+    if isinstance(value, int):
+        return "RFCTYPE_INT"
+    return "RFCTYPE_CHAR"
+
+
+def _fields(value):
+    if isinstance(value, list):
+        value = value[0] if value else {}
+    if not isinstance(value, dict):
+        return None
+    return [
+        dict(
+            name=name,
+            field_type=_field_type(field_value),
+            nuc_length=len(str(field_value)),
+            uc_length=2 * len(str(field_value)),
+            decimals=0,
+            fields=_fields(field_value),
+        )
+        for name, field_value in value.items()
+    ]
+
+
+def description(func_name):
+    """Return function description in format of module_utils.abap_metadata.function_description2dict."""
+    imports, tables, response = FUNCTIONS[func_name]
+    parameters = [
+        dict(name=name, parameter_type="RFCTYPE_CHAR", direction="RFC_IMPORT", optional=True, fields=None)
+        for name in imports
+    ]
+    parameters += [
+        dict(name=name, parameter_type="RFCTYPE_TABLE", direction="RFC_TABLES", optional=True, fields=[])
+        for name in tables
+    ]
+    sample = response(SAMPLE_KWARGS, 1)
+    for name, value in sample.items():
+        if name in tables:
+            continue
+        parameters.append(
+            dict(
+                name=name,
+                parameter_type=_field_type(value),
+                direction="RFC_TABLES" if isinstance(value, list) else "RFC_EXPORT",
+                optional=True,
+                fields=_fields(value),
+            )
+        )
+    for parameter in parameters:
+        parameter.update(
+            nuc_length=0, uc_length=0, decimals=0, default_value="", parameter_text=parameter["name"],
+            type_name=None,
+        )
+    return dict(name=func_name, parameters=parameters)
@@ -0,0 +1,157 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Stand-in for pyrfc Connection, returns canned responses with configurable size and latency.
+
+Benchmark harness registers this module as pyrfc in sys.modules before module_utils/abap.py is imported,
+so that Connection of module_utils/abap.py is the stand-in.
+
+Configuration (environment variables):
+SAP_OPERATIONS_STANDIN_ROWS - number of rows of table parameters, default 100
+SAP_OPERATIONS_STANDIN_LATENCY - latency of every call (round-trip) in seconds, default 0
+SAP_OPERATIONS_STANDIN_LOGON_LATENCY - latency of logon in seconds, default 0
+"""
+
+import itertools
+import os
+import threading
+import time
+import uuid
+
+import canned
+
+STATISTICS = dict(logons=0, calls=0, descriptions=0)
+_STATISTICS_LOCK = threading.Lock()
+
+
+def _count(key):
+    with _STATISTICS_LOCK:
+        STATISTICS[key] += 1
+
+
+def reset_statistics():
+    with _STATISTICS_LOCK:
+        for key in STATISTICS:
+            STATISTICS[key] = 0
+
+
+def _setting(name, default, convert=float):
+    return convert(os.environ.get("SAP_OPERATIONS_STANDIN_{0}".format(name), default))
+
+
+class ABAPApplicationError(Exception):
+    pass
+
+
+class TypeDescription(object):
+    def __init__(self, name, fields):  # noqa: D107
+        self.name = name
+        self.fields = [
+            dict(
+                field,
+                type_description=(
+                    TypeDescription(field["name"], field["fields"]) if field["fields"] else None
+                ),
+            )
+            for field in fields
+        ]
+
+
+class FunctionDescription(object):
+    """Same attributes as pyrfc FunctionDescription, built from canned function description."""
+
+    def __init__(self, description):  # noqa: D107
+        self.name = description["name"]
+        self.parameters = [
+            dict(
+                parameter,
+                type_description=(
+                    TypeDescription(parameter["name"], parameter["fields"])
+                    if parameter["fields"]
+                    else None
+                ),
+            )
+            for parameter in description["parameters"]
+        ]
+
+
+class Connection(object):
+    """pyrfc Connection stand-in, supports call, get_function_description and units."""
+
+    _unit_counter = itertools.count()
+
+    def __init__(self, config=None, **params):  # noqa: D107
+        self.config = config or {}
+        self.params = params
+        self.rows = _setting("ROWS", 100, int)
+        self.latency = _setting("LATENCY", 0)
+        self.alive = True
+        self.units = {}
+        time.sleep(_setting("LOGON_LATENCY", 0))
+        _count("logons")
+
+    def _round_trip(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    def call(self, func_name, **kwargs):
+        self._round_trip()
+        _count("calls")
+        try:
+            return canned.call(func_name, kwargs, self.rows)
+        except KeyError:
+            raise ABAPApplicationError("FU_NOT_FOUND: function {0} not found".format(func_name))
+
+    def get_function_description(self, func_name):
+        self._round_trip()
+        _count("descriptions")
+        try:
+            return FunctionDescription(canned.description(func_name))
+        except KeyError:
+            raise ABAPApplicationError("FU_NOT_FOUND: function {0} not found".format(func_name))
+
+    def initialize_unit(self, background=True):
+        unit = dict(
+            id=uuid.uuid4().hex.upper() if background else "{0:024d}".format(next(self._unit_counter)),
+            background=background,
+            queued=False,
+        )
+        return unit
+
+    def fill_and_submit_unit(self, unit, calls, queue_names=None, attributes=None):
+        self._round_trip()
+        for func_name, kwargs in calls:
+            canned.call(func_name, kwargs, self.rows)
+        unit["queued"] = bool(queue_names)
+        self.units[unit["id"]] = "executed"
+        return unit
+
+    def get_unit_state(self, unit):
+        self._round_trip()
+        return self.units.get(unit["id"], "not_found")
+
+    def confirm_unit(self, unit):
+        self._round_trip()
+        self.units[unit["id"]] = "confirmed"
+
+    def close(self):
+        self.alive = False
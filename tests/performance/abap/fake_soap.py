@@ -0,0 +1,237 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+"""Stand-in for ABAP SOAP runtime, serves /sap/bc/soap/wsdl and /sap/bc/soap/rfc.
+
+WSDL (document/literal, namespace urn:sap-com:document:sap:rfc:functions) is generated
+from canned responses, SOAP calls return canned responses with configurable size and latency,
+see fake_pyrfc for configuration environment variables.
+
+Run standalone: python fake_soap.py [port]
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+from xml.etree import ElementTree as ET
+from xml.sax.saxutils import escape
+
+import canned
+
+RFC_NAMESPACE = "urn:sap-com:document:sap:rfc:functions"
+SOAP_NAMESPACE = "http://schemas.xmlsoap.org/soap/envelope/"
+
+# Fields of table parameters passed by caller, they are not part of canned responses
+REQUEST_TABLE_FIELDS = dict(
+    FIELDS=["FIELDNAME", "OFFSET", "LENGTH", "TYPE", "FIELDTEXT"],
+    OPTIONS=["TEXT"],
+    DATA=["WA"],
+    REQ_ATTR_KEYS=["ATTRIBUTE"],
+)
+
+STATISTICS = dict(wsdl=0, calls=0)
+
+
+def _setting(name, default, convert=float):
+    return convert(os.environ.get("SAP_OPERATIONS_STANDIN_{0}".format(name), default))
+
+
+def _xsd_type(value):
+    if isinstance(value, list):
+        row = value[0] if value else {}
+        return (
+            '<xsd:complexType><xsd:sequence><xsd:element name="item" minOccurs="0" '
+            'maxOccurs="unbounded">{0}</xsd:element></xsd:sequence></xsd:complexType>'
+        ).format(_xsd_type(row))
+    if isinstance(value, dict):
+        return "<xsd:complexType><xsd:sequence>{0}</xsd:sequence></xsd:complexType>".format(
+            "".join(_xsd_element(name, field) for name, field in value.items())
+        )
+    return ""
+
+
+def _xsd_element(name, value):
+    if isinstance(value, (list, dict)):
+        return '<xsd:element name="{0}" minOccurs="0">{1}</xsd:element>'.format(
+            name, _xsd_type(value)
+        )
+    xsd_type = "xsd:int" if isinstance(value, int) else "xsd:string"
+    return '<xsd:element name="{0}" type="{1}" minOccurs="0"/>'.format(name, xsd_type)
+
+
+def wsdl(func_name, location):
+    """Return WSDL document of function module with SOAP endpoint location."""
+    imports, tables, response = canned.FUNCTIONS[func_name]
+    escaped = func_name.replace("/", "_-")
+    request = {name: "" for name in imports}
+    request.update(
+        {name: [{field: "" for field in REQUEST_TABLE_FIELDS.get(name, ["LINE"])}] for name in tables}
+    )
+    sample = response(canned.SAMPLE_KWARGS, 1)
+    return """<?xml version="1.0" encoding="utf-8"?>
+<wsdl:definitions targetNamespace="{ns}" xmlns:wsdl="http://schemas.xmlsoap.org/wsdl/"
+    xmlns:soap="http://schemas.xmlsoap.org/wsdl/soap/" xmlns:xsd="http://www.w3.org/2001/XMLSchema"
+    xmlns:tns="{ns}">
+  <wsdl:types>
+    <xsd:schema attributeFormDefault="qualified" targetNamespace="{ns}">
+      <xsd:element name="{name}">{request}</xsd:element>
+      <xsd:element name="{name}.Response">{response}</xsd:element>
+    </xsd:schema>
+  </wsdl:types>
+  <wsdl:message name="{name}.Input"><wsdl:part name="parameters" element="tns:{name}"/></wsdl:message>
+  <wsdl:message name="{name}.Output"><wsdl:part name="parameters" element="tns:{name}.Response"/></wsdl:message>
+  <wsdl:portType name="{name}.PortType">
+    <wsdl:operation name="{name}">
+      <wsdl:input message="tns:{name}.Input"/>
+      <wsdl:output message="tns:{name}.Output"/>
+    </wsdl:operation>
+  </wsdl:portType>
+  <wsdl:binding name="{name}.Binding" type="tns:{name}.PortType">
+    <soap:binding style="document" transport="http://schemas.xmlsoap.org/soap/http"/>
+    <wsdl:operation name="{name}">
+      <soap:operation soapAction="{ns}:{name}"/>
+      <wsdl:input><soap:body use="literal"/></wsdl:input>
+      <wsdl:output><soap:body use="literal"/></wsdl:output>
+    </wsdl:operation>
+  </wsdl:binding>
+  <wsdl:service name="{name}.Service">
+    <wsdl:port name="{name}.Port" binding="tns:{name}.Binding">
+      <soap:address location="{location}"/>
+    </wsdl:port>
+  </wsdl:service>
+</wsdl:definitions>
+""".format(
+        ns=RFC_NAMESPACE,
+        name=escaped,
+        request=_xsd_type(request),
+        response=_xsd_type(sample),
+        location=escape(location),
+    )
+
+
+def _xml_value(value):
+    if isinstance(value, list):
+        return "".join("<item>{0}</item>".format(_xml_value(row)) for row in value)
+    if isinstance(value, dict):
+        return "".join(
+            "<{0}>{1}</{0}>".format(name, _xml_value(field)) for name, field in value.items()
+        )
+    return escape(str(value))
+
+
+def _parse_value(element):
+    children = list(element)
+    if not children:
+        return element.text or ""
+    if all(child.tag.rsplit("}", 1)[-1] == "item" for child in children):
+        return [_parse_value(child) for child in children]
+    return {child.tag.rsplit("}", 1)[-1]: _parse_value(child) for child in children}
+
+
+def soap_response(body):
+    """Return SOAP response of SOAP request envelope."""
+    envelope = ET.fromstring(body)
+    call = envelope.find("{{{0}}}Body".format(SOAP_NAMESPACE))[0]
+    escaped = call.tag.rsplit("}", 1)[-1]
+    func_name = escaped.replace("_-", "/")
+    kwargs = {
+        child.tag.rsplit("}", 1)[-1]: _parse_value(child) for child in call
+    }
+    result = canned.call(func_name, kwargs, _setting("ROWS", 100, int))
+    return (
+        '<soap-env:Envelope xmlns:soap-env="{0}"><soap-env:Header/><soap-env:Body>'
+        '<n0:{1}.Response xmlns:n0="{2}">{3}</n0:{1}.Response>'
+        "</soap-env:Body></soap-env:Envelope>"
+    ).format(SOAP_NAMESPACE, escaped, RFC_NAMESPACE, _xml_value(result))
+
+
+class StandInSOAPHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, without TCP_NODELAY delayed ACK adds 40ms to every call
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, body, content_type="text/xml; charset=utf-8"):
+        body = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != "/sap/bc/soap/wsdl":
+            return self._reply(404, "Not found", "text/plain")
+        query = parse_qs(url.query)
+        func_name = query.get("services", [""])[0].replace("_-", "/")
+        if func_name not in canned.FUNCTIONS:
+            return self._reply(404, "Function {0} not found".format(func_name), "text/plain")
+        STATISTICS["wsdl"] += 1
+        location = "http://{0}/sap/bc/soap/rfc?sap-client={1}".format(
+            self.headers.get("Host"), query.get("sap-client", ["000"])[0]
+        )
+        self._reply(200, wsdl(func_name, location))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/sap/bc/soap/rfc":
+            return self._reply(404, "Not found", "text/plain")
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        latency = _setting("LATENCY", 0)
+        if latency:
+            time.sleep(latency)
+        STATISTICS["calls"] += 1
+        try:
+            response = soap_response(body)
+        except Exception as e:
+            return self._reply(
+                500,
+                (
+                    '<soap-env:Envelope xmlns:soap-env="{0}"><soap-env:Body><soap-env:Fault>'
+                    "<faultcode>soap-env:Server</faultcode><faultstring>{1}</faultstring>"
+                    "</soap-env:Fault></soap-env:Body></soap-env:Envelope>"
+                ).format(SOAP_NAMESPACE, escape(str(e))),
+            )
+        self._reply(200, response)
+
+
+class StandInSOAPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def start(port=0):
+    """Start stand-in server in background thread, return server, server.server_port is the port."""
+    server = StandInSOAPServer(("127.0.0.1", port), StandInSOAPHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    StandInSOAPServer(("127.0.0.1", port), StandInSOAPHandler).serve_forever()
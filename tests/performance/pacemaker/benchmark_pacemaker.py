@@ -0,0 +1,263 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+
+"""Benchmark pacemaker XML conversion, index and filters of the collection over synthetic CIB and status.
+
+Element2Dict is compared with the former recursive implementation (same output is checked),
+time per element shows whether conversion scales linearly with size of the document.
+Requires ansible-core, pacemaker cluster is not needed.
+
+python tests/performance/pacemaker/benchmark_pacemaker.py --resources 100 1000 5000 --history 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET  # nosec B405
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+COLLECTION_ROOT = os.path.abspath(os.path.join(HERE, "..", "..", ".."))
+
+BENCHMARKS = ("element2dict", "index", "filters")
+
+
+def setup_collection_path():
+    """Make collection importable as ansible_collections.sap.sap_operations."""
+    root = tempfile.mkdtemp(prefix="sap_operations_benchmark_")
+    namespace = os.path.join(root, "ansible_collections", "sap")
+    os.makedirs(namespace)
+    os.symlink(COLLECTION_ROOT, os.path.join(namespace, "sap_operations"))
+    sys.path.insert(0, root)
+    sys.path.insert(0, HERE)
+    return root
+
+
+def element2dict_recursive(root):
+    """Former recursive Element2Dict, reference for output and timing."""
+    from ansible_collections.sap.sap_operations.plugins.module_utils.compat import dict_union
+    from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import (
+        PACEMAKER_XML_LIST_ELEMENTS,
+    )
+
+    ret = {}
+    children = [element2dict_recursive(child) for child in root]
+    attributes = root.attrib
+    root_is_list = root.tag in PACEMAKER_XML_LIST_ELEMENTS
+
+    if attributes and children:
+        if not root_is_list:
+            children_dict = {}
+            for child in children:
+                children_dict = dict_union(children_dict, child)
+            ret[root.tag] = dict_union(root.attrib, children_dict)
+        else:
+            ret["attrib"] = root.attrib
+            ret[root.tag] = children
+    elif attributes and not children:
+        ret[root.tag] = root.attrib
+    elif not attributes and children:
+        if not root_is_list:
+            children_dict = {}
+            for child in children:
+                children_dict = dict_union(children_dict, child)
+            ret[root.tag] = children_dict
+        else:
+            ret[root.tag] = children
+    elif not attributes and not children:
+        return {root.tag: root.text}
+    return ret
+
+
+def best_of(iterations, func):
+    """Return minimal wall time of func over iterations."""
+    best = None
+    for _i in range(iterations):
+        start = time.perf_counter()
+        func()
+        seconds = time.perf_counter() - start
+        best = seconds if best is None else min(best, seconds)
+    return best
+
+
+def documents(sizes, history):
+    import synthetic
+
+    for resources in sizes:
+        for kind, generate in (("cib", synthetic.cib), ("status", synthetic.status)):
+            yield kind, resources, generate(resources, history)
+
+
+def result(label, kind, resources, elements, seconds):
+    return dict(
+        benchmark=label,
+        document=kind,
+        resources=resources,
+        elements=elements,
+        seconds=round(seconds, 6),
+        us_per_element=round(seconds / elements * 1e6, 3),
+    )
+
+
+def benchmark_element2dict(sizes, history, iterations, reference_limit):
+    from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import Element2Dict
+
+    results = []
+    for kind, resources, xml_string in documents(sizes, history):
+        root = ET.fromstring(xml_string)  # nosec B314
+        elements = sum(1 for _element in root.iter())
+        results.append(
+            result("Element2Dict", kind, resources, elements, best_of(iterations, lambda: Element2Dict(root)))
+        )
+        if resources > reference_limit:
+            continue
+        if Element2Dict(root) != element2dict_recursive(root):
+            raise AssertionError("Element2Dict output differs for {0} {1}".format(kind, resources))
+        results.append(
+            result(
+                "Element2Dict recursive (former)",
+                kind,
+                resources,
+                elements,
+                best_of(iterations, lambda: element2dict_recursive(root)),
+            )
+        )
+    return results
+
+
+def benchmark_index(sizes, history, iterations, reference_limit):
+    from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import (
+        PacemakerIndex,
+    )
+
+    results = []
+    for kind, resources, xml_string in documents(sizes, history):
+        root = ET.fromstring(xml_string)  # nosec B314
+        elements = sum(1 for _element in root.iter())
+        tag = "primitive" if kind == "cib" else "resource"
+        ids = ["rsc_{0}".format(i) for i in range(0, resources, max(resources // 20, 1))]
+
+        def lookups():
+            index = PacemakerIndex(root)
+            for resource_id in ids:
+                index.resources(tag, resource_id)
+
+        results.append(
+            result("PacemakerIndex build + {0} lookups".format(len(ids)), kind, resources, elements,
+                   best_of(iterations, lookups))
+        )
+        if resources > reference_limit:
+            continue
+
+        def xpath_lookups():
+            for resource_id in ids:
+                for path in ("{0}", "clone/{0}", "group/{0}", "clone/group/{0}", "group", "clone/group"):
+                    root.findall(".//resources/{0}[@id='{1}']".format(path.format(tag), resource_id))
+
+        results.append(
+            result("XPath {0} lookups (former)".format(len(ids)), kind, resources, elements,
+                   best_of(iterations, xpath_lookups))
+        )
+    return results
+
+
+def benchmark_filters(sizes, history, iterations, calls):
+    from ansible_collections.sap.sap_operations.plugins.filter.pcs_cluster_property_mapping import (
+        pcs_cluster_property_mapping,
+    )
+    from ansible_collections.sap.sap_operations.plugins.filter.pcs_resources_from_cib import (
+        pcs_resources_from_cib,
+    )
+    from ansible_collections.sap.sap_operations.plugins.module_utils import pacemaker
+
+    results = []
+    for kind, resources, xml_string in documents(sizes, history):
+        if kind != "cib":
+            continue
+        data = dict(pacemaker_cib_xml=xml_string)
+        elements = sum(1 for _element in ET.fromstring(xml_string).iter())  # nosec B314
+
+        def check_set():
+            # Pattern of pcs_config_checks role, filters evaluated for every check
+            for i in range(calls):
+                pcs_cluster_property_mapping(data)
+                pcs_resources_from_cib(data, id="rsc_{0}".format(i % resources))
+
+        def cold_check_set():
+            pacemaker._PACEMAKER_XML_CACHE.clear()
+            check_set()
+
+        results.append(
+            result("filters x{0} cold (parse once)".format(calls), kind, resources, elements,
+                   best_of(iterations, cold_check_set))
+        )
+        results.append(
+            result("filters x{0} warm (cached)".format(calls), kind, resources, elements,
+                   best_of(iterations, check_set))
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resources", type=int, nargs="+", default=[100, 500, 1000, 2500, 5000])
+    parser.add_argument("--history", type=int, default=20, help="operations per resource and node")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument(
+        "--reference-limit",
+        type=int,
+        default=5000,
+        help="run former implementations only for documents up to this number of resources",
+    )
+    parser.add_argument("--calls", type=int, default=100, help="filter calls per check set")
+    parser.add_argument("--benchmark", action="append", choices=BENCHMARKS)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    setup_collection_path()
+
+    results = []
+    for benchmark in args.benchmark or BENCHMARKS:
+        if benchmark == "element2dict":
+            results += benchmark_element2dict(
+                args.resources, args.history, args.iterations, args.reference_limit
+            )
+        elif benchmark == "index":
+            results += benchmark_index(args.resources, args.history, args.iterations, args.reference_limit)
+        elif benchmark == "filters":
+            results += benchmark_filters(args.resources, args.history, args.iterations, args.calls)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for item in results:
+        print(
+            "{benchmark:40} {document:7} resources={resources:<6} elements={elements:<8} "
+            "{seconds:>10.4f}s {us_per_element:>8.3f} us/element".format(**item)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+
+
+"""Synthetic pacemaker CIB (cibadmin --query) and status (pcs status xml) documents.
+
+Resources are primitives, clones, groups and cloned groups in fixed rotation, every resource
+has `history` operations per node in CIB status section (lrm_rsc_op) and in status node_history.
+"""
+
+NODES = ("node1", "node2")
+AGENTS = (
+    ("ocf", "heartbeat", "IPaddr2"),
+    ("ocf", "suse", "SAPHana"),
+    ("ocf", "suse", "SAPHanaTopology"),
+    ("stonith", None, "fence_azure_arm"),
+)
+
+
+def _agent(i):
+    return AGENTS[i % len(AGENTS)]
+
+
+def _primitive(rsc_id, i):
+    resource_class, provider, agent_type = _agent(i)
+    provider = ' provider="{0}"'.format(provider) if provider else ""
+    return (
+        '<primitive id="{0}" class="{1}"{2} type="{3}">'
+        '<instance_attributes id="{0}-instance_attributes">'
+        '<nvpair id="{0}-instance_attributes-ip" name="ip" value="10.0.0.{4}"/>'
+        "</instance_attributes>"
+        '<meta_attributes id="{0}-meta_attributes">'
+        '<nvpair id="{0}-meta_attributes-target-role" name="target-role" value="Started"/>'
+        "</meta_attributes>"
+        "<operations>"
+        '<op id="{0}-monitor-interval-10s" interval="10s" name="monitor" timeout="20s"/>'
+        '<op id="{0}-start-interval-0s" interval="0s" name="start" timeout="20s"/>'
+        '<op id="{0}-stop-interval-0s" interval="0s" name="stop" timeout="20s"/>'
+        "</operations>"
+        "</primitive>"
+    ).format(rsc_id, resource_class, provider, agent_type, i % 250)
+
+
+def _resource_ids(resources):
+    """Yield (kind, index) for resources, kinds rotate between primitive, clone, group and cloned group."""
+    for i in range(resources):
+        yield ("primitive", "clone", "group", "clone_group")[i % 4], i
+
+
+def cib(resources=100, history=10):
+    parts = [
+        '<cib crm_feature_set="3.16.2" validate-with="pacemaker-3.9" epoch="{0}" num_updates="12" '
+        'admin_epoch="0" have-quorum="1" dc-uuid="1">'.format(resources),
+        "<configuration><crm_config>",
+        '<cluster_property_set id="cib-bootstrap-options">'
+        '<nvpair id="cib-bootstrap-options-stonith-enabled" name="stonith-enabled" value="true"/>'
+        '<nvpair id="cib-bootstrap-options-cluster-name" name="cluster-name" value="hacluster"/>'
+        "</cluster_property_set></crm_config><nodes>",
+    ]
+    for n, node in enumerate(NODES, start=1):
+        parts.append('<node id="{0}" uname="{1}"/>'.format(n, node))
+    parts.append("</nodes><resources>")
+    primitive_ids = []
+    for kind, i in _resource_ids(resources):
+        rsc_id = "rsc_{0}".format(i)
+        primitive_ids.append(rsc_id)
+        if kind == "primitive":
+            parts.append(_primitive(rsc_id, i))
+        elif kind == "clone":
+            parts.append('<clone id="cln_{0}">{1}</clone>'.format(i, _primitive(rsc_id, i)))
+        elif kind == "group":
+            parts.append('<group id="grp_{0}">{1}</group>'.format(i, _primitive(rsc_id, i)))
+        else:
+            parts.append(
+                '<clone id="cln_grp_{0}"><group id="grp_{0}">{1}</group></clone>'.format(
+                    i, _primitive(rsc_id, i)
+                )
+            )
+    parts.append("</resources><constraints/></configuration><status>")
+    for n, node in enumerate(NODES, start=1):
+        parts.append(
+            '<node_state id="{0}" uname="{1}" in_ccm="true" crmd="online" join="member" expected="member">'
+            '<transient_attributes id="{0}"><instance_attributes id="status-{0}">'
+            '<nvpair id="status-{0}-hana_roles" name="hana_roles" value="4:P:master1::worker:"/>'
+            "</instance_attributes></transient_attributes>"
+            '<lrm id="{0}"><lrm_resources>'.format(n, node)
+        )
+        for i, rsc_id in enumerate(primitive_ids):
+            resource_class, provider, agent_type = _agent(i)
+            parts.append(
+                '<lrm_resource id="{0}" class="{1}" type="{2}"{3}>'.format(
+                    rsc_id,
+                    resource_class,
+                    agent_type,
+                    ' provider="{0}"'.format(provider) if provider else "",
+                )
+            )
+            for call in range(history):
+                parts.append(
+                    '<lrm_rsc_op id="{0}_monitor_{1}" operation="monitor" call-id="{1}" rc-code="0" '
+                    'op-status="0" interval="10000" exec-time="12" queue-time="0"/>'.format(rsc_id, call)
+                )
+            parts.append("</lrm_resource>")
+        parts.append("</lrm_resources></lrm></node_state>")
+    parts.append("</status></cib>")
+    return "".join(parts)
+
+
+def _status_resource(rsc_id, i, node):
+    resource_class, provider, agent_type = _agent(i)
+    return (
+        '<resource id="{0}" resource_agent="{1}::{2}:{3}" role="Started" active="true" orphaned="false" '
+        'blocked="false" managed="true" failed="false" failure_ignored="false" nodes_running_on="1">'
+        '<node name="{4}" id="{5}" cached="true"/>'
+        "</resource>"
+    ).format(rsc_id, resource_class, provider or "", agent_type, node, NODES.index(node) + 1)
+
+
+def status(resources=100, history=10):
+    parts = [
+        '<crm_mon version="2.1.5"><summary><stack type="corosync"/>'
+        '<resources_configured number="{0}" disabled="0" blocked="0"/></summary><nodes>'.format(resources)
+    ]
+    for n, node in enumerate(NODES, start=1):
+        parts.append(
+            '<node name="{0}" id="{1}" online="true" standby="false" maintenance="false" '
+            'resources_running="{2}" type="member"/>'.format(node, n, resources)
+        )
+    parts.append("</nodes><resources>")
+    primitive_ids = []
+    for kind, i in _resource_ids(resources):
+        rsc_id = "rsc_{0}".format(i)
+        primitive_ids.append(rsc_id)
+        if kind == "primitive":
+            parts.append(_status_resource(rsc_id, i, NODES[0]))
+        elif kind == "clone":
+            parts.append(
+                '<clone id="cln_{0}" multi_state="false" unique="false" managed="true">{1}</clone>'.format(
+                    i, "".join(_status_resource(rsc_id, i, node) for node in NODES)
+                )
+            )
+        elif kind == "group":
+            parts.append(
+                '<group id="grp_{0}" number_resources="1">{1}</group>'.format(
+                    i, _status_resource(rsc_id, i, NODES[0])
+                )
+            )
+        else:
+            parts.append(
+                '<clone id="cln_grp_{0}" multi_state="false" unique="false" managed="true">{1}</clone>'.format(
+                    i,
+                    "".join(
+                        '<group id="grp_{0}:{1}" number_resources="1">{2}</group>'.format(
+                            i, n, _status_resource(rsc_id, i, node)
+                        )
+                        for n, node in enumerate(NODES)
+                    ),
+                )
+            )
+    parts.append("</resources><node_attributes>")
+    for node in NODES:
+        parts.append(
+            '<node name="{0}"><attribute name="hana_roles" value="4:P:master1::worker:"/></node>'.format(node)
+        )
+    parts.append("</node_attributes><node_history>")
+    for node in NODES:
+        parts.append('<node name="{0}">'.format(node))
+        for rsc_id in primitive_ids:
+            parts.append('<resource_history id="{0}" orphan="false" migration-threshold="5000">'.format(rsc_id))
+            for call in range(history):
+                parts.append(
+                    '<operation_history call="{0}" task="monitor" interval="10000ms" rc="0" '
+                    'rc_text="ok" exec-time="12ms" queue-time="0ms"/>'.format(call)
+                )
+            parts.append("</resource_history>")
+        parts.append("</node>")
+    parts.append("</node_history></crm_mon>")
+    return "".join(parts)
@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import threading
+import time
+from unittest import mock
+
+from ansible.playbook.play_context import PlayContext
+from ansible.playbook.task import Task
+
+from ansible_collections.sap.sap_operations.plugins.action import abap_rfc_fanout
+
+
+def targets(count):
+    return [
+        dict(
+            name="T{0}".format(i),
+            rfc_connection=dict(ashost="host{0}".format(i), sysnr="00", client="001", user="DDIC", passwd="secret"),
+        )
+        for i in range(count)
+    ]
+
+
+class FakeCalls(object):
+    """call_target stand-in, calls of hanging targets block until released."""
+
+    def __init__(self, hanging):  # noqa: D107
+        self.hanging = hanging
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __call__(self, target, function, parameters, state):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if target["name"] in self.hanging:
+                self.release.wait(5)
+            return dict(TARGET=target["name"])
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_timed_out_target_does_not_delay_others(monkeypatch):
+    calls = FakeCalls(hanging=["T1"])
+    monkeypatch.setattr(abap_rfc_fanout, "call_target", calls)
+    start = time.monotonic()
+    results = abap_rfc_fanout.fan_out(targets(4), "RFC_PING", {}, parallel_targets=2, timeout=0.2)
+    calls.release.set()
+    assert time.monotonic() - start < 1
+    assert [result["name"] for result in results] == ["T0", "T1", "T2", "T3"]
+    assert [result["timed_out"] for result in results] == [False, True, False, False]
+    assert results[2]["result"] == dict(TARGET="T2")
+
+
+def test_replacement_workers_are_capped(monkeypatch):
+    calls = FakeCalls(hanging=["T{0}".format(i) for i in range(6)])
+    monkeypatch.setattr(abap_rfc_fanout, "call_target", calls)
+    results = abap_rfc_fanout.fan_out(targets(6), "RFC_PING", {}, parallel_targets=1, timeout=0.1)
+    calls.release.set()
+    assert calls.max_running == 2
+    assert all(result["failed"] and result["timed_out"] for result in results)
+    assert [result["msg"].startswith("Target was not started") for result in results] == [
+        False, False, True, True, True, True
+    ]
+
+
+def action(args):
+    task = Task()
+    task.args = args
+    return abap_rfc_fanout.ActionModule(
+        task=task,
+        connection=mock.MagicMock(),
+        play_context=PlayContext(),
+        loader=None,
+        templar=None,
+        shared_loader_obj=None,
+    )
+
+
+def test_run_reports_missing_pyrfc(monkeypatch):
+    monkeypatch.setattr(abap_rfc_fanout, "HAS_PYRFC_LIBRARY", False)
+    monkeypatch.setattr(abap_rfc_fanout, "PYRFC_LIBRARY_IMPORT_ERROR", "Traceback: No module named 'pyrfc'")
+    result = action(dict(targets=targets(1), function="RFC_PING")).run(task_vars={})
+    assert result["failed"]
+    assert "pyrfc" in result["msg"]
+    assert result["exception"] == "Traceback: No module named 'pyrfc'"
+
+
+def test_run_returns_results_of_targets(monkeypatch):
+    monkeypatch.setattr(abap_rfc_fanout, "HAS_PYRFC_LIBRARY", True)
+    monkeypatch.setattr(abap_rfc_fanout, "call_target", FakeCalls(hanging=[]))
+    result = action(dict(targets=targets(2), function="RFC_PING")).run(task_vars={})
+    assert not result["failed"]
+    assert [target["result"] for target in result["abap_rfc_fanout"]] == [dict(TARGET="T0"), dict(TARGET="T1")]
+    assert result["abap_rfc_fanout_summary"]["succeeded"] == 2
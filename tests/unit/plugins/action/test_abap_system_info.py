@@ -0,0 +1,60 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.sap.sap_operations.plugins.action.abap_system_info import (
+    cache_key,
+    fingerprint,
+)
+
+
+def probe(host="vhcalnplci", ip="10.0.0.1", sp="0002", text="SAP Basis Component"):
+    return dict(
+        sid="NPL",
+        system_info=dict(
+            RFCSYSID="NPL", RFCDBSYS="HDB", RFCKERNRL="793", RFCSAPRL="757", RFCHOST=host, RFCIPADDR=ip
+        ),
+        sections=dict(
+            installed_components=dict(
+                TT_COMPTAB=[dict(COMPONENT="SAP_BASIS", RELEASE="757", EXTRELEASE=sp, DESC_TEXT=text)]
+            )
+        ),
+    )
+
+
+def test_fingerprint_ignores_application_server_fields():
+    assert fingerprint(probe()) == fingerprint(probe(host="vhcalnplap1", ip="10.0.0.2"))
+    assert fingerprint(probe()) == fingerprint(probe(text="SAP Basis Komponente"))
+
+
+def test_fingerprint_changes_with_support_package():
+    assert fingerprint(probe()) != fingerprint(probe(sp="0003"))
+
+
+def test_cache_key_depends_on_result_format():
+    args = dict(rfc_connection=dict(ashost="vhcalnplci", sysnr="00", client="001"))
+    assert cache_key("NPL", args) == cache_key("NPL", dict(args, result_format="dict"))
+    assert cache_key("NPL", args) != cache_key("NPL", dict(args, result_format="columnar"))
+    other_client = dict(rfc_connection=dict(args["rfc_connection"], client="002"))
+    assert cache_key("NPL", args) != cache_key("NPL", other_client)
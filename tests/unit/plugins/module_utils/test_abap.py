@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import time
+
+import pytest
+
+from ansible_collections.sap.sap_operations.plugins.module_utils import abap as abap_utils
+
+
+def description(func_name, table, fields):
+    return dict(
+        name=func_name,
+        parameters=[
+            dict(
+                name=table,
+                parameter_type="RFCTYPE_TABLE",
+                direction="RFC_TABLES",
+                optional=True,
+                fields=[
+                    dict(name=name, field_type=field_type, fields=None)
+                    for name, field_type in fields
+                ],
+            )
+        ],
+    )
+
+
+class FakeRFCClient(abap_utils.SAPRFCClient):
+    """SAPRFCClient returning canned results, reading function description on every call."""
+
+    descriptions = {}
+
+    def __init__(self):  # noqa: D107
+        super(FakeRFCClient, self).__init__(rstrip=True, return_import_params=False)
+        self.closed = False
+
+    def __call__(self, func_name, **kwargs):
+        time.sleep(0.05)
+        self.function_descriptions[func_name] = self.descriptions[func_name]
+        return {self.descriptions[func_name]["parameters"][0]["name"]: [dict(NAME="x", SIZE=1)]}
+
+    def close(self):
+        self.closed = True
+
+
+def module(params):
+    module = abap_utils.AnsibleModuleABAP.__new__(abap_utils.AnsibleModuleABAP)
+    module.params = params
+    module.abap_client = FakeRFCClient()
+    module.client_pool = []
+    module.created = []
+
+    def create_client(ashost=None, sysnr=None):
+        module.created.append(FakeRFCClient())
+        return module.created[-1]
+
+    module.create_client = create_client
+    return module
+
+
+def test_format_result_uses_types_of_pool_clients():
+    FakeRFCClient.descriptions = {
+        "F{0}".format(i): description("F{0}".format(i), "T", [("NAME", "RFCTYPE_CHAR"), ("SIZE", "RFCTYPE_INT")])
+        for i in range(4)
+    }
+    abap = module(dict(result_format="columnar"))
+    results = abap.map_parallel(
+        lambda client, func_name: client(func_name), sorted(FakeRFCClient.descriptions), connections=4
+    )
+    formatted = [abap.format_result(result, "F{0}".format(i)) for i, result in enumerate(results)]
+    assert all(result["T"]["types"] == ["RFCTYPE_CHAR", "RFCTYPE_INT"] for result in formatted)
+
+
+def test_map_parallel_reuses_clients_of_pool():
+    FakeRFCClient.descriptions = {"F0": description("F0", "T", [("NAME", "RFCTYPE_CHAR")])}
+    abap = module(dict())
+    for connections in (3, 2, 3):
+        abap.map_parallel(lambda client, func_name: client(func_name), ["F0"] * 3, connections=connections)
+    assert len(abap.created) == 2
+    assert not any(client.closed for client in abap.created)
+    abap.close_clients()
+    assert all(client.closed for client in abap.created)
+    assert abap.abap_client.closed
+    assert abap.client_pool == []
+
+
+def test_format_result_dict():
+    abap = module(dict(result_format="dict"))
+    assert abap.format_result(dict(T=[dict(NAME="x")]), "F0") == dict(T=[dict(NAME="x")])
+
+
+class ValidatingRFCClient(abap_utils.SAPRFCClient):
+    """SAPRFCClient with canned connection and function description."""
+
+    def __init__(self, **kwargs):  # noqa: D107
+        super(ValidatingRFCClient, self).__init__(rstrip=True, return_import_params=False, **kwargs)
+        self.calls = []
+        self.function_descriptions["STFC_CONNECTION"] = dict(
+            name="STFC_CONNECTION",
+            parameters=[
+                dict(name="REQUTEXT", direction="RFC_IMPORT", optional=False),
+                dict(name="ECHOTEXT", direction="RFC_EXPORT", optional=False),
+            ],
+        )
+
+    @property
+    def connection(self):
+        return self
+
+    def call(self, func_name, **kwargs):
+        self.calls.append((func_name, kwargs))
+        return dict(ECHOTEXT=kwargs.get("REQUTEXT"))
+
+
+def test_parameters_are_not_validated_by_default():
+    client = ValidatingRFCClient()
+    assert client("STFC_CONNECTION", UNKNOWN="x") == dict(ECHOTEXT=None)
+
+
+def test_pyrfc_call_options_are_not_validated():
+    client = ValidatingRFCClient(validate_parameters=True)
+    client("STFC_CONNECTION", REQUTEXT="x", options=dict(timeout=10))
+    assert client.calls == [("STFC_CONNECTION", dict(REQUTEXT="x", options=dict(timeout=10)))]
+    with pytest.raises(abap_utils.ABAPFunctionParameterError) as error:
+        client("STFC_CONNECTION", UNKNOWN="x")
+    assert "Unknown parameter UNKNOWN" in error.value.msg
+    assert "Missing mandatory parameter REQUTEXT" in error.value.msg
@@ -0,0 +1,185 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap_table import (
+    ABAPResultFileWriter,
+    ABAPTableReadError,
+    function_not_found,
+    read_table,
+    read_table_field_groups,
+    read_table_join,
+)
+
+FIELDS = [("KEY1", 10), ("KEY2", 4), ("TEXT1", 200), ("TEXT2", 200), ("TEXT3", 200)]
+KEYS = ["KEY1", "KEY2"]
+
+
+class FakeReadTable(object):
+    """RFC_READ_TABLE over in-memory rows, `order(call, rows)` returns row order of select `call`."""
+
+    def __init__(self, rows, order=None):
+        self.rows = rows
+        self.order = order or (lambda call, rows: rows)
+        self.calls = []
+
+    def __call__(self, function, QUERY_TABLE, FIELDS=(), NO_DATA="", ROWSKIPS=0, ROWCOUNT=0, **kwargs):
+        self.calls.append(dict(QUERY_TABLE=QUERY_TABLE, FIELDS=FIELDS, ROWSKIPS=ROWSKIPS))
+        if QUERY_TABLE == "DD03L":
+            names = [dict(FIELDNAME=key, POSITION=str(i + 1)) for i, key in enumerate(KEYS)]
+            return self.encode(names, [("FIELDNAME", 30), ("POSITION", 4)], FIELDS, NO_DATA, ROWSKIPS, ROWCOUNT)
+        rows = self.order(self.calls[-1], list(self.rows))
+        return self.encode(rows, FIELDS_OF_TABLE, FIELDS, NO_DATA, ROWSKIPS, ROWCOUNT)
+
+    @staticmethod
+    def encode(rows, table_fields, requested, no_data, skip, count):
+        requested = [field["FIELDNAME"] for field in requested or []]
+        if requested:
+            table_fields = [field for field in table_fields if field[0] in requested]
+        fields = []
+        offset = 0
+        for name, length in table_fields:
+            fields.append(dict(FIELDNAME=name, OFFSET=str(offset), LENGTH=str(length), TYPE="C"))
+            offset += length
+        if no_data == "X":
+            return dict(FIELDS=fields, DATA=[])
+        rows = rows[skip:skip + count] if count else rows[skip:]
+        return dict(
+            FIELDS=fields,
+            DATA=[
+                dict(WA="".join(str(row[name])[:length].ljust(length) for name, length in table_fields))
+                for row in rows
+            ],
+        )
+
+
+FIELDS_OF_TABLE = FIELDS
+
+
+def table_rows(count):
+    return [
+        dict(KEY1="K{0}".format(i // 3), KEY2=str(i % 3), TEXT1="A" * 5 + str(i), TEXT2="B" + str(i), TEXT3="C" + str(i))
+        for i in range(count)
+    ]
+
+
+def descriptions(names=None):
+    return [
+        dict(FIELDNAME=name, LENGTH=str(length))
+        for name, length in FIELDS
+        if names is None or name in names
+    ]
+
+
+def test_field_groups_repeat_key_fields():
+    groups = read_table_field_groups(descriptions(), 512, descriptions(KEYS))
+    assert groups == [KEYS + ["TEXT1", "TEXT2"], KEYS + ["TEXT3"]]
+
+
+def test_field_groups_without_keys():
+    assert read_table_field_groups(descriptions(["TEXT1"]), 512) == [["TEXT1"]]
+
+
+def test_join_on_keys_not_position():
+    first = [dict(K="1", A="a1"), dict(K="2", A="a2")]
+    second = [dict(K="2", B="b2"), dict(K="1", B="b1")]
+    assert read_table_join([first, second], ["K"]) == [
+        dict(K="1", A="a1", B="b1"),
+        dict(K="2", A="a2", B="b2"),
+    ]
+
+
+def test_join_fails_on_different_rows():
+    with pytest.raises(ABAPTableReadError):
+        read_table_join([[dict(K="1")], [dict(K="3")]], ["K"])
+    with pytest.raises(ABAPTableReadError):
+        read_table_join([[dict(K="1"), dict(K="2")], [dict(K="1")]], ["K"])
+
+
+def test_wide_rows_are_joined_on_key_when_groups_are_ordered_differently():
+    rows = table_rows(7)
+    abap = FakeReadTable(
+        rows,
+        order=lambda call, rows: list(reversed(rows)) if {"FIELDNAME": "TEXT3"} in call["FIELDS"] else rows,
+    )
+    result = list(read_table(abap, "ZWIDE", page_size=100))
+    assert result == rows
+    assert [list(row) for row in result] == [[name for name, _length in FIELDS]] * len(rows)
+
+
+def test_key_fields_not_requested_are_not_returned():
+    rows = table_rows(4)
+    abap = FakeReadTable(rows)
+    result = list(
+        read_table(abap, "ZWIDE", fields=["TEXT1", "TEXT2", "TEXT3"], table_fields=descriptions(["TEXT1", "TEXT2", "TEXT3"]))
+    )
+    assert result == [dict(TEXT1=row["TEXT1"], TEXT2=row["TEXT2"], TEXT3=row["TEXT3"]) for row in rows]
+
+
+def test_pages_are_read_with_rowskips():
+    rows = table_rows(10)
+    abap = FakeReadTable(rows)
+    result = list(read_table(abap, "ZWIDE", fields=["TEXT1"], page_size=4, key_fields=descriptions(KEYS)))
+    assert [row["TEXT1"] for row in result] == [row["TEXT1"] for row in rows]
+    assert [call["ROWSKIPS"] for call in abap.calls if call["ROWSKIPS"]] == [4, 8]
+
+
+def test_unstable_order_between_pages_fails():
+    rows = table_rows(6)
+    abap = FakeReadTable(rows, order=lambda call, rows: list(reversed(rows)) if call["ROWSKIPS"] else rows)
+    with pytest.raises(ABAPTableReadError, match="returned on two pages"):
+        list(read_table(abap, "ZWIDE", fields=["TEXT1"], page_size=4, key_fields=descriptions(KEYS)))
+
+
+def test_max_rows():
+    abap = FakeReadTable(table_rows(10))
+    assert len(list(read_table(abap, "ZWIDE", fields=["TEXT1"], page_size=4, max_rows=6, key_fields=descriptions(KEYS)))) == 6
+
+
+def test_function_not_found():
+    class ABAPApplicationError(Exception):
+        key = "FU_NOT_FOUND"
+
+    assert function_not_found(ABAPApplicationError("ID:FL Type:E Number:046 /BODS/RFC_READ_TABLE2"))
+    assert function_not_found(Exception("FU_NOT_FOUND: function /BODS/RFC_READ_TABLE2 not found"))
+    assert not function_not_found(Exception("TABLE_NOT_AVAILABLE"))
+    assert not function_not_found(Exception("No RFC authorization for function module"))
+
+
+def test_csv_header_is_written_without_rows(tmp_path):
+    path = str(tmp_path / "empty.csv")
+    with ABAPResultFileWriter(path, output_format="csv", columns=KEYS) as writer:
+        writer.write_rows([])
+    with open(path, encoding="utf-8", newline="") as f:
+        assert f.read() == "KEY1,KEY2\r\n"
+
+
+def test_csv_columns_from_first_row(tmp_path):
+    path = str(tmp_path / "rows.csv")
+    with ABAPResultFileWriter(path, output_format="csv") as writer:
+        writer.write_rows([dict(KEY1="A", KEY2="1")])
+    with open(path, encoding="utf-8", newline="") as f:
+        assert f.read() == "KEY1,KEY2\r\nA,1\r\n"
@@ -0,0 +1,136 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import socket
+import threading
+import time
+
+try:
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+except ImportError:
+    BaseHTTPRequestHandler = object
+    ThreadingHTTPServer = None
+
+import pytest
+
+from ansible_collections.sap.sap_operations.plugins.module_utils import abap as abap_utils
+from ansible_collections.sap.sap_operations.plugins.module_utils.abap import (
+    SAPHTTPKeepAliveTransport,
+)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        self.server.requests.append((self.client_address, body))
+        time.sleep(self.server.delay)
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+        # Close keep-alive connection without telling client, as idle timeout of server does
+        self.close_connection = self.server.drop_connections
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    httpd.daemon_threads = True
+    httpd.requests = []
+    httpd.delay = 0
+    httpd.drop_connections = False
+    thread = threading.Thread(target=httpd.serve_forever)
+    thread.daemon = True
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def url(server):
+    return "http://127.0.0.1:{0}/sap/bc/soap/rfc".format(server.server_address[1])
+
+
+def test_connection_is_reused(server):
+    transport = SAPHTTPKeepAliveTransport(None, None, timeout=5)
+    assert transport._request("POST", url(server), body="1")[0] == 200
+    assert transport._request("POST", url(server), body="2")[0] == 200
+    assert len(set(address for address, _body in server.requests)) == 1
+    transport.close()
+
+
+def test_stale_connection_is_retried_once(server):
+    server.drop_connections = True
+    transport = SAPHTTPKeepAliveTransport(None, None, timeout=5)
+    assert transport._request("POST", url(server), body="1")[2] == b"ok"
+    time.sleep(0.1)
+    assert transport._request("POST", url(server), body="2")[2] == b"ok"
+    assert [body for _address, body in server.requests] == [b"1", b"2"]
+    transport.close()
+
+
+def test_read_timeout_is_not_retried(server):
+    server.delay = 0.5
+    transport = SAPHTTPKeepAliveTransport(None, None, timeout=0.1)
+    with pytest.raises((socket.timeout, OSError)):
+        transport._request("POST", url(server), body="1")
+    time.sleep(0.6)
+    assert [body for _address, body in server.requests] == [b"1"]
+    transport.close()
+
+
+def test_cloned_transports_run_concurrently(server):
+    server.delay = 0.3
+    transport = SAPHTTPKeepAliveTransport(None, None, timeout=5)
+    transports = [transport.clone() for _i in range(4)]
+    threads = [
+        threading.Thread(target=t._request, args=("POST", url(server)), kwargs=dict(body="x"))
+        for t in transports
+    ]
+    start = time.monotonic()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.monotonic() - start < 1.0
+    assert len(server.requests) == 4
+    assert sum(len(idle) for idle in transport.connections.values()) == 4
+    transport.close()
+
+
+def test_wsdl_is_not_cached_on_disk_without_cache_dir(tmp_path):
+    from suds.cache import NoCache, ObjectCache
+
+    client = abap_utils.SAPHTTPSOAPClient("host", "user", "secret", "EN", "001", 8000, False)
+    assert isinstance(client.wsdl_cache(), NoCache)
+    client = abap_utils.SAPHTTPSOAPClient(
+        "host", "user", "secret", "EN", "001", 8000, False, wsdl_cache_dir=str(tmp_path)
+    )
+    assert isinstance(client.wsdl_cache(), ObjectCache)
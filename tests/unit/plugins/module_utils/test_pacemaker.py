@@ -0,0 +1,124 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import gc
+import weakref
+import xml.etree.ElementTree as ET  # nosec B405
+from collections import OrderedDict
+
+from ansible_collections.sap.sap_operations.plugins.module_utils import pacemaker
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import PacemakerIndex
+
+CIB = """<cib admin_epoch="0" epoch="12" num_updates="3">
+  <configuration>
+    <crm_config>
+      <cluster_property_set id="cib-bootstrap-options">
+        <nvpair id="opt-stonith" name="stonith-enabled" value="true"/>
+      </cluster_property_set>
+      <cluster_property_set id="SAPHanaSR">
+        <nvpair id="hana-sync" name="hana_han_site_srHook_SITE2" value="SOK"/>
+      </cluster_property_set>
+    </crm_config>
+    <nodes>
+      <node id="1" uname="node1"/>
+      <node id="2" uname="node2"/>
+    </nodes>
+    <resources>
+      <group id="g_ip">
+        <primitive id="rsc_ip" class="ocf" provider="heartbeat" type="IPaddr2"/>
+      </group>
+      <primitive id="rsc_fence" class="stonith" type="fence_azure_arm"/>
+      <clone id="cln_topology">
+        <primitive id="rsc_topology" class="ocf" provider="suse" type="SAPHanaTopology"/>
+      </clone>
+    </resources>
+  </configuration>
+  <status>
+    <node_state id="1" uname="node1">
+      <transient_attributes id="1">
+        <instance_attributes id="status-1">
+          <nvpair id="status-1-sync" name="hana_han_sync_state" value="PRIM"/>
+        </instance_attributes>
+      </transient_attributes>
+    </node_state>
+  </status>
+</cib>
+"""
+
+
+def root():
+    return ET.fromstring(CIB)  # nosec B314
+
+
+def test_resources_in_order_of_resource_paths():
+    index = PacemakerIndex(root())
+    assert [r.get("id") for r in index.resources("primitive")] == [
+        "rsc_fence", "rsc_topology", "rsc_ip", "g_ip"
+    ]
+    assert [r.get("id") for r in index.resources("primitive", "rsc_ip")] == ["rsc_ip"]
+    assert [r.get("id") for r in index.resources("primitive", path_indexes=range(4))] == [
+        "rsc_fence", "rsc_topology", "rsc_ip"
+    ]
+    assert index.parent(index.resources("primitive", "rsc_ip")[0]).get("id") == "g_ip"
+
+
+def test_nodes_properties_and_attributes():
+    index = PacemakerIndex(root())
+    assert [node.get("id") for node in index.nodes("node2")] == ["2"]
+    assert [nvpair.get("name") for nvpair in index.cluster_property_set("SAPHanaSR")] == [
+        "hana_han_site_srHook_SITE2"
+    ]
+    assert len(index.cluster_property_set()) == 2
+    assert index.node_attributes == {"node1": {"hana_han_sync_state": "PRIM"}}
+
+
+def test_index_of_parsed_xml_is_cached():
+    tree = pacemaker.pcs_fromstring(CIB)
+    assert pacemaker.pcs_fromstring(CIB) is tree
+    assert pacemaker.pcs_index(tree) is pacemaker.pcs_index(ET.ElementTree(tree))
+    assert pacemaker.pcs_index(pacemaker.pcs_index(tree)) is pacemaker.pcs_index(tree)
+
+
+def test_trees_are_released():
+    tree = root()
+    index = pacemaker.pcs_index(tree)
+    assert index.root is tree
+    assert pacemaker.pcs_index(tree) is not index
+    released = weakref.ref(tree)
+    del tree, index
+    gc.collect()
+    assert released() is None
+
+
+def test_trees_evicted_from_cache_are_released(monkeypatch):
+    monkeypatch.setattr(pacemaker, "_PACEMAKER_XML_CACHE", OrderedDict())
+    monkeypatch.setattr(pacemaker, "PACEMAKER_XML_CACHE_SIZE", 2)
+    first = weakref.ref(pacemaker.pcs_fromstring(CIB.replace('epoch="12"', 'epoch="1"')))
+    pacemaker.pcs_fromstring(CIB.replace('epoch="12"', 'epoch="2"'))
+    gc.collect()
+    assert first() is not None
+    pacemaker.pcs_fromstring(CIB.replace('epoch="12"', 'epoch="3"'))
+    gc.collect()
+    assert first() is None
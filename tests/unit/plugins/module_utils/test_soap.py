@@ -0,0 +1,151 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import pytest
+
+from ansible_collections.sap.sap_operations.plugins.module_utils import soap
+
+
+class FakeService(object):
+    def __init__(self, wp_tables, queues=None, inactive_error=None):
+        self.wp_tables = list(wp_tables)
+        self.queues = queues or []
+        self.inactive_error = inactive_error
+        self.inactive = False
+
+    def ABAPSetServerInactive(self):
+        if self.inactive_error:
+            raise Exception(self.inactive_error)
+        self.inactive = True
+
+    def ABAPSetServerActive(self):
+        self.inactive = False
+
+    def ABAPGetWPTable(self):
+        table = self.wp_tables.pop(0) if len(self.wp_tables) > 1 else self.wp_tables[0]
+        return [table]
+
+    def GetQueueStatistic(self):
+        return [self.queues]
+
+
+def wp(typ, status):
+    return dict(Typ=typ, Status=status)
+
+
+def instance_client(hostname, instance, service):
+    client = soap.SAPClient(hostname, "user", "secret", None, "none", instance)
+    client.client = service
+    return client
+
+
+def test_active_work_counts_run_and_hold_only():
+    client = instance_client(
+        "ci",
+        "00",
+        FakeService(
+            [
+                [
+                    wp("DIA", "Run"),
+                    wp("DIA", "Hold"),
+                    wp("DIA", "Wait"),
+                    wp("DIA", "Ended"),
+                    wp("UPD", "Stopped"),
+                    wp("BTC", "Run"),
+                ]
+            ],
+            queues=[dict(Typ="ABAP/DIA", Now=3), dict(Typ="ABAP/BTC", Now=5)],
+        ),
+    )
+    assert client.active_work() == dict(work_processes=2, queued=3)
+
+
+@pytest.fixture
+def system(monkeypatch):
+    services = {
+        ("ci", "00"): FakeService(
+            [[wp("DIA", "Run"), wp("DIA", "Run")], [wp("DIA", "Run")], [wp("DIA", "Wait")]]
+        ),
+        ("app1", "01"): FakeService([[wp("UPD", "Run")], [wp("UPD", "Wait")]]),
+    }
+    instances = [
+        dict(hostname="scs", instanceNr=1, features="MESSAGESERVER|ENQUE"),
+        dict(hostname="ci", instanceNr=0, features="ABAP|GATEWAY|ICMAN|IGS"),
+        dict(hostname="app1", instanceNr=1, features="ABAP|GATEWAY|ICMAN|IGS"),
+    ]
+
+    def connect(self):
+        self.client = services[(self.hostname or "ci", self.instance)]
+        self.client.connected_as = self.hostname
+
+    monkeypatch.setattr(soap.SAPClient, "connect", connect)
+    monkeypatch.setattr(soap.SAPClient, "poll_interval", 0)
+    client = soap.SystemClient("scs", "user", "secret", None, "none", "01")
+    client.get_system_instance_list = lambda: instances
+    return client, services
+
+
+def test_drain_deactivates_every_abap_instance(system):
+    client, services = system
+    report = client.drain(threshold=0, timeout=60)
+    assert all(service.inactive for service in services.values())
+    assert report["drained"] is True
+    assert report["active_work"] == dict(work_processes=0, queued=0)
+    assert report["inactive_instances"] == [
+        dict(hostname="ci", instance_number="00"),
+        dict(hostname="app1", instance_number="01"),
+    ]
+
+
+def test_drain_stops_waiting_at_timeout(system):
+    client, services = system
+    report = client.drain(threshold=0, timeout=0)
+    assert report["drained"] is False
+    assert report["active_work"] == dict(work_processes=3, queued=0)
+    assert report["inactive_instances"] == []
+    assert not any(service.inactive for service in services.values())
+
+
+def test_drain_fails_when_instance_cannot_be_deactivated(system):
+    client, services = system
+    services[("app1", "01")].inactive_error = "Permission denied"
+    with pytest.raises(Exception, match="ABAPSetServerInactive failed for instance 01 on app1"):
+        client.drain(threshold=0, timeout=60)
+    assert services[("ci", "00")].inactive is False
+
+
+def test_local_client_reaches_remote_instances_by_hostname(system, monkeypatch):
+    client, services = system
+    client.hostname = None
+    monkeypatch.setattr(soap, "is_local_host", lambda hostname: hostname == "ci")
+    client.drain(threshold=0, timeout=60)
+    assert services[("ci", "00")].connected_as is None
+    assert services[("app1", "01")].connected_as == "app1"
+
+
+def test_is_local_host():
+    assert soap.is_local_host("localhost")
+    assert soap.is_local_host(soap.socket.gethostname())
+    assert not soap.is_local_host("host.invalid")
@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.sap.sap_operations.plugins.modules import abap_jobs_info
+
+
+def test_jobs_with_same_jobcount_are_waited_for_separately():
+    jobs = [
+        dict(JOBNAME="JOB_A", JOBCOUNT="10000000", STATUS="R"),
+        dict(JOBNAME="JOB_B", JOBCOUNT="10000000", STATUS="R"),
+    ]
+    statuses = dict(JOB_A=["F"], JOB_B=["R", "F"])
+    polled = []
+
+    def abap(function, **kwargs):
+        polled.append(kwargs["JOBNAME"])
+        return dict(STATUS=statuses[kwargs["JOBNAME"]].pop(0), RETURN=dict(TYPE=""))
+
+    result = abap_jobs_info.wait_for_jobs(abap, "ANSIBLE", jobs, 10, 0, 0)
+    assert result["timed_out"] is False
+    assert result["polls"] == 2
+    assert polled == ["JOB_A", "JOB_B", "JOB_B"]
@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+
+from ansible_collections.sap.sap_operations.plugins.module_utils import abap as abap_utils
+from ansible_collections.sap.sap_operations.plugins.modules import abap_table_read
+
+FIELDS = [dict(FIELDNAME="TRKORR", TYPE="C"), dict(FIELDNAME="AS4USER", TYPE="C")]
+RFC_CONNECTION = dict(ashost="host", sysnr="00", client="001", user="DDIC", passwd="secret")
+ROWS = [dict(TRKORR="NPLK900001", AS4USER="ALICE"), dict(TRKORR="NPLK900002", AS4USER="BOB")]
+
+
+def run_main(monkeypatch, capsys, rows, args):
+    monkeypatch.setattr(abap_utils, "HAS_PYRFC_LIBRARY", True)
+    monkeypatch.setattr(abap_table_read, "read_table_fields", lambda *args: FIELDS)
+    monkeypatch.setattr(abap_table_read, "read_table", lambda *args, **kwargs: iter(rows))
+    args = dict(args, table="E070", function="RFC_READ_TABLE", rfc_connection=RFC_CONNECTION)
+    monkeypatch.setattr(basic, "_ANSIBLE_ARGS", to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args))))
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        monkeypatch.setattr(basic, "_ANSIBLE_PROFILE", "legacy")
+    with pytest.raises(SystemExit):
+        abap_table_read.main()
+    return json.loads(capsys.readouterr().out)["abap_table_read"]
+
+
+def test_rows_are_returned_as_dictionaries(monkeypatch, capsys):
+    result = run_main(monkeypatch, capsys, ROWS, dict())
+    assert result["rows"] == ROWS
+    assert result["rows_count"] == 2
+
+
+def test_rows_are_returned_in_columnar_format(monkeypatch, capsys):
+    result = run_main(monkeypatch, capsys, ROWS, dict(result_format="columnar"))
+    assert result["rows"] == dict(
+        columns=["TRKORR", "AS4USER"], rows=[["NPLK900001", "ALICE"], ["NPLK900002", "BOB"]]
+    )
+    assert result["rows_count"] == 2
+
+
+def test_empty_result_in_columnar_format_has_columns(monkeypatch, capsys):
+    result = run_main(monkeypatch, capsys, [], dict(result_format="columnar"))
+    assert result["rows"] == dict(columns=["TRKORR", "AS4USER"], rows=[])
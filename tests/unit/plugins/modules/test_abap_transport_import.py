@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible_collections.sap.sap_operations.plugins.modules import abap_transport_import
+
+TARGET = dict(system="NPL", client="001")
+
+
+class FakeTMS:
+    """Import queue of one system, (request, client) -> (MAXRC, TRTIME), imports finish after `polls` queue reads."""
+
+    def __init__(self, queue, polls=1, return_code="0000"):
+        self.queue = queue
+        self.polls = polls
+        self.return_code = return_code
+        self.pending = []
+        self.imports = []
+        self.time = 20240102100000
+
+    def __call__(self, function, **kwargs):
+        if function == "TMS_MGR_IMPORT_TR_REQUEST":
+            requests = [line["TRKORR"] for line in kwargs["IT_REQUESTS"]]
+            self.imports.append((kwargs["IV_REQUEST"], kwargs["IV_CLIENT"], requests))
+            self.pending = [(request, kwargs["IV_CLIENT"]) for request in requests]
+            return dict(EV_TP_RET_CODE="0000", ES_EXCEPTION=dict(MSGTY="", TEXT=""))
+        if self.pending:
+            self.polls -= 1
+            if self.polls < 0:
+                self.time += 1
+                for request, client in self.pending:
+                    self.queue[(request, client)] = (self.return_code, str(self.time))
+                self.pending = []
+        return dict(
+            ET_REQUESTS=[
+                dict(TRKORR=request, TARCLI=client, MAXRC=maxrc, TRTIME=trtime)
+                for (request, client), (maxrc, trtime) in self.queue.items()
+            ]
+        )
+
+
+def bulk_import(tms, request_ids, batch_size=10, poll_timeout=60):
+    return abap_transport_import.bulk_import(tms, TARGET, request_ids, batch_size, 0, poll_timeout, 4)
+
+
+def test_return_codes_of_other_client_are_ignored():
+    tms = FakeTMS({("NPLK900001", "000"): ("0000", "20240101100000"), ("NPLK900001", "001"): (" ", "")})
+    assert abap_transport_import.import_queue_imports(tms, "NPL", "001", ["NPLK900001"]) == {}
+    assert abap_transport_import.import_queue_imports(tms, "NPL", "000", ["NPLK900001"]) == {
+        "NPLK900001": ("0000", "20240101100000")
+    }
+
+
+def test_return_code_of_earlier_import_is_not_result():
+    tms = FakeTMS({("NPLK900001", "001"): ("0008", "20240101100000")}, polls=2, return_code="0004")
+    results = bulk_import(tms, ["NPLK900001"])
+    assert tms.polls < 0
+    assert results[0]["RETCODE"] == "0004"
+    assert not results[0]["FAILED"]
+
+
+def test_reimport_with_unchanged_return_code_is_result():
+    tms = FakeTMS({("NPLK900001", "001"): ("0000", "20240101100000")}, polls=2)
+    results = bulk_import(tms, ["NPLK900001"])
+    assert tms.polls < 0
+    assert tms.queue[("NPLK900001", "001")] == ("0000", "20240102100001")
+    assert results[0]["RETCODE"] == "0000"
+    assert not results[0]["FAILED"]
+    assert "MESSAGE" not in results[0]
+
+
+def test_import_without_new_import_time_times_out():
+    tms = FakeTMS({("NPLK900001", "001"): ("0000", "20240101100000")}, polls=100)
+    results = bulk_import(tms, ["NPLK900001"], poll_timeout=0)
+    assert results[0]["FAILED"]
+    assert results[0]["MESSAGE"] == "Timeout waiting for import"
+
+
+def test_batch_is_imported_at_once_in_given_order():
+    request_ids = ["NPLK900003", "NPLK900001", "NPLK900002"]
+    tms = FakeTMS({})
+    results = bulk_import(tms, request_ids, batch_size=2)
+    assert tms.imports == [
+        ("SOME", "001", ["NPLK900003", "NPLK900001"]),
+        ("SOME", "001", ["NPLK900002"]),
+    ]
+    assert [result["REQUEST"] for result in results] == request_ids
+    assert all(result["RETCODE"] == "0000" for result in results)
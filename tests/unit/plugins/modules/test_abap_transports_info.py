@@ -0,0 +1,189 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import re
+
+from ansible_collections.sap.sap_operations.plugins.modules import abap_transports_info
+
+TABLES = dict(
+    E070=dict(
+        fields=[
+            ("TRKORR", 20), ("TRFUNCTION", 1), ("TRSTATUS", 1), ("TARSYSTEM", 10),
+            ("AS4USER", 12), ("AS4DATE", 8), ("AS4TIME", 6), ("STRKORR", 20),
+        ],
+        keys=["TRKORR"],
+        rows=[
+            dict(TRKORR="NPLK900001", TRFUNCTION="K", TRSTATUS="D", TARSYSTEM="", AS4USER="ALICE",
+                 AS4DATE="20240102", AS4TIME="100000", STRKORR=""),
+            dict(TRKORR="NPLK900002", TRFUNCTION="S", TRSTATUS="D", TARSYSTEM="", AS4USER="BOB",
+                 AS4DATE="20240102", AS4TIME="100100", STRKORR="NPLK900001"),
+            dict(TRKORR="NPLK900003", TRFUNCTION="W", TRSTATUS="D", TARSYSTEM="", AS4USER="ALICE",
+                 AS4DATE="20231201", AS4TIME="090000", STRKORR=""),
+        ],
+    ),
+    E07T=dict(
+        fields=[("TRKORR", 20), ("LANGU", 1), ("AS4TEXT", 60)],
+        keys=["TRKORR", "LANGU"],
+        rows=[
+            dict(TRKORR="NPLK900001", LANGU="D", AS4TEXT="Auftrag"),
+            dict(TRKORR="NPLK900001", LANGU="E", AS4TEXT="Request"),
+            dict(TRKORR="NPLK900002", LANGU="E", AS4TEXT="Task"),
+        ],
+    ),
+    E070C=dict(
+        fields=[("TRKORR", 20), ("CLIENT", 3)],
+        keys=["TRKORR"],
+        rows=[dict(TRKORR="NPLK900001", CLIENT="001")],
+    ),
+    E070A=dict(
+        fields=[("TRKORR", 20), ("POS", 6), ("ATTRIBUTE", 20), ("REFERENCE", 32)],
+        keys=["TRKORR", "POS"],
+        rows=[dict(TRKORR="NPLK900001", POS="000001", ATTRIBUTE="SAP_CTS_PROJECT", REFERENCE="P1")],
+    ),
+)
+
+
+def condition_matches(row, condition):
+    match = re.match(r"(\w+) IN \( (.*) \)$", condition)
+    if match:
+        return row[match.group(1)] in re.findall(r"'([^']*)'", match.group(2))
+    field, operator, value = re.match(r"(\w+) (>=|=) '([^']*)'$", condition).groups()
+    return row[field] >= value if operator == ">=" else row[field] == value
+
+
+class FakeABAP(object):
+    def __init__(self, requests=None):  # noqa: D107
+        self.calls = []
+        self.requests = requests or []
+        self.rfc_connection = dict(user="ALICE", client="001", lang="EN")
+        self.http_connection = None
+
+    def __call__(self, func_name, **kwargs):
+        self.calls.append((func_name, kwargs))
+        if func_name == "RFC_SYSTEM_INFO":
+            return dict(RFCSI_EXPORT=dict(RFCSYSID="NPL"))
+        if func_name == "CTS_WBO_API_READ_REQUESTS_RFC":
+            return dict(REQUESTS=self.requests)
+        table = kwargs["QUERY_TABLE"]
+        where = " ".join(option["TEXT"] for option in kwargs.get("OPTIONS") or [])
+        if table == "DD03L":
+            name = re.search(r"TABNAME = '(\w+)'", where).group(1)
+            rows = [dict(FIELDNAME=key, POSITION=str(i + 1)) for i, key in enumerate(TABLES[name]["keys"])]
+            fields = [("FIELDNAME", 30), ("POSITION", 4)]
+        else:
+            rows = [
+                row for row in TABLES[table]["rows"]
+                if not where or all(condition_matches(row, c) for c in where.split(" AND "))
+            ]
+            fields = TABLES[table]["fields"]
+        requested = [field["FIELDNAME"] for field in kwargs.get("FIELDS") or []]
+        if requested:
+            fields = [field for field in fields if field[0] in requested]
+        descriptions = []
+        offset = 0
+        for name, length in fields:
+            descriptions.append(dict(FIELDNAME=name, OFFSET=str(offset), LENGTH=str(length)))
+            offset += length
+        if kwargs.get("NO_DATA") == "X":
+            return dict(FIELDS=descriptions, DATA=[])
+        return dict(
+            FIELDS=descriptions,
+            DATA=[dict(WA="".join(row[name].ljust(length) for name, length in fields)) for row in rows],
+        )
+
+
+SELECTION = dict(
+    TRFUNCTION="*", TRSTATUS="D", TARSYSTEM="*", READ_ATTRS="X", READ_TASK_HEADERS="X",
+    REQ_ATTR_KEYS=[], AS4USER="BOB",
+)
+
+API_REQUEST = dict(
+    REQ_ATTRS=[dict(ATTRIBUTE="SAP_CTS_PROJECT", REFERENCE="P1", POS="000001")],
+    REQ_HEADER=dict(
+        AS4DATE="20240102", AS4TEXT="Request", AS4TIME="100000", AS4USER="ALICE", CLIENT="001",
+        TARSYSTEM="", TRFUNCTION="K", TRKORR="NPLK900001", TRSTATUS="D", KORRDEV="SYST",
+    ),
+    TASK_HEADERS=[
+        dict(AS4DATE="20240102", AS4TEXT="Task", AS4TIME="100100", AS4USER="BOB",
+             TRFUNCTION="S", TRKORR="NPLK900002", TRSTATUS="D"),
+    ],
+)
+
+
+def test_read_changed_requests_matches_api_schema():
+    abap = FakeABAP()
+    requests, owners, watermark = abap_transports_info.read_changed_requests(
+        abap, "20240101", SELECTION, "E"
+    )
+    assert watermark == "20240102"
+    assert list(requests) == ["NPLK900001"]
+    assert requests["NPLK900001"] == abap_transports_info.normalise_request(API_REQUEST)
+    assert owners["NPLK900001"] == set(["ALICE", "BOB"])
+
+
+def metadata_calls(chunk):
+    abap = FakeABAP()
+    abap_transports_info.TRKORR_IN_CHUNK, default = chunk, abap_transports_info.TRKORR_IN_CHUNK
+    try:
+        abap_transports_info.read_changed_requests(abap, "20230101", SELECTION, "E")
+    finally:
+        abap_transports_info.TRKORR_IN_CHUNK = default
+    return sorted(
+        kwargs["QUERY_TABLE"]
+        for _f, kwargs in abap.calls
+        if kwargs.get("NO_DATA") == "X" or kwargs.get("QUERY_TABLE") == "DD03L"
+    )
+
+
+def test_table_metadata_is_read_once_per_table():
+    no_data = metadata_calls(1)
+    assert no_data == metadata_calls(50)
+    assert no_data.count("DD03L") == 4
+    assert no_data.count("E070") == 1
+
+
+def test_owner_matches_task_owner():
+    request = abap_transports_info.normalise_request(API_REQUEST)
+    assert abap_transports_info.request_matches(request, dict(SELECTION, AS4USER="BOB"))
+    assert abap_transports_info.request_matches(request, dict(SELECTION, AS4USER="ALICE"))
+    assert not abap_transports_info.request_matches(request, dict(SELECTION, AS4USER="CAROL"))
+    assert abap_transports_info.request_matches(
+        dict(request, TASK_HEADERS=[]), dict(SELECTION, AS4USER="BOB"), set(["ALICE", "BOB"])
+    )
+
+
+def test_incremental_run_after_full_run_reports_no_change(tmp_path):
+    params = dict(SELECTION)
+    abap = FakeABAP(requests=[API_REQUEST])
+    merged, delta = abap_transports_info.incremental_transports_info(
+        abap, params, str(tmp_path), False, False
+    )
+    assert delta["full_sync"] is True
+    assert len(delta["changed"]) == 1
+    merged_again, delta = abap_transports_info.incremental_transports_info(
+        abap, params, str(tmp_path), False, False
+    )
+    assert delta == dict(full_sync=False, changed=[], removed=[], watermark="20240102")
+    assert merged_again == merged
@@ -0,0 +1,76 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+import os
+
+import pytest
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+
+from ansible_collections.sap.sap_operations.plugins.module_utils import abap as abap_utils
+from ansible_collections.sap.sap_operations.plugins.modules import abap_workload_info
+
+RFC_CONNECTION = dict(ashost="host", sysnr="00", client="001", user="DDIC", passwd="secret")
+
+
+def read_period(abap, system, component, period_type, period):
+    return dict(
+        TASKTYPE=[dict(TASKTYPE="01", COUNT=2, RESPTI=10, CPUTI=4, QUEUETI=1)],
+        TCDET=[dict(ENTRY_ID="SE38", COUNT=1, RESPTI=7, CPUTI=3)],
+    )
+
+
+def run_main(monkeypatch, capsys, args):
+    monkeypatch.setattr(abap_utils, "HAS_PYRFC_LIBRARY", True)
+    monkeypatch.setattr(abap_workload_info, "read_period", read_period)
+    args = dict(
+        args, system="NPL", start_date="20240101", end_date="20240102", tables=["TASKTYPE", "TCDET"],
+        rfc_connection=RFC_CONNECTION,
+    )
+    monkeypatch.setattr(basic, "_ANSIBLE_ARGS", to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args))))
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        monkeypatch.setattr(basic, "_ANSIBLE_PROFILE", "legacy")
+    with pytest.raises(SystemExit):
+        abap_workload_info.main()
+    return json.loads(capsys.readouterr().out)
+
+
+def test_rows_are_written_to_dest(monkeypatch, capsys, tmp_path):
+    dest = str(tmp_path / "workload.jsonl")
+    result = run_main(monkeypatch, capsys, dict(dest=dest))
+    assert result["changed"]
+    assert result["abap_workload_info"]["rows_count"] == 4
+    with open(dest, encoding="utf-8") as f:
+        assert [json.loads(line)["PERIOD"] for line in f] == ["20240101", "20240101", "20240102", "20240102"]
+
+
+def test_dest_is_not_written_in_check_mode(monkeypatch, capsys, tmp_path):
+    dest = str(tmp_path / "workload.jsonl")
+    result = run_main(monkeypatch, capsys, dict(dest=dest, _ansible_check_mode=True))
+    assert result["changed"]
+    assert result["abap_workload_info"]["rows_count"] == 4
+    assert result["abap_workload_info"]["top_transactions"][0]["ENTRY_ID"] == "SE38"
+    assert not os.path.exists(dest)
@@ -0,0 +1,121 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import json
+
+import pytest
+
+from ansible.module_utils import basic
+from ansible.module_utils.common.text.converters import to_bytes
+
+from ansible_collections.sap.sap_operations.plugins.modules import ha_info
+
+INSTANCES = [
+    dict(mSid="NPL", mSystemNumber="00", mHostname="host1"),
+    dict(mSid="NPL", mSystemNumber="01", mHostname="host1"),
+    dict(mSid="NPL", mSystemNumber="02", mHostname="host1"),
+]
+
+
+class FakeService(object):
+    def __init__(self, instance):  # noqa: D107
+        self.instance = instance
+
+    def HACheckConfig(self):
+        if self.instance == "02":
+            raise Exception("Instance 02 is not running")
+        return [dict(mCheck="SAPControl-HA-CHECK", mState="SAPControl-HA-SUCCESS")]
+
+    def HACheckFailoverConfig(self):
+        return [dict(mState="SAPControl-HA-SUCCESS")]
+
+    def HAGetFailoverConfig(self):
+        return dict(mHAActive=True)
+
+    def ListInstances(self):
+        return self.instance
+
+
+class FakeSAPControl(object):
+    """sapcontrol stand-in, records instance and shared WSDL client of every created client."""
+
+    created = []
+
+    def __init__(self, instance=None, wsdl_client=None, **kwargs):  # noqa: D107
+        self.created.append((instance, wsdl_client))
+        if instance == "missing":
+            raise Exception("Connection refused")
+        self.client = type("Client", (), dict(service=FakeService(instance), wsdl="wsdl of {0}".format(instance)))()
+
+
+@pytest.fixture
+def sapcontrol(monkeypatch):
+    FakeSAPControl.created = []
+    monkeypatch.setattr(ha_info, "sapcontrol", FakeSAPControl)
+    return FakeSAPControl
+
+
+def run_main(monkeypatch, capsys, list_instances, args):
+    monkeypatch.setattr(ha_info, "saphostctrl", lambda **kwargs: FakeSAPControl(instance=list_instances))
+    monkeypatch.setattr(basic, "_ANSIBLE_ARGS", to_bytes(json.dumps(dict(ANSIBLE_MODULE_ARGS=args))))
+    if hasattr(basic, "_ANSIBLE_PROFILE"):
+        monkeypatch.setattr(basic, "_ANSIBLE_PROFILE", "legacy")
+    with pytest.raises(SystemExit):
+        ha_info.main()
+    return json.loads(capsys.readouterr().out)
+
+
+def test_instance_list_without_instances():
+    assert ha_info.instance_list(dict()) == []
+    assert ha_info.instance_list(None) == []
+    assert ha_info.instance_list(INSTANCES) == INSTANCES
+
+
+def test_wsdl_client_of_first_instance(sapcontrol):
+    assert ha_info.wsdl_client(INSTANCES, {}).wsdl == "wsdl of 00"
+    assert ha_info.wsdl_client([], {}) is None
+    assert ha_info.wsdl_client([dict(mSystemNumber="missing")], {}) is None
+
+
+def test_instance_failure_does_not_stop_others(sapcontrol):
+    shared = ha_info.wsdl_client(INSTANCES, {})
+    results = [ha_info.instance_ha_info(instance, {}, shared) for instance in INSTANCES]
+    assert [result["failed"] for result in results] == [False, False, True]
+    assert results[2]["msg"] == "Instance 02 is not running"
+    assert results[0]["ha_get_failoverconfig_info"] == dict(mHAActive=True)
+    assert all(wsdl is shared for _instance, wsdl in sapcontrol.created[1:])
+
+
+def test_main_fans_out_over_selected_instances(sapcontrol, monkeypatch, capsys):
+    result = run_main(monkeypatch, capsys, INSTANCES, dict(instance_numbers=["00", "02"], max_workers=2))
+    assert [info["instance_number"] for info in result["ha_info"]] == ["00", "02"]
+    assert [info["failed"] for info in result["ha_info"]] == [False, True]
+    assert sorted(instance for instance, _wsdl in sapcontrol.created[1:]) == ["00", "00", "02"]
+
+
+def test_main_without_instances(sapcontrol, monkeypatch, capsys):
+    result = run_main(monkeypatch, capsys, {}, dict())
+    assert result["ha_info"] == []
+    assert result["changed"] is False
@@ -0,0 +1,98 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import os
+
+import pytest
+
+from ansible_collections.sap.sap_operations.plugins.modules import pcs_cib_info
+
+VERSION = dict(admin_epoch=0, epoch=12, num_updates=3)
+CIB = '<cib admin_epoch="0" epoch="{0}" num_updates="{1}"><configuration/><status/></cib>'
+
+
+class FailJson(Exception):
+    pass
+
+
+class FakeModule(object):
+    """AnsibleModule stand-in, crm_diff returns rc and stdout given."""
+
+    def __init__(self, cache_dir, check_mode=False, rc=1, stdout="<diff/>"):  # noqa: D107
+        self.params = dict(cache_dir=cache_dir)
+        self.check_mode = check_mode
+        self.rc = rc
+        self.stdout = stdout
+
+    def run_command(self, args):
+        return self.rc, self.stdout, "crm_diff failed"
+
+    def fail_json(self, **kwargs):
+        raise FailJson(kwargs)
+
+
+def cache(tmp_path, epoch=12, num_updates=3):
+    (tmp_path / "cib.xml").write_text(CIB.format(epoch, num_updates))
+    return str(tmp_path)
+
+
+def test_version_matches():
+    assert pcs_cib_info.version_matches(dict(VERSION), VERSION)
+    assert pcs_cib_info.version_matches(dict(VERSION, num_updates=None), dict(VERSION, num_updates=4))
+    assert not pcs_cib_info.version_matches(dict(VERSION, epoch=11), VERSION)
+
+
+def test_version_without_attributes_matches_nothing():
+    since = dict(admin_epoch=None, epoch=None, num_updates=None)
+    assert not pcs_cib_info.version_matches(since, VERSION)
+    assert not pcs_cib_info.version_matches({}, VERSION)
+
+
+def test_changes_against_cached_version(tmp_path):
+    module = FakeModule(cache(tmp_path))
+    assert pcs_cib_info.cib_changes(module, dict(VERSION), CIB.format(13, 0)) == "<diff/>"
+    assert (tmp_path / "cib.xml").read_text() == CIB.format(13, 0)
+    assert os.listdir(str(tmp_path)) == ["cib.xml"]
+
+
+def test_no_changes_without_known_version(tmp_path):
+    module = FakeModule(cache(tmp_path))
+    since = dict(admin_epoch=None, epoch=None, num_updates=None)
+    assert pcs_cib_info.cib_changes(module, since, CIB.format(13, 0)) is None
+
+
+def test_cache_is_not_written_in_check_mode(tmp_path):
+    module = FakeModule(cache(tmp_path), check_mode=True)
+    assert pcs_cib_info.cib_changes(module, dict(VERSION), CIB.format(13, 0)) == "<diff/>"
+    assert (tmp_path / "cib.xml").read_text() == CIB.format(12, 3)
+    assert os.listdir(str(tmp_path)) == ["cib.xml"]
+
+
+def test_temporary_file_is_removed_when_crm_diff_fails(tmp_path):
+    module = FakeModule(cache(tmp_path), rc=2)
+    with pytest.raises(FailJson):
+        pcs_cib_info.cib_changes(module, dict(VERSION), CIB.format(13, 0))
+    assert (tmp_path / "cib.xml").read_text() == CIB.format(12, 3)
+    assert os.listdir(str(tmp_path)) == ["cib.xml"]
@@ -0,0 +1,99 @@
+# SPDX-License-Identifier: GPL-3.0-only
+# SPDX-FileCopyrightText: 2023 Kirill Satarin (@kksat)
+#
+# Copyright 2023 Kirill Satarin (@kksat)
+#
+# This program is free software: you can redistribute it and/or modify it under the terms of the GNU
+# General Public License as published by the Free Software Foundation, version 3 of the License.
+#
+# This program is distributed in the hope that it will be useful, but WITHOUT ANY WARRANTY; without
+# even the implied warranty of MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+# See the GNU General Public License for more details.
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+# You should have received a copy of the GNU General Public License along with this program.
+# If not, see <https://www.gnu.org/licenses/>.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import xml.etree.ElementTree as ET  # nosec B405
+
+from ansible_collections.sap.sap_operations.plugins.module_utils.pacemaker import PacemakerIndex
+from ansible_collections.sap.sap_operations.plugins.modules import pcs_wait_for
+
+STATUS = """<pacemaker-result api-version="2.30" request="crm_mon --one-shot --inactive --output-as=xml">
+  <nodes>
+    <node name="node1" id="1" online="true"/>
+    <node name="node2" id="2" online="false"/>
+  </nodes>
+  <resources>
+    <clone id="msl_SAPHana_HAN_HDB00" multi_state="true">
+      <resource id="rsc_SAPHana_HAN_HDB00" role="Promoted"><node name="node1" id="1"/></resource>
+      <resource id="rsc_SAPHana_HAN_HDB00" role="Unpromoted"><node name="node2" id="2"/></resource>
+    </clone>
+    <group id="g_ip_HAN_HDB00">
+      <resource id="rsc_ip_HAN_HDB00" role="Started"><node name="node1" id="1"/></resource>
+    </group>
+  </resources>
+  <node_attributes>
+    <node name="node1"><attribute name="hana_han_sync_state" value="PRIM"/></node>
+  </node_attributes>
+  <failures>
+    <failure op_key="rsc_ip_HAN_HDB00_extra_monitor_10000" node="node1" exitstatus="error" task="monitor" interval="10000"/>
+    <failure op_key="rsc_SAPHana_HAN_HDB00:1_start_0" node="node2" exitstatus="error" task="start" interval="0"/>
+  </failures>
+</pacemaker-result>
+"""
+
+
+def index():
+    return PacemakerIndex(ET.fromstring(STATUS))  # nosec B314
+
+
+def predicate(**kwargs):
+    return dict(dict(resource=None, role=None, node=None, name=None, value=None), **kwargs)
+
+
+def test_resource_role_of_clone_and_group():
+    assert pcs_wait_for.resource_role(index(), predicate(resource="msl_SAPHana_HAN_HDB00", role="Master", node="node1"))
+    assert not pcs_wait_for.resource_role(index(), predicate(resource="rsc_SAPHana_HAN_HDB00", role="Promoted", node="node2"))
+    assert pcs_wait_for.resource_role(index(), predicate(resource="g_ip_HAN_HDB00", role="Started"))
+
+
+def test_failed_actions_match_resource_exactly():
+    assert pcs_wait_for.no_failed_actions(index(), predicate(resource="rsc_ip_HAN"))
+    assert pcs_wait_for.no_failed_actions(index(), predicate(resource="rsc_ip_HAN_HDB00"))
+    assert not pcs_wait_for.no_failed_actions(index(), predicate(resource="rsc_ip_HAN_HDB00_extra"))
+    assert not pcs_wait_for.no_failed_actions(index(), predicate(resource="rsc_SAPHana_HAN_HDB00"))
+    assert not pcs_wait_for.no_failed_actions(index(), predicate())
+
+
+def test_failed_action_resource_attribute_is_preferred():
+    failure = ET.Element("failure", rsc="rsc_a", op_key="rsc_a_b_monitor_0")
+    assert pcs_wait_for.failure_resource(failure) == "rsc_a"
+    assert pcs_wait_for.failure_resource(ET.Element("failure", op_key="rsc_a_b_monitor_0")) == "rsc_a_b"
+
+
+def test_failed_action_resource_with_migrate_task():
+    failure = ET.Element("failure", op_key="rsc_ip_migrate_to_0", task="migrate_to", interval="0")
+    assert pcs_wait_for.failure_resource(failure) == "rsc_ip"
+    failure = ET.Element("failure", op_key="rsc_ip_migrate_from_0", task="migrate_from", interval="0")
+    assert pcs_wait_for.failure_resource(failure) == "rsc_ip"
+    failure = ET.Element("failure", op_key="rsc_ip_HAN_monitor_10000", task="monitor", interval="10000")
+    assert pcs_wait_for.failure_resource(failure) == "rsc_ip_HAN"
+    assert pcs_wait_for.failure_resource(ET.Element("failure", op_key="rsc_ip_migrate_to_0")) == "rsc_ip"
+
+
+def test_nodes_online_and_node_attribute():
+    assert not pcs_wait_for.nodes_online(index(), predicate())
+    assert pcs_wait_for.nodes_online(index(), predicate(node="node1"))
+    assert not pcs_wait_for.nodes_online(index(), predicate(node="node3"))
+    assert pcs_wait_for.node_attribute(index(), predicate(node="node1", name="hana_han_sync_state", value="PRIM"))
+    assert not pcs_wait_for.node_attribute(index(), predicate(node="node2", name="hana_han_sync_state", value="PRIM"))